@@ -1,5 +1,6 @@
 # backend/chat/admin.py
 from django.contrib import admin
+from core.pagination import EstimatedCountPaginator
 from .models import ChatRoom, Message
 
 @admin.register(ChatRoom)
@@ -14,6 +15,8 @@ class MessageAdmin(admin.ModelAdmin):
     list_display = ('sender', 'room', 'content_preview', 'created_at', 'is_read')
     list_filter = ('is_read', 'created_at')
     search_fields = ('content', 'sender__username')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     def content_preview(self, obj):
         return obj.content[:50] + '...' if len(obj.content) > 50 else obj.content
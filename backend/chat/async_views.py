@@ -0,0 +1,24 @@
+# backend/chat/async_views.py
+"""
+Async message list (served by core.asgi, see core/asyncapi.py).
+
+GET /api/async/messages/ returns the same payload as GET /api/messages/:
+messages of the rooms the user is a member of.
+"""
+from core.asyncapi import async_api_view, json_response, paginate_without_count
+from core.counters import aestimated_rows
+from core.fastpath import fast_path_for
+from projects.visibility import ascope_to_rooms, avisible_room_ids
+from .models import Message
+from .serializers import MessageSerializer
+
+
+@async_api_view()
+async def message_list(request):
+    queryset = await ascope_to_rooms(Message.objects.all(), request.user)
+
+    async def estimate():
+        return await aestimated_rows(Message, await avisible_room_ids(request.user))
+
+    page = await paginate_without_count(request, queryset, fast_path_for(MessageSerializer), estimate)
+    return json_response(page)
@@ -0,0 +1,117 @@
+# backend/chat/history.py
+"""
+Chat history across the hot message table and its archive.
+
+archive_expired_messages() moves the old messages of inactive rooms into
+MessageArchive blocks (see core/archive.py). room_history() reads a room
+newest first with an id keyset (?before=<message id>), taking the rows from
+the message table and, once that runs out, from the archive blocks, so
+clients cannot tell where the hot table ends.
+"""
+import datetime
+
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+
+from core.archive import ARCHIVE_BLOCK_SIZE, archive_rows, months_ago, pack, retention_policy, unpack
+from users.models import User
+from .models import ChatRoom, Message, MessageArchive
+
+ARCHIVED_FIELDS = ('sender_id', 'content', 'created_at', 'is_read')
+
+_datetime_field = serializers.DateTimeField()
+
+
+# -----------------------------------------------------------------------------
+# Archiving
+# -----------------------------------------------------------------------------
+def expired_messages(now=None):
+    """Messages past the retention policy, or None when it is disabled."""
+    months = retention_policy('messages_months')
+    inactive_days = retention_policy('messages_inactive_room_days')
+    if months is None:
+        return None
+    now = now or timezone.now()
+    rooms = ChatRoom.objects.filter(deleted_at__isnull=True)
+    if inactive_days is not None:
+        rooms = (
+            rooms.annotate(last_message_at=Max('messages__created_at'))
+            .filter(last_message_at__lt=now - datetime.timedelta(days=inactive_days))
+        )
+    # Resolved once: the rooms' last messages change while they are archived
+    room_ids = list(rooms.values_list('pk', flat=True))
+    return Message.objects.filter(room_id__in=room_ids, created_at__lt=months_ago(now, months))
+
+
+def _create_block(room_id, month, rows):
+    MessageArchive.objects.create(
+        room_id=room_id,
+        month=month,
+        first_message_id=rows[0]['id'],
+        last_message_id=rows[-1]['id'],
+        message_count=len(rows),
+        data=pack(rows),
+    )
+
+
+def archive_expired_messages(now=None, block_size=ARCHIVE_BLOCK_SIZE, pause=0):
+    """Yields (room id, month, messages archived) per block."""
+    messages = expired_messages(now)
+    if messages is None:
+        return iter(())
+    return archive_rows(messages, 'room_id', ARCHIVED_FIELDS, _create_block, block_size=block_size, pause=pause)
+
+
+# -----------------------------------------------------------------------------
+# Reading
+# -----------------------------------------------------------------------------
+def _archived_rows(room, before, limit, rows):
+    """Add archived messages below `before` to `rows` until the newest `limit` are known."""
+    blocks = MessageArchive.objects.filter(room=room).order_by('-last_message_id')
+    if before is not None:
+        blocks = blocks.filter(first_message_id__lt=before)
+    for block in blocks.only('last_message_id', 'data').iterator():
+        # Blocks come by descending last id: once the newest `limit` rows
+        # are all above this block, no later block can contribute
+        if len(rows) >= limit and block.last_message_id < sorted(row['id'] for row in rows)[-limit]:
+            break
+        for row in unpack(block.data):
+            if before is None or row['id'] < before:
+                row['created_at'] = parse_datetime(row['created_at'])
+                rows.append(row)
+
+
+def room_history(room, before=None, limit=50):
+    """
+    Up to `limit` messages of `room` with an id below `before`, newest first,
+    in MessageSerializer's format, and whether there are older ones.
+    """
+    messages = Message.objects.filter(room=room).order_by('-id')
+    if before is not None:
+        messages = messages.filter(id__lt=before)
+    rows = list(messages.values('id', *ARCHIVED_FIELDS)[:limit + 1])
+    if len(rows) <= limit:
+        _archived_rows(room, before, limit + 1, rows)
+    rows.sort(key=lambda row: row['id'], reverse=True)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    senders = {
+        user['id']: user
+        for user in User.objects.filter(pk__in={row['sender_id'] for row in rows} - {None})
+        .values('id', 'username', 'first_name', 'last_name')
+    }
+    results = [
+        {
+            'id': row['id'],
+            'room': room.pk,
+            'sender': senders.get(row['sender_id']),
+            'content': row['content'],
+            'created_at': _datetime_field.to_representation(row['created_at']),
+            'is_read': row['is_read'],
+        }
+        for row in rows
+    ]
+    return results, has_more
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from core.counters import row_count_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('chat', '0001_initial'),
+    ]
+
+    operations = [
+        row_count_triggers('chat_message', 'room_id'),
+    ]
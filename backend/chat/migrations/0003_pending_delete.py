@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_message_row_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_pending_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month of the archived messages')),
+                ('first_message_id', models.BigIntegerField()),
+                ('last_message_id', models.BigIntegerField()),
+                ('message_count', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archives', to='chat.chatroom')),
+            ],
+            options={
+                'ordering': ['room', 'first_message_id'],
+                'indexes': [models.Index(fields=['room', 'last_message_id'], name='messagearchive_room_idx')],
+            },
+        ),
+    ]
@@ -26,6 +26,8 @@ class ChatRoom(models.Model):
     members = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='chat_rooms')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when the room (or its project) is deleted; purged in chunks later
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     class Meta:
         ordering = ['-updated_at']
@@ -54,3 +56,26 @@ class Message(models.Model):
 
     def __str__(self):
         return f"{self.sender.username if self.sender else 'Unknown'}: {self.content[:50]}"
+
+
+class MessageArchive(models.Model):
+    """
+    Expired messages moved out of the message table (see core/archive.py):
+    one zlib-compressed JSON block per room and month.
+    """
+    room = models.ForeignKey(ChatRoom, related_name='archives', on_delete=models.CASCADE)
+    month = models.DateField(help_text="First day of the month of the archived messages")
+    first_message_id = models.BigIntegerField()
+    last_message_id = models.BigIntegerField()
+    message_count = models.PositiveIntegerField()
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['room', 'first_message_id']
+        indexes = [
+            models.Index(fields=['room', 'last_message_id'], name='messagearchive_room_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.room.name} {self.month:%Y-%m} ({self.message_count} messages)"
@@ -0,0 +1,25 @@
+# backend/chat/signals.py
+"""
+Drop cached visible room ids (projects/visibility.py) when ChatRoom.members
+changes through the ORM (join / leave, room creation, the admin).
+Direct through-table writes invalidate explicitly.
+"""
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from projects.visibility import invalidate_visibility
+from .models import ChatRoom
+
+
+@receiver(m2m_changed, sender=ChatRoom.members.through)
+def invalidate_room_visibility(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.chat_rooms.add(...): instance is the user
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_visibility([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        invalidate_visibility(pk_set)
+    elif action == 'pre_clear':
+        instance._cleared_room_members = set(instance.members.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        invalidate_visibility(instance.__dict__.pop('_cleared_room_members', set()))
@@ -1,3 +1,97 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+from .history import archive_expired_messages
+from .models import ChatRoom, Message, MessageArchive
+
+
+class ArchiveRoundTripTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('chatter', 'chatter@example.com', 'pw')
+        cls.room = ChatRoom.objects.create(name='Old room', room_type='group')
+        cls.room.members.add(cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_messages(self, count, months_old):
+        created_at = timezone.now() - datetime.timedelta(days=31 * months_old)
+        messages = Message.objects.bulk_create([
+            Message(room=self.room, sender=self.user, content=f'{months_old} months ago #{i}') for i in range(count)
+        ])
+        Message.objects.filter(pk__in=[message.pk for message in messages]).update(created_at=created_at)
+        return [message.pk for message in messages]
+
+    def read_history(self, limit):
+        ids, contents, url = [], [], f'/api/chat-rooms/{self.room.pk}/history/?limit={limit}'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(row['id'] for row in response.json()['results'])
+            contents.extend(row['content'] for row in response.json()['results'])
+            url = response.json()['next']
+        return ids, contents
+
+    def test_archived_messages_read_back_through_history(self):
+        old_ids = self.create_messages(7, months_old=9) + self.create_messages(5, months_old=8)
+        # Recent enough to stay in the message table, old enough to make the room inactive
+        hot_ids = self.create_messages(3, months_old=2)
+        before_ids, before_contents = self.read_history(limit=4)
+
+        blocks = list(archive_expired_messages(block_size=4))
+        self.assertEqual(sum(archived for _, _, archived in blocks), len(old_ids))
+        self.assertEqual(sorted(Message.objects.values_list('pk', flat=True)), hot_ids)
+        self.assertEqual(MessageArchive.objects.filter(room=self.room).count(), 4)
+
+        ids, contents = self.read_history(limit=4)
+        self.assertEqual(ids, sorted(old_ids + hot_ids, reverse=True))
+        self.assertEqual((ids, contents), (before_ids, before_contents))
+
+    def test_history_of_a_room_outside_the_users_rooms(self):
+        other = ChatRoom.objects.create(name='Private', room_type='group')
+        response = self.client.get(f'/api/chat-rooms/{other.pk}/history/')
+        self.assertEqual(response.status_code, 404)
+
+
+class AsyncMessageListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.outsider = User.objects.create_user('outsider', 'outsider@example.com', 'pw')
+        cls.room = ChatRoom.objects.create(name='Room', room_type='group')
+        cls.room.members.add(cls.member)
+        cls.deleted_room = ChatRoom.objects.create(name='Gone', room_type='group', deleted_at=timezone.now())
+        cls.deleted_room.members.add(cls.member)
+        for room in (cls.room, cls.deleted_room):
+            Message.objects.bulk_create([
+                Message(room=room, sender=cls.member, content=f'{room.name} {i}') for i in range(3)
+            ])
+
+    def both(self, user, query=''):
+        client = APIClient()
+        client.force_authenticate(user)
+        sync = client.get(f'/api/messages/{query}').json()
+        response = async_to_sync(AsyncClient().get)(
+            f'/api/async/messages/{query}', headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'},
+        )
+        self.assertEqual(response.status_code, 200)
+        return sync, response.json()
+
+    def test_same_messages_as_the_sync_list(self):
+        sync, body = self.both(self.member)
+        self.assertEqual([row['content'] for row in body['results']], ['Room 0', 'Room 1', 'Room 2'])
+        self.assertEqual(body['results'], sync['results'])
+        self.assertEqual(body['estimated_count'], sync['estimated_count'])
+
+        sync, body = self.both(self.outsider)
+        self.assertEqual((body['results'], sync['results']), ([], []))
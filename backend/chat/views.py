@@ -1,7 +1,18 @@
 # backend/chat/views.py
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from core.counters import estimated_rows
+from core.db import LockRetryMixin
+from core.fastpath import FastListMixin
+from core.pagination import CountFreePagination
+from core.params import parse_positive_int
+from projects.purge import mark_room_deleted
+from projects.visibility import scope_to_rooms, visible_room_ids
+from .history import room_history
 from .models import ChatRoom, Message
 from .serializers import (
     ChatRoomSerializer, 
@@ -10,16 +21,24 @@ from .serializers import (
 )
 
 
+MAX_HISTORY_LIMIT = 100
+
+
 class ChatRoomViewSet(viewsets.ModelViewSet):
     """
     API endpoint for chat rooms.
     Users can only see rooms they are members of.
+    GET /api/chat-rooms/<id>/history/?before=<message id> pages through the
+    room's messages newest first, archived ones included (chat/history.py).
     """
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         # Only show rooms where user is a member
-        return ChatRoom.objects.filter(members=self.request.user).prefetch_related('members', 'messages')
+        rooms = scope_to_rooms(ChatRoom.objects.all(), self.request.user, column='pk')
+        if self.action == 'history':
+            return rooms
+        return rooms.prefetch_related('members', 'messages')
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -30,6 +49,10 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
         # Create room and add creator as member
         room = serializer.save()
         room.members.add(self.request.user)
+
+    def perform_destroy(self, instance):
+        # Hidden at once, messages purged later in chunks (projects/purge.py)
+        mark_room_deleted(instance)
     
     @action(detail=True, methods=['post'])
     def join(self, request, pk=None):
@@ -45,19 +68,42 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
         room.members.remove(request.user)
         return Response({'status': 'left'})
 
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Room messages newest first, hot and archived (?before=<id>&limit=)"""
+        room = self.get_object()
+        before = request.query_params.get('before')
+        if before is not None:
+            before = parse_positive_int(before)
+            if before is None:
+                raise NotFound('Invalid before id.')
+        limit = parse_positive_int(request.query_params.get('limit')) or api_settings.PAGE_SIZE
+        limit = min(limit, MAX_HISTORY_LIMIT)
 
-class MessageViewSet(viewsets.ModelViewSet):
+        results, has_more = room_history(room, before=before, limit=limit)
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(request.build_absolute_uri(), 'before', results[-1]['id'])
+        return Response({'next': next_url, 'results': results})
+
+
+class MessageViewSet(FastListMixin, LockRetryMixin, viewsets.ModelViewSet):
     """
     API endpoint for messages.
     Users can only see messages in rooms they are members of.
+    The list is served from values() rows (see core/fastpath.py) and
+    paginated without COUNT(*) (see core/pagination.py).
     """
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CountFreePagination
     
     def get_queryset(self):
         # Only show messages from rooms user is a member of
-        user_rooms = ChatRoom.objects.filter(members=self.request.user)
-        return Message.objects.filter(room__in=user_rooms).select_related('sender', 'room')
+        return scope_to_rooms(Message.objects.all(), self.request.user).select_related('sender', 'room')
+
+    def get_estimated_count(self):
+        return estimated_rows(Message, visible_room_ids(self.request.user))
     
     def perform_create(self, serializer):
         # Set sender to current user
@@ -0,0 +1,98 @@
+# backend/core/archive.py
+"""
+Retention: moving expired rows out of the hot tables.
+
+Notifications and chat messages are never deleted by the app, so their
+tables (and every index on them) grow forever while almost all reads hit
+the last few weeks. `manage.py archive_expired` applies the
+RETENTION_POLICIES from settings:
+
+- read notifications older than `notifications_read_days`
+- messages older than `messages_months` in rooms without a message for
+  `messages_inactive_room_days`
+
+Expired rows are moved, in id order, into archive rows holding one
+zlib-compressed JSON block per scope (recipient / room) and month
+(NotificationArchive, MessageArchive). Each block is written and its rows
+deleted in one short write transaction of at most `block_size` rows, so the
+command can be interrupted and re-run at any time. Archived messages are
+still served, transparently, by the room history endpoint (chat/history.py).
+"""
+import datetime
+import time
+import zlib
+
+import orjson
+from django.conf import settings
+
+from .db import run_write_transaction
+
+ARCHIVE_BLOCK_SIZE = 1000
+
+DEFAULT_RETENTION_POLICIES = {
+    'notifications_read_days': 90,
+    'messages_months': 6,
+    'messages_inactive_room_days': 30,
+}
+
+
+def retention_policy(name):
+    """A RETENTION_POLICIES value; None disables the policy."""
+    policies = {**DEFAULT_RETENTION_POLICIES, **getattr(settings, 'RETENTION_POLICIES', {})}
+    return policies[name]
+
+
+def pack(rows):
+    """Compress a list of dicts (datetimes become ISO 8601 strings)."""
+    return zlib.compress(orjson.dumps(rows), 9)
+
+
+def unpack(data):
+    return orjson.loads(zlib.decompress(bytes(data)))
+
+
+def month_of(value):
+    """First day of the (UTC) month of a datetime."""
+    return value.astimezone(datetime.timezone.utc).date().replace(day=1)
+
+
+def months_ago(now, months):
+    """`now` moved back by whole calendar months, clamped to the month's last day."""
+    year, month = divmod(now.year * 12 + now.month - 1 - months, 12)
+    month += 1
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last_day = (next_month - datetime.timedelta(days=1)).day
+    return now.replace(year=year, month=month, day=min(now.day, last_day))
+
+
+def _move_block(queryset, scope_field, fields, create_block, block_size):
+    rows = list(queryset.order_by(scope_field, 'id').values('id', scope_field, *fields)[:block_size])
+    if not rows:
+        return None
+    # Only the leading rows of one scope and month go into the block
+    scope_id, month = rows[0][scope_field], month_of(rows[0]['created_at'])
+    block = []
+    for row in rows:
+        if row[scope_field] != scope_id or month_of(row['created_at']) != month:
+            break
+        del row[scope_field]
+        block.append(row)
+    create_block(scope_id, month, block)
+    queryset.model.objects.filter(pk__in=[row['id'] for row in block]).delete()
+    return scope_id, month, len(block)
+
+
+def archive_rows(queryset, scope_field, fields, create_block, block_size=ARCHIVE_BLOCK_SIZE, pause=0):
+    """
+    Move every row of `queryset` into blocks: create_block(scope_id, month,
+    rows) stores one block of `fields` (which must include created_at) and
+    the rows are then deleted, in the same transaction.
+    Yields (scope_id, month, rows archived) after every block.
+    """
+    while True:
+        moved = run_write_transaction(_move_block, queryset, scope_field, fields, create_block, block_size)
+        if moved is None:
+            return
+        yield moved
+        if pause:
+            time.sleep(pause)
@@ -3,6 +3,10 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project with an ASGI server (e.g. ``uvicorn core.asgi:application``)
+for the streaming endpoints such as the live tournament feed
+(/api/tournaments/<id>/live/); under WSGI they cannot stay open.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,155 @@
+# backend/core/asyncapi.py
+"""
+Building blocks for the async read endpoints (/api/async/...).
+
+These are plain Django async views, meant to be served by
+core.asgi.application: while a request waits on the database or a slow
+client, the event loop serves other requests instead of parking a worker
+thread. Everything on the request path is async:
+
+- AsyncJWTAuthentication validates the Bearer token like simplejwt's
+  JWTAuthentication and loads the user with the async ORM (aget)
+- paginate() counts with acount() and builds the page with the compiled
+  FastPath of the matching DRF serializer, reading rows with aiterator();
+  paginate_without_count() is the CountFreePagination counterpart
+- responses are rendered with the same orjson renderer as the DRF API
+
+Response bodies, pagination (?page=) and error payloads match the
+synchronous endpoints, so clients can switch by changing the URL prefix.
+"""
+import functools
+import math
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .pagination import page_links, parse_page_number
+from .renderers import ORJSONRenderer
+
+_renderer = ORJSONRenderer()
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication whose user lookup goes through the async ORM."""
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        try:
+            user = await self.user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise exceptions.AuthenticationFailed("User not found", code="user_not_found")
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise exceptions.AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+_authentication = AsyncJWTAuthentication()
+
+
+def json_response(data, status=200):
+    return HttpResponse(_renderer.render(data), content_type='application/json', status=status)
+
+
+def _error_response(exc):
+    detail = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+    response = json_response(detail, status=exc.status_code)
+    if exc.status_code == 401:
+        response['WWW-Authenticate'] = _authentication.authenticate_header(None)
+    return response
+
+
+def async_api_view(public=False):
+    """
+    Wrap an async read-only view: GET/HEAD only, async JWT authentication
+    (request.user), DRF-style JSON errors. Anonymous users are rejected
+    unless `public` is True.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in ('GET', 'HEAD'):
+                    raise exceptions.MethodNotAllowed(request.method)
+                authenticated = await _authentication.aauthenticate(request)
+                request.user = authenticated[0] if authenticated else AnonymousUser()
+                if not public and authenticated is None:
+                    raise exceptions.NotAuthenticated()
+                return await view(request, *args, **kwargs)
+            except Http404 as exc:
+                return _error_response(exceptions.NotFound(*exc.args))
+            except exceptions.APIException as exc:
+                return _error_response(exc)
+        return wrapper
+    return decorator
+
+
+async def paginate(request, queryset, fast_path):
+    """
+    PageNumberPagination-compatible page of `queryset` rendered through
+    `fast_path`: {"count", "next", "previous", "results"}.
+    """
+    page_size = api_settings.PAGE_SIZE
+    count = await queryset.acount()
+    page_count = max(math.ceil(count / page_size), 1)
+    page = request.GET.get('page', 1)
+    try:
+        page = page_count if page == 'last' else int(page)
+    except (TypeError, ValueError):
+        page = 0
+    if not 1 <= page <= page_count:
+        raise exceptions.NotFound("Invalid page.")
+
+    offset = (page - 1) * page_size
+    results = await fast_path.abuild_many(fast_path.values(queryset)[offset:offset + page_size])
+
+    next_url, previous = page_links(request.build_absolute_uri(), page, page < page_count)
+    return {
+        'count': count,
+        'next': next_url,
+        'previous': previous,
+        'results': results,
+    }
+
+
+async def paginate_without_count(request, queryset, fast_path, estimate=None):
+    """
+    CountFreePagination-compatible page of `queryset`:
+    {"estimated_count", "next", "previous", "results"}. `estimate` is an
+    async callable, only called for an unfiltered list.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page = parse_page_number(request.GET.get('page', 1))
+    if page is None:
+        raise exceptions.NotFound("Invalid page.")
+    offset = (page - 1) * page_size
+    results = await fast_path.abuild_many(fast_path.values(queryset)[offset:offset + page_size + 1])
+    if not results and page > 1:
+        raise exceptions.NotFound("Invalid page.")
+
+    has_next = len(results) > page_size
+    next_url, previous = page_links(request.build_absolute_uri(), page, has_next)
+    unfiltered = set(request.GET) <= {'page'}
+    return {
+        'estimated_count': await estimate() if estimate is not None and unfiltered else None,
+        'next': next_url,
+        'previous': previous,
+        'results': results[:page_size],
+    }
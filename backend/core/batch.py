@@ -0,0 +1,169 @@
+# backend/core/batch.py
+"""
+POST /api/batch/ — several API calls in one HTTP request.
+
+    POST /api/batch/
+    [
+        {"method": "GET", "url": "/api/projects/"},
+        {"method": "GET", "url": "/api/notifications/?page=2"},
+        {"method": "PATCH", "url": "/api/issues/7/", "body": {"status": "closed"}}
+    ]
+
+    -> {"responses": [{"status": 200, "body": {...}}, ...]}   (same order)
+
+The batch is authenticated once; every sub-request is resolved with the URL
+resolver and dispatched in-process to its DRF view as the same user, so
+it pays neither the JWT decode nor the middleware stack again. Runs of
+consecutive GETs are executed concurrently on a shared, bounded thread
+pool (BATCH_MAX_WORKERS); writes run one at a time, in order, and act as
+barriers between the GET runs around them. A failing sub-request only
+affects its own entry.
+
+Only synchronous DRF endpoints under /api/ can be batched (not the async
+/api/async/ views, streaming responses or /api/batch/ itself).
+"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import orjson
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.exception import response_for_exception
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve
+from django.utils.functional import SimpleLazyObject
+from rest_framework import permissions, serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+BATCH_MAX_REQUESTS = 20
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+# Request headers passed on to every sub-request (besides the server variables)
+FORWARDED_META = ('HTTP_HOST', 'HTTP_USER_AGENT', 'HTTP_ACCEPT_LANGUAGE', 'REMOTE_ADDR',
+                  'SERVER_NAME', 'SERVER_PORT', 'SERVER_PROTOCOL', 'wsgi.url_scheme')
+
+
+def _max_workers():
+    return getattr(settings, 'BATCH_MAX_WORKERS', 4)
+
+
+_executor = SimpleLazyObject(
+    lambda: ThreadPoolExecutor(max_workers=_max_workers(), thread_name_prefix='api-batch')
+)
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=BATCH_METHODS, default='GET')
+    url = serializers.CharField()
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def validate_url(self, value):
+        if not value.startswith('/api/') or value.startswith(('/api/batch/', '/api/async/')):
+            raise serializers.ValidationError('Only /api/ endpoints (except /api/async/ and /api/batch/) can be batched.')
+        return value
+
+
+class BatchView(APIView):
+    """
+    Run a list of API sub-requests as the authenticated user.
+    POST /api/batch/ [{"method", "url", "body"}, ...]
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchItemSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=BATCH_MAX_REQUESTS,
+        )
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+
+        responses = [None] * len(items)
+        pending_reads = []
+        for index, item in enumerate(items):
+            if item['method'] == 'GET':
+                pending_reads.append(index)
+                continue
+            self._run_reads(request, items, pending_reads, responses)
+            pending_reads = []
+            responses[index] = dispatch(request, item)
+        self._run_reads(request, items, pending_reads, responses)
+        return Response({'responses': responses})
+
+    def _run_reads(self, request, items, indexes, responses):
+        if len(indexes) == 1:
+            responses[indexes[0]] = dispatch(request, items[indexes[0]])
+            return
+        futures = {
+            index: _executor.submit(copy_context().run, _dispatch_in_worker, request, items[index])
+            for index in indexes
+        }
+        for index, future in futures.items():
+            responses[index] = future.result()
+
+
+def _dispatch_in_worker(request, item):
+    # Pool threads hold their own database connections: treat every task
+    # like a request so CONN_MAX_AGE / health checks apply to them.
+    close_old_connections()
+    try:
+        return dispatch(request, item)
+    finally:
+        close_old_connections()
+
+
+def _sub_request(request, item):
+    path, _, query_string = item['url'].partition('?')
+    body = b'' if item.get('body') is None else orjson.dumps(item['body'])
+    environ = {key: request.META[key] for key in FORWARDED_META if key in request.META}
+    environ.update({
+        'REQUEST_METHOD': item['method'],
+        'PATH_INFO': path,
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': query_string,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(body),
+    })
+    environ.setdefault('wsgi.url_scheme', request.scheme)
+    sub_request = WSGIRequest(environ)
+    # Reuse the batch's authentication: DRF's Request picks these up
+    # instead of running the authentication classes again.
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    sub_request.user = request.user
+    return path, sub_request
+
+
+def dispatch(request, item):
+    """Run one batch item and return {"status", "body"}."""
+    path, sub_request = _sub_request(request, item)
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return {'status': 404, 'body': {'detail': 'Not found.'}}
+    if iscoroutinefunction(match.func) or not hasattr(match.func, 'cls'):
+        return {'status': 400, 'body': {'detail': 'This endpoint cannot be batched.'}}
+
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+    except Exception as exc:
+        # Logged and signalled like an unhandled exception in a normal request
+        response_for_exception(sub_request, exc)
+        return {'status': 500, 'body': {'detail': 'Server error.'}}
+    if response.streaming:
+        response.close()
+        return {'status': 400, 'body': {'detail': 'Streaming responses cannot be batched.'}}
+    if hasattr(response, 'render'):
+        response.render()
+    content = response.content
+    if not content:
+        body = None
+    elif response.get('Content-Type', '').startswith('application/json'):
+        body = orjson.loads(content)
+    else:
+        body = content.decode(response.charset)
+    return {'status': response.status_code, 'body': body}
@@ -0,0 +1,93 @@
+# backend/core/counters.py
+"""
+Trigger-maintained row counters (core.models.RowCount).
+
+COUNT(*) over a large table, or over one recipient's notifications, reads
+every matching index entry. For the list endpoints and admin changelists
+that only need "about how many", the database keeps a running count
+instead: row_count_triggers() returns a migration operation that installs
+SQLite triggers on a table which increment / decrement
+
+- the table total (scope_id 0)
+- the count for the row's scope column (e.g. recipient_id, room_id)
+
+on every insert, delete and change of the scope column, and backfills the
+counters from the existing rows. Each write to the table costs one small
+upsert per counter. On other database backends the operation does nothing
+and estimates fall back to None / capped counts.
+"""
+from django.db import migrations
+from django.db.models import Sum
+
+from .models import RowCount
+
+TOTAL_SCOPE = 0
+
+
+def _trigger_sql(table, column):
+    counter = RowCount._meta.db_table
+    upsert = (
+        f'INSERT INTO {counter} (table_name, scope_id, row_count) '
+        f"VALUES ('{table}', {TOTAL_SCOPE}, {{delta}}), ('{table}', {{row}}.{column}, {{delta}}) "
+        f'ON CONFLICT (table_name, scope_id) DO UPDATE SET row_count = row_count + excluded.row_count;'
+    )
+    return [
+        f'CREATE TRIGGER {table}_count_insert AFTER INSERT ON {table} BEGIN '
+        f'{upsert.format(row="NEW", delta=1)} END;',
+        f'CREATE TRIGGER {table}_count_delete AFTER DELETE ON {table} BEGIN '
+        f'{upsert.format(row="OLD", delta=-1)} END;',
+        # Moving a row to another scope: the total cancels out (-1 + 1)
+        f'CREATE TRIGGER {table}_count_move AFTER UPDATE OF {column} ON {table} '
+        f'WHEN OLD.{column} IS NOT NEW.{column} BEGIN '
+        f'{upsert.format(row="OLD", delta=-1)} {upsert.format(row="NEW", delta=1)} END;',
+    ]
+
+
+def row_count_triggers(table, column):
+    """Migration operation: count `table` rows in total and per `column`."""
+    counter = RowCount._meta.db_table
+
+    def install(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        schema_editor.execute(f"DELETE FROM {counter} WHERE table_name = '{table}'")
+        schema_editor.execute(
+            f'INSERT INTO {counter} (table_name, scope_id, row_count) '
+            f"SELECT '{table}', {TOTAL_SCOPE}, COUNT(*) FROM {table} "
+            f"UNION ALL SELECT '{table}', {column}, COUNT(*) FROM {table} "
+            f'WHERE {column} IS NOT NULL GROUP BY {column}'
+        )
+        for statement in _trigger_sql(table, column):
+            schema_editor.execute(statement)
+
+    def uninstall(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for suffix in ('insert', 'delete', 'move'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_count_{suffix}')
+        schema_editor.execute(f"DELETE FROM {counter} WHERE table_name = '{table}'")
+
+    return migrations.RunPython(install, uninstall)
+
+
+def _counter_rows(model, scopes):
+    rows = RowCount.objects.filter(table_name=model._meta.db_table)
+    if scopes is None:
+        return rows.filter(scope_id=TOTAL_SCOPE)
+    return rows.filter(scope_id__in=scopes)
+
+
+def estimated_rows(model, scopes=None):
+    """
+    Counted rows of `model` in total, or summed over the given scope values.
+    None when the table has no counters (not installed / other backend).
+    """
+    if not RowCount.objects.filter(table_name=model._meta.db_table).exists():
+        return None
+    return _counter_rows(model, scopes).aggregate(total=Sum('row_count'))['total'] or 0
+
+
+async def aestimated_rows(model, scopes=None):
+    if not await RowCount.objects.filter(table_name=model._meta.db_table).aexists():
+        return None
+    return (await _counter_rows(model, scopes).aaggregate(total=Sum('row_count')))['total'] or 0
@@ -0,0 +1,59 @@
+# backend/core/db.py
+"""
+Retrying write transactions on SQLite lock contention.
+
+SQLite has a single writer. With the production profile (see
+SQLITE_PRODUCTION in settings) writers queue on busy_timeout, but under a
+burst a transaction can still give up with "database is locked".
+run_write_transaction() runs a function in its own transaction and, on a
+lock error, rolls back and runs it again after a short jittered backoff.
+The whole unit is re-run, so it must not have side effects outside the
+database (use transaction.on_commit for those).
+"""
+import random
+import time
+
+from django.db import OperationalError, transaction
+
+WRITE_RETRIES = 5
+RETRY_BASE_DELAY = 0.05
+
+
+def is_lock_error(exc):
+    message = str(exc).lower()
+    return 'database is locked' in message or 'database table is locked' in message
+
+
+def run_write_transaction(func, *args, retries=WRITE_RETRIES, using=None, **kwargs):
+    """
+    Call func(*args, **kwargs) inside transaction.atomic(), retrying on lock
+    errors. Inside an outer transaction there is nothing safe to retry, so
+    func just joins it.
+    """
+    if transaction.get_connection(using).in_atomic_block:
+        return func(*args, **kwargs)
+    for attempt in range(retries + 1):
+        try:
+            with transaction.atomic(using=using):
+                return func(*args, **kwargs)
+        except OperationalError as exc:
+            if attempt == retries or not is_lock_error(exc):
+                raise
+            time.sleep(RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+class LockRetryMixin:
+    """
+    ViewSet mixin: run create / update / destroy as one retried write
+    transaction, so a request that loses the write lock is replayed from
+    scratch instead of returning a 500.
+    """
+
+    def create(self, request, *args, **kwargs):
+        return run_write_transaction(super().create, request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        return run_write_transaction(super().update, request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        return run_write_transaction(super().destroy, request, *args, **kwargs)
@@ -0,0 +1,266 @@
+# backend/core/fastpath.py
+"""
+Read-only fast path for list endpoints.
+
+ModelSerializer spends most of its time in per-object field machinery
+(get_attribute, to_representation, nested serializer instances). For list
+actions that only read, FastListMixin instead pages a values() queryset and
+builds the response dicts directly from the rows, using a field mapping
+compiled once per serializer class:
+
+- plain model fields       -> copied from the row (datetimes/dates/decimals
+                              go through the DRF field's to_representation)
+- single PK related fields -> the FK column
+- nested serializers (FK)  -> a nested dict from prefixed columns
+                              (e.g. sender__username), None for a null FK
+- many PK related fields   -> one extra query for the whole page
+- nested many serializers  -> one extra query on the child model for the page
+- anything else            -> a caller-supplied Loader (`computed`)
+
+The output is the same as the serializer's. Serializers with fields the
+mapping cannot express (method fields, dotted sources, ...) and no computed
+loader are rejected with ImproperlyConfigured when first used. Every query
+can also run through the async ORM (abuild_many), see core/asyncapi.py.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Field types whose values() column is already the serialized value
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.ReadOnlyField,
+)
+# Field types that need the DRF field's to_representation
+CONVERTED_FIELDS = (
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.TimeField,
+)
+
+
+def _iso_datetime(value):
+    # DateTimeField.to_representation for the default ISO 8601 format,
+    # without the per-call settings and timezone lookups
+    if timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    text = value.isoformat()
+    return text[:-6] + 'Z' if text.endswith('+00:00') else text
+
+
+def converter_for(field):
+    if (
+        type(field) is serializers.DateTimeField
+        and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601
+        and not hasattr(field, 'timezone')
+        and timezone.is_aware(timezone.now())
+    ):
+        return _iso_datetime
+    return field.to_representation
+
+
+class Loader:
+    """
+    One extra query per page, grouped by parent pk. Subclasses provide
+    query(pks) and group(rows, pks); load() and aload() run the query with
+    the sync or async ORM.
+    """
+
+    def query(self, pks):
+        raise NotImplementedError
+
+    def group(self, rows, pks):
+        raise NotImplementedError
+
+    def load(self, pks):
+        return self.group(list(self.query(pks)), pks)
+
+    async def aload(self, pks):
+        return self.group([row async for row in self.query(pks).aiterator()], pks)
+
+
+class ManyPksLoader(Loader):
+    """Related pks of a many-to-many field: {pk: [related pk, ...]}."""
+
+    def __init__(self, model, source):
+        self.model = model
+        self.source = source
+
+    def query(self, pks):
+        # values() rather than values_list(): the latter cannot be consumed
+        # with aiterator()
+        return (
+            self.model._base_manager
+            .filter(pk__in=pks, **{f'{self.source}__isnull': False})
+            .order_by('pk', self.source)
+            .values('pk', self.source)
+        )
+
+    def group(self, rows, pks):
+        grouped = {pk: [] for pk in pks}
+        for row in rows:
+            grouped[row['pk']].append(row[self.source])
+        return grouped
+
+
+class NestedManyLoader(Loader):
+    """Nested serializer over a reverse FK or many-to-many: {pk: [dict, ...]}."""
+
+    def __init__(self, model, source, child_class):
+        relation = model._meta.get_field(source)
+        self.child_model = relation.related_model
+        # Lookup from the child back to the parent
+        self.parent = relation.field.name if relation.auto_created else relation.related_query_name()
+        self.child = FastPath(child_class)
+
+    def query(self, pks):
+        return (
+            self.child_model._default_manager
+            .filter(**{f'{self.parent}__in': pks})
+            .order_by(self.parent, *(self.child_model._meta.ordering or ['pk']))
+            .values(self.parent, *self.child.lookups)
+        )
+
+    def group(self, rows, pks):
+        grouped = {pk: [] for pk in pks}
+        for row in rows:
+            grouped[row[self.parent]].append(self.child.build(row))
+        return grouped
+
+
+class FastPath:
+    """
+    Compiled mapping from values() rows to one serializer's output.
+
+    `computed` supplies fields the mapping cannot derive (such as
+    SerializerMethodFields) as {key: (loader, transform)}: the loader runs
+    once per page (loaders shared by several keys run once) and
+    transform(loaded value) gives the field, or the value itself when
+    transform is None.
+    """
+
+    def __init__(self, serializer_class, prefix='', computed=None):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.prefix = prefix
+        self.lookups = []  # columns to ask values() for
+        self.fields = []   # (key, column, converter or None) in output order
+        self.nested = {}   # key -> (FK column, nested FastPath)
+        self.many = {}     # key -> (loader, transform)
+        computed = computed or {}
+
+        for key, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if key in computed:
+                self.many[key] = computed[key]
+                self.fields.append((key, None, None))
+                continue
+            source = field.source
+            if '.' in source or source == '*':
+                raise self._unsupported(key, field)
+            column = prefix + source
+            if prefix and isinstance(field, (serializers.ManyRelatedField, serializers.ListSerializer)):
+                raise self._unsupported(key, field)
+
+            if isinstance(field, serializers.ManyRelatedField):
+                self.many[key] = (ManyPksLoader(self.model, source), None)
+                self.fields.append((key, None, None))
+            elif isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.ModelSerializer):
+                self.many[key] = (NestedManyLoader(self.model, source, type(field.child)), None)
+                self.fields.append((key, None, None))
+            elif isinstance(field, serializers.ModelSerializer):
+                nested = FastPath(type(field), prefix=f'{column}__')
+                self.lookups.append(column)
+                self.lookups.extend(nested.lookups)
+                self.nested[key] = (column, nested)
+                self.fields.append((key, None, None))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                self.lookups.append(column)
+                self.fields.append((key, column, None))
+            elif isinstance(field, CONVERTED_FIELDS):
+                self.lookups.append(column)
+                self.fields.append((key, column, converter_for(field)))
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                self.lookups.append(column)
+                self.fields.append((key, column, None))
+            else:
+                raise self._unsupported(key, field)
+        self.loaders = list(dict.fromkeys(loader for loader, _ in self.many.values()))
+
+    def _unsupported(self, key, field):
+        return ImproperlyConfigured(
+            f"{self.serializer_class.__name__}.{key} ({type(field).__name__}) "
+            f"is not supported by the list fast path."
+        )
+
+    def build(self, row, loaded=None):
+        """Serializer-shaped dict for one values() row."""
+        data = {}
+        for key, column, convert in self.fields:
+            if column is not None:
+                value = row[column]
+                data[key] = value if convert is None or value is None else convert(value)
+            elif key in self.nested:
+                fk_column, nested = self.nested[key]
+                data[key] = None if row[fk_column] is None else nested.build(row)
+            else:
+                loader, transform = self.many[key]
+                value = loaded[loader][row['id']]
+                data[key] = value if transform is None else transform(value)
+        return data
+
+    def build_many(self, rows):
+        rows = list(rows)
+        pks = [row['id'] for row in rows]
+        loaded = {loader: loader.load(pks) for loader in self.loaders}
+        return [self.build(row, loaded) for row in rows]
+
+    async def abuild_many(self, queryset):
+        """build_many() for a values() queryset, using the async ORM."""
+        rows = [row async for row in queryset.aiterator()]
+        pks = [row['id'] for row in rows]
+        loaded = {loader: await loader.aload(pks) for loader in self.loaders}
+        return [self.build(row, loaded) for row in rows]
+
+    def values(self, queryset):
+        columns = list(dict.fromkeys(['id', *self.lookups]))
+        return queryset.prefetch_related(None).values(*columns)
+
+
+_compiled = {}
+
+
+def fast_path_for(serializer_class, computed=None):
+    key = (serializer_class, tuple(computed or ()))
+    if key not in _compiled:
+        _compiled[key] = FastPath(serializer_class, computed=computed)
+    return _compiled[key]
+
+
+class FastListMixin:
+    """
+    ViewSet mixin: serve the `list` action from values() rows through the
+    compiled FastPath of the list serializer instead of instantiating the
+    serializer per object. Set `fast_list = False` to opt out.
+    """
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return super().list(request, *args, **kwargs)
+        fast_path = fast_path_for(self.get_serializer_class())
+        rows = fast_path.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast_path.build_many(page))
+        return Response(fast_path.build_many(rows))
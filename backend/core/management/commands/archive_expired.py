@@ -0,0 +1,71 @@
+"""
+Move notifications and chat messages past their retention policy
+(RETENTION_POLICIES in settings) into compressed archive blocks, in small
+transactions (see core/archive.py). Safe to interrupt and re-run.
+
+Usage:
+    python manage.py archive_expired
+    python manage.py archive_expired --only messages --block-size 500 --pause 0.05
+    python manage.py archive_expired --interval 3600   # keep running as a worker
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.history import archive_expired_messages
+from core.archive import ARCHIVE_BLOCK_SIZE
+from notifications.archive import archive_read_notifications
+
+ARCHIVERS = {
+    'notifications': archive_read_notifications,
+    'messages': archive_expired_messages,
+}
+
+
+class Command(BaseCommand):
+    help = 'Archive expired notifications and chat messages into compressed blocks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            choices=list(ARCHIVERS),
+            default=None,
+            help='Archive only this kind of rows',
+        )
+        parser.add_argument(
+            '--block-size',
+            type=int,
+            default=ARCHIVE_BLOCK_SIZE,
+            help=f'Maximum rows per archive block / transaction (default: {ARCHIVE_BLOCK_SIZE})',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between blocks, leaving the write lock to other writers',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Keep running and archive again every INTERVAL seconds',
+        )
+
+    def handle(self, *args, **options):
+        if options['block_size'] < 1:
+            raise CommandError('--block-size must be a positive integer')
+        names = [options['only']] if options['only'] else list(ARCHIVERS)
+
+        while True:
+            for name in names:
+                total = blocks = 0
+                for scope_id, month, archived in ARCHIVERS[name](block_size=options['block_size'],
+                                                                  pause=options['pause']):
+                    total += archived
+                    blocks += 1
+                    self.stdout.write(f'  {name} {scope_id} {month:%Y-%m}: {archived} archived')
+                self.stdout.write(self.style.SUCCESS(f'✓ {total} {name} archived in {blocks} blocks'))
+
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,186 @@
+# backend/core/management/commands/benchmark_async_reads.py
+"""
+Compare the async read endpoints under ASGI with the synchronous DRF
+endpoints under WSGI, in-process and against the configured database.
+
+- WSGI: core.wsgi's handler, one thread per concurrent connection, serving
+  /api/projects/, /api/issues/, /api/messages/, /api/notifications/
+- ASGI: core.asgi's application on one event loop, serving the same paths
+  under /api/async/
+
+For each deployment it reports requests per second and the peak Python
+memory (tracemalloc) held per concurrent connection while requests are in
+flight. Thread stacks are not Python allocations: on top of the WSGI
+figure every worker thread also reserves its own stack.
+
+Only GET requests are sent, so the database is left unchanged.
+
+Usage:
+    python manage.py benchmark_async_reads --user alice
+    python manage.py benchmark_async_reads --user alice --requests 5000 --concurrency 200
+"""
+import asyncio
+import io
+import itertools
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+
+READ_PATHS = ['/api/projects/', '/api/issues/', '/api/messages/', '/api/notifications/']
+ASYNC_PREFIX = '/api/async/'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the async read endpoints (ASGI) against the sync endpoints (WSGI)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Username to authenticate as (JWT)')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per deployment (default: 2000)')
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent connections (default: 50)')
+        parser.add_argument(
+            '--memory-requests',
+            type=int,
+            default=None,
+            help='Requests in the (slower) tracemalloc pass (default: 2 x concurrency)',
+        )
+
+    def handle(self, *args, **options):
+        total, concurrency = options['requests'], options['concurrency']
+        if total < 1 or concurrency < 1:
+            raise CommandError('--requests and --concurrency must be positive integers')
+        memory_total = options['memory_requests'] or 2 * concurrency
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+        authorization = f'Bearer {AccessToken.for_user(user)}'
+        self.host = next(
+            (host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')),
+            'localhost',
+        )
+
+        from core.asgi import application as asgi_application
+        from core.wsgi import application as wsgi_application
+
+        sync_paths = READ_PATHS
+        async_paths = [path.replace('/api/', ASYNC_PREFIX, 1) for path in READ_PATHS]
+
+        self.stdout.write(f'{total} requests, {concurrency} concurrent connections, paths: {", ".join(READ_PATHS)}')
+        rows = []
+        for name, run, application, paths in (
+            ('WSGI (sync views, threads)', self.run_wsgi, wsgi_application, sync_paths),
+            ('ASGI (async views, event loop)', self.run_asgi, asgi_application, async_paths),
+        ):
+            run(application, paths, authorization, concurrency, concurrency)  # warm-up
+            started = time.perf_counter()
+            errors = run(application, paths, authorization, total, concurrency)
+            elapsed = time.perf_counter() - started
+
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            run(application, paths, authorization, memory_total, concurrency)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            rows.append((name, total / elapsed, (peak - baseline) / concurrency / 1024, errors))
+
+        self.stdout.write('')
+        self.stdout.write(f'{"deployment":<34}{"req/s":>10}{"KiB/conn":>12}{"errors":>8}')
+        for name, rate, memory, errors in rows:
+            self.stdout.write(f'{name:<34}{rate:>10.0f}{memory:>12.1f}{errors:>8}')
+        speedup = rows[1][1] / rows[0][1]
+        style = self.style.SUCCESS if speedup >= 1 else self.style.WARNING
+        self.stdout.write(style(f'ASGI / WSGI throughput: {speedup:.2f}x'))
+
+    # -------------------------------------------------------------------------
+    # WSGI: a pool of worker threads, one per connection
+    # -------------------------------------------------------------------------
+    def run_wsgi(self, application, paths, authorization, total, concurrency):
+        def request(path):
+            status = []
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': self.host,
+                'HTTP_AUTHORIZATION': authorization,
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': io.StringIO(),
+                'wsgi.url_scheme': 'http',
+                'wsgi.version': (1, 0),
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            body = application(environ, lambda code, headers, exc_info=None: status.append(code))
+            try:
+                for _ in body:
+                    pass
+            finally:
+                body.close()
+            return not status[0].startswith('200')
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return sum(pool.map(request, itertools.islice(itertools.cycle(paths), total)))
+
+    # -------------------------------------------------------------------------
+    # ASGI: `concurrency` connections multiplexed on one event loop
+    # -------------------------------------------------------------------------
+    def run_asgi(self, application, paths, authorization, total, concurrency):
+        async def request(path):
+            status = []
+            disconnected = asyncio.Event()
+            sent_body = False
+
+            async def receive():
+                nonlocal sent_body
+                if not sent_body:
+                    sent_body = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'root_path': '',
+                'headers': [(b'host', self.host.encode()), (b'authorization', authorization.encode())],
+                'client': ('127.0.0.1', 0),
+                'server': ('localhost', 80),
+            }
+            await application(scope, receive, send)
+            disconnected.set()
+            return status[0] != 200
+
+        async def main():
+            queue = itertools.islice(itertools.cycle(paths), total)
+            errors = 0
+
+            async def connection():
+                nonlocal errors
+                for path in queue:
+                    errors += await request(path)
+
+            await asyncio.gather(*(connection() for _ in range(concurrency)))
+            return errors
+
+        return asyncio.run(main())
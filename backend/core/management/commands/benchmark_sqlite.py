@@ -0,0 +1,164 @@
+# backend/core/management/commands/benchmark_sqlite.py
+"""
+Concurrency benchmark of the SQLite profiles (see SQLITE_PRODUCTION in
+core/settings.py).
+
+Each profile gets a fresh, migrated database file in a temporary directory
+(the project database is never touched). Writer threads then post chat
+messages with a notification fan-out (one Message + N Notifications per
+transaction, like a project chat) while reader threads load the latest
+messages of the room and count unread notifications, for a fixed time.
+
+- default:    rollback journal, BEGIN DEFERRED, one connection per request
+- production: WAL, synchronous=NORMAL, BEGIN IMMEDIATE, busy_timeout,
+              larger cache / mmap, persistent connections, write retry
+
+Usage:
+    python manage.py benchmark_sqlite
+    python manage.py benchmark_sqlite --writers 16 --readers 16 --duration 10
+"""
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from chat.models import ChatRoom, Message
+from core.db import is_lock_error, run_write_transaction
+from notifications.models import Notification
+from users.models import User
+
+PROFILES = {
+    'default': {},
+    'production': settings.SQLITE_PRODUCTION,
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare read/write throughput of the default and production SQLite profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Writer threads (default: 8)')
+        parser.add_argument('--readers', type=int, default=8, help='Reader threads (default: 8)')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile (default: 5)')
+        parser.add_argument('--fanout', type=int, default=10, help='Notifications per message (default: 10)')
+
+    def handle(self, *args, **options):
+        if options['writers'] < 1 or options['readers'] < 0 or options['fanout'] < 0 or options['duration'] <= 0:
+            raise CommandError('--writers must be positive; --readers, --fanout and --duration non-negative')
+
+        directory = Path(tempfile.mkdtemp(prefix='sqlite-bench-'))
+        try:
+            results = {
+                profile: self.run_profile(profile, overrides, directory, options)
+                for profile, overrides in PROFILES.items()
+            }
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self.stdout.write('')
+        self.stdout.write(f'{"profile":<12}{"writes/s":>10}{"reads/s":>10}{"lock errors":>13}')
+        for profile, (writes, reads, errors) in results.items():
+            self.stdout.write(f'{profile:<12}{writes:>10.0f}{reads:>10.0f}{errors:>13}')
+        (base_writes, base_reads, _), (writes, reads, _) = results['default'], results['production']
+        self.stdout.write(self.style.SUCCESS(
+            f'production / default: writes {writes / max(base_writes, 1e-9):.2f}x, '
+            f'reads {reads / max(base_reads, 1e-9):.2f}x'
+        ))
+
+    # -------------------------------------------------------------------------
+    def configure(self, alias, overrides, path):
+        database = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(path),
+            **overrides,
+            'OPTIONS': dict(overrides.get('OPTIONS', {})),
+        }
+        configured = connections.configure_settings({'default': settings.DATABASES['default'], alias: database})
+        connections.settings[alias] = configured[alias]
+
+    def run_profile(self, profile, overrides, directory, options):
+        alias = f'bench_{profile}'
+        self.configure(alias, overrides, directory / f'{profile}.sqlite3')
+        self.stdout.write(f'[{profile}] migrating a scratch database...')
+        call_command('migrate', database=alias, verbosity=0)
+
+        users = User.objects.using(alias).bulk_create([
+            User(username=f'bench-{i}') for i in range(options['fanout'] + 1)
+        ])
+        room = ChatRoom.objects.using(alias).create(name='Benchmark', room_type='general')
+        connections[alias].close()
+
+        persistent = overrides.get('CONN_MAX_AGE', 0) != 0
+        retry = profile == 'production'
+        deadline = time.monotonic() + options['duration']
+        counts = {'writes': 0, 'reads': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def post_message(sender, recipients):
+            message = Message.objects.using(alias).create(room_id=room.pk, sender_id=sender.pk, content='benchmark')
+            Notification.objects.using(alias).bulk_create([
+                Notification(recipient_id=user.pk, actor_id=sender.pk, type='general', message=message.content)
+                for user in recipients
+            ])
+
+        def writer(index):
+            sender, recipients = users[0], users[1:]
+            while time.monotonic() < deadline:
+                try:
+                    if retry:
+                        run_write_transaction(post_message, sender, recipients, using=alias)
+                    else:
+                        with transaction.atomic(using=alias):
+                            post_message(sender, recipients)
+                    key = 'writes'
+                except OperationalError as exc:
+                    if not is_lock_error(exc):
+                        raise
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+                if not persistent:
+                    connections[alias].close()
+            connections[alias].close()
+
+        def reader(index):
+            recipient = users[1 + index % max(len(users) - 1, 1)] if len(users) > 1 else users[0]
+            while time.monotonic() < deadline:
+                try:
+                    list(Message.objects.using(alias).filter(room_id=room.pk).order_by('-id')[:20])
+                    Notification.objects.using(alias).filter(recipient_id=recipient.pk, is_read=False).count()
+                    key = 'reads'
+                except OperationalError as exc:
+                    if not is_lock_error(exc):
+                        raise
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+                if not persistent:
+                    connections[alias].close()
+            connections[alias].close()
+
+        self.stdout.write(
+            f'[{profile}] {options["writers"]} writers, {options["readers"]} readers '
+            f'for {options["duration"]:g}s...'
+        )
+        threads = (
+            [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+            + [threading.Thread(target=reader, args=(i,)) for i in range(options['readers'])]
+        )
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        connections[alias].close()
+        del connections.settings[alias]
+        return counts['writes'] / elapsed, counts['reads'] / elapsed, counts['errors']
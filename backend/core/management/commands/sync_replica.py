@@ -0,0 +1,70 @@
+# backend/core/management/commands/sync_replica.py
+"""
+Copy the `default` SQLite database onto the `replica` database file.
+
+Uses SQLite's online backup API, so the snapshot is consistent even while
+the application is writing, and readers of the replica see the old or the
+new snapshot, never a half-copied file. For local testing of the
+primary/replica router (core/routers.py):
+
+    export DJANGO_REPLICA_DB=/tmp/replica.sqlite3
+    python manage.py sync_replica                 # one snapshot
+    python manage.py sync_replica --interval 2    # refresh every 2 seconds
+"""
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.routers import REPLICA_DB_ALIAS
+
+PAGES_PER_STEP = 4096
+
+
+class Command(BaseCommand):
+    help = 'Snapshot the default SQLite database into the replica database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            help='Replica file to write (default: DATABASES["replica"]["NAME"])',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Keep running and take a snapshot every INTERVAL seconds',
+        )
+
+    def handle(self, *args, **options):
+        source = settings.DATABASES['default']
+        if source['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('sync_replica only supports SQLite databases')
+        target = options['target'] or settings.DATABASES.get(REPLICA_DB_ALIAS, {}).get('NAME')
+        if not target:
+            raise CommandError('No replica configured: set DJANGO_REPLICA_DB or pass --target')
+        if str(target) == str(source['NAME']):
+            raise CommandError('The replica cannot be the default database itself')
+
+        interval = options['interval']
+        while True:
+            started = time.monotonic()
+            pages = self.snapshot(source['NAME'], target)
+            self.stdout.write(self.style.SUCCESS(
+                f'Replica {target} refreshed ({pages} pages, {time.monotonic() - started:.2f}s)'
+            ))
+            if interval is None:
+                return
+            time.sleep(max(interval - (time.monotonic() - started), 0))
+
+    def snapshot(self, source_path, target_path):
+        timeout = settings.DATABASES['default'].get('OPTIONS', {}).get('timeout', 5)
+        source = sqlite3.connect(str(source_path), timeout=timeout)
+        target = sqlite3.connect(str(target_path), timeout=timeout)
+        try:
+            source.backup(target, pages=PAGES_PER_STEP)
+            return target.execute('PRAGMA page_count').fetchone()[0]
+        finally:
+            target.close()
+            source.close()
@@ -0,0 +1,22 @@
+# backend/core/models.py
+from django.db import models
+
+
+class RowCount(models.Model):
+    """
+    Row count of a table, in total (scope_id 0) and per scope value (e.g.
+    notifications per recipient, messages per room). Maintained by database
+    triggers (see core/counters.py), so bulk inserts and cascaded deletes
+    are counted too.
+    """
+    table_name = models.CharField(max_length=100)
+    scope_id = models.BigIntegerField(default=0)
+    row_count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['table_name', 'scope_id'], name='unique_rowcount_scope'),
+        ]
+
+    def __str__(self):
+        return f"{self.table_name}[{self.scope_id}] = {self.row_count}"
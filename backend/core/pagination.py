@@ -0,0 +1,111 @@
+# backend/core/pagination.py
+"""
+Pagination without COUNT(*) for large tables.
+
+PageNumberPagination counts the whole result to fill `count`, even for page
+1. CountFreePagination instead reads page_size + 1 rows: the extra row
+only tells whether there is a next page. The response keeps the `next` /
+`previous` / `results` keys and replaces `count` with `estimated_count`,
+taken from the view's get_estimated_count() (trigger-maintained counters,
+see core/counters.py) when the list is unfiltered, or null.
+
+EstimatedCountPaginator is the Django Paginator counterpart for admin
+changelists: the table-wide counter for an unfiltered changelist, a count
+capped at ESTIMATE_CAP rows otherwise.
+"""
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counters import estimated_rows
+from .params import parse_positive_int
+
+ESTIMATE_CAP = 10000
+
+
+def parse_page_number(value):
+    """Positive page number from a ?page= value, or None."""
+    return parse_positive_int(value)
+
+
+def page_links(url, page_number, has_next, page_query_param='page'):
+    if page_number == 2:
+        previous = remove_query_param(url, page_query_param)
+    else:
+        previous = replace_query_param(url, page_query_param, page_number - 1) if page_number > 1 else None
+    next_url = replace_query_param(url, page_query_param, page_number + 1) if has_next else None
+    return next_url, previous
+
+
+class CountFreePagination(PageNumberPagination):
+    """
+    ?page=N pagination that never counts. Views may define
+    get_estimated_count() returning an int (or None) for the unfiltered list.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        self.page_number = parse_page_number(request.query_params.get(self.page_query_param, 1))
+        if self.page_number is None:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param), message='Invalid page.',
+            ))
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=self.page_number, message='That page contains no results',
+            ))
+        self.has_next = len(rows) > page_size
+
+        self.estimated_count = None
+        paging_params = {self.page_query_param, self.page_size_query_param}
+        if hasattr(view, 'get_estimated_count') and set(request.query_params) <= paging_params:
+            self.estimated_count = view.get_estimated_count()
+        return rows[:page_size]
+
+    def get_next_link(self):
+        return page_links(self.request.build_absolute_uri(), self.page_number, self.has_next,
+                          self.page_query_param)[0]
+
+    def get_previous_link(self):
+        return page_links(self.request.build_absolute_uri(), self.page_number, self.has_next,
+                          self.page_query_param)[1]
+
+    def get_paginated_response(self, data):
+        return Response({
+            'estimated_count': self.estimated_count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        count = response_schema['properties'].pop('count')
+        response_schema['properties'] = {
+            'estimated_count': {**count, 'nullable': True},
+            **response_schema['properties'],
+        }
+        response_schema['required'] = ['results']
+        return response_schema
+
+
+class EstimatedCountPaginator(Paginator):
+    """Admin changelist paginator that never runs an unbounded COUNT(*)."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_rows(queryset.model)
+            if estimate is not None:
+                return estimate
+        return queryset.order_by()[:ESTIMATE_CAP].count()
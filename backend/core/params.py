@@ -0,0 +1,15 @@
+# backend/core/params.py
+"""
+Parsing of integer request parameters: object ids, cursors and limits sent
+as query strings or in request bodies. Callers turn None into their own
+400 / 404 response or default.
+"""
+
+
+def parse_positive_int(value):
+    """Integer >= 1 from a query or body value, or None."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number >= 1 else None
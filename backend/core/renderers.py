@@ -0,0 +1,44 @@
+# backend/core/renderers.py
+"""
+orjson-backed JSON renderer and parser for Django REST Framework.
+
+Drop-in replacements for rest_framework's JSONRenderer / JSONParser
+(wired in settings.REST_FRAMEWORK). Output matches DRF's encoder:
+datetimes are ISO 8601 with 'Z' for UTC, and anything orjson cannot encode
+natively (Decimal, lazy strings, querysets, ...) falls back to DRF's
+JSONEncoder.default.
+"""
+import orjson
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _drf_encoder.default(obj)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = ORJSON_OPTIONS
+        # orjson only knows one indent width; any requested indent gets 2 spaces
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=options)
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
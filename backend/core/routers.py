@@ -0,0 +1,139 @@
+# backend/core/routers.py
+"""
+Primary / replica database routing.
+
+When a `replica` database is configured (see DJANGO_REPLICA_DB in
+settings), ReplicaRoutingMiddleware marks GET / HEAD / OPTIONS requests as
+replica reads and PrimaryReplicaRouter sends their queries to `replica`.
+Everything else reads and writes `default`:
+
+- unsafe requests (POST, PUT, PATCH, DELETE) and code outside requests
+  (management commands, signals fired by them)
+- reads inside a transaction on `default`
+- requests of a user who wrote in the last REPLICA_PIN_SECONDS
+  (read-your-writes: the replica may not have caught up yet)
+
+Users are recognised from the JWT access token (signature checked, no
+database query) or the admin session. Pins live in the cache, so all
+workers only see each other's pins with a shared cache backend.
+
+Without a replica every query goes to `default`.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_CACHE_KEY = 'db:primary-pin:{user_id}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def pin_to_primary(user_id):
+    seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+    cache.set(PIN_CACHE_KEY.format(user_id=user_id), True, seconds)
+
+
+def is_pinned(user_id):
+    return cache.get(PIN_CACHE_KEY.format(user_id=user_id), False)
+
+
+@contextmanager
+def use_primary():
+    """Force reads in this block to `default`, e.g. right before a write."""
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _read_from_replica.get() or not replica_configured():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of `default` (manage.py sync_replica)
+        return db != REPLICA_DB_ALIAS
+
+
+def request_user_id(request):
+    """User id from the Bearer token or the admin session, without a query."""
+    header = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(header) == 2 and header[0] == 'Bearer':
+        from rest_framework_simplejwt.exceptions import TokenError
+        from rest_framework_simplejwt.settings import api_settings
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        try:
+            return AccessToken(header[1]).get(api_settings.USER_ID_CLAIM)
+        except TokenError:
+            return None
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return session.get(SESSION_KEY)
+    return None
+
+
+class ReplicaRoutingMiddleware:
+    """Decide per request whether reads may use the replica (see module doc)."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _start(self, request):
+        if not replica_configured():
+            return None, None
+        user_id = request_user_id(request)
+        replica = request.method in SAFE_METHODS and not (user_id is not None and is_pinned(user_id))
+        return user_id, _read_from_replica.set(replica)
+
+    def _finish(self, request, user_id, token):
+        if token is None:
+            return
+        _read_from_replica.reset(token)
+        if request.method not in SAFE_METHODS and user_id is not None:
+            pin_to_primary(user_id)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user_id, token = self._start(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self._finish(request, user_id, token)
+
+    async def __acall__(self, request):
+        user_id, token = self._start(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self._finish(request, user_id, token)
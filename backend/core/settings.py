@@ -38,11 +38,13 @@ INSTALLED_APPS = [
     'django_filters',
 
     # Local apps
+    'core',
     'users',
     'projects',
     'issues',
     'chat',
     'notifications',
+    'tournaments',
 ]
 
 MIDDLEWARE = [
@@ -52,6 +54,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',  # after sessions: reads the session user
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -85,6 +88,60 @@ DATABASES = {
     }
 }
 
+# Production profile for SQLite (DJANGO_DB_PROFILE=production):
+# - WAL lets readers run alongside the single writer; synchronous=NORMAL is
+#   durable in WAL mode except for the last commits on power loss
+# - write transactions start with BEGIN IMMEDIATE so a writer waits for the
+#   lock up front (timeout = busy_timeout, seconds) instead of failing
+#   with "database is locked" when upgrading a read transaction
+# - 64 MiB page cache, 256 MiB memory map, temp tables in memory
+# - connections are kept for 10 minutes instead of one per request
+# Writes that still hit a lock are retried by core.db.LockRetryMixin.
+SQLITE_PRODUCTION = {
+    'CONN_MAX_AGE': 600,
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        'timeout': 20,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA cache_size=-65536;'
+            'PRAGMA mmap_size=268435456;'
+            'PRAGMA temp_store=MEMORY;'
+        ),
+    },
+}
+
+DB_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'development')
+if DB_PROFILE == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION)
+
+# Optional read replica (DJANGO_REPLICA_DB=/path/to/replica.sqlite3).
+# Safe-method requests read from it (core/routers.py); writes and users who
+# wrote in the last REPLICA_PIN_SECONDS stay on `default`. Locally the
+# replica is a snapshot of db.sqlite3 kept fresh by `manage.py sync_replica`.
+REPLICA_DB = os.environ.get('DJANGO_REPLICA_DB')
+if REPLICA_DB:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': REPLICA_DB,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = 5
+
+# ---------------------------------------------------------------------
+# Cache (tournament brackets, ...)
+# Per-process memory cache for development; point this at a shared
+# backend (e.g. Redis) when running several workers.
+# ---------------------------------------------------------------------
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 # ---------------------------------------------------------------------
 # Password validation
 # ---------------------------------------------------------------------
@@ -126,6 +183,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson instead of the stdlib json module (see core/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -147,3 +214,43 @@ SIMPLE_JWT = {
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
+
+# ---------------------------------------------------------------------
+# Tournaments – live scoreboard feed
+# ---------------------------------------------------------------------
+# Score events of a single match are coalesced to at most this many per second
+TOURNAMENT_LIVE_MAX_EVENTS_PER_SECOND = 2
+
+# ---------------------------------------------------------------------
+# Membership scoping (projects/visibility.py)
+# ---------------------------------------------------------------------
+# Lifetime of each user's cached visible project / chat room ids. Changes
+# invalidate the entries immediately, but only in the process that made
+# them: with the per-process cache above this bounds how long other workers
+# serve revoked memberships. Raise it only with a shared cache backend.
+VISIBILITY_CACHE_SECONDS = 5
+
+# ---------------------------------------------------------------------
+# Batch endpoint (core/batch.py)
+# ---------------------------------------------------------------------
+# Threads shared by all batches for running sub-request GETs concurrently
+BATCH_MAX_WORKERS = 4
+
+# ---------------------------------------------------------------------
+# Retention (core/archive.py, manage.py archive_expired)
+# ---------------------------------------------------------------------
+# Rows past these limits are moved into compressed archive blocks; None
+# disables a policy. Messages are only archived in rooms without a new
+# message for `messages_inactive_room_days`.
+RETENTION_POLICIES = {
+    'notifications_read_days': 90,
+    'messages_months': 6,
+    'messages_inactive_room_days': 30,
+}
+
+# ---------------------------------------------------------------------
+# User typeahead (users/suggest.py)
+# ---------------------------------------------------------------------
+# Each process rebuilds its in-memory prefix index after this many
+# seconds, picking up users changed by other processes or bulk writes.
+USER_SUGGEST_REBUILD_SECONDS = 300
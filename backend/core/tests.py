@@ -0,0 +1,340 @@
+import asyncio
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import OperationalError, transaction
+from django.http import HttpResponse
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from chat.models import ChatRoom, Message
+from chat.views import MessageViewSet
+from issues.models import Comment, Issue
+from issues.views import IssueViewSet
+from projects.models import Project
+from users.models import User
+from .batch import BATCH_MAX_REQUESTS
+from .counters import estimated_rows
+from .db import run_write_transaction
+from .pagination import CountFreePagination, EstimatedCountPaginator
+from .renderers import ORJSONParser, ORJSONRenderer
+from .routers import PrimaryReplicaRouter, ReplicaRoutingMiddleware, use_primary
+
+
+class RendererTests(SimpleTestCase):
+    def test_output_matches_drf(self):
+        data = {
+            'when': datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2026, 1, 2),
+            'amount': decimal.Decimal('12.50'),
+            'id': uuid.UUID(int=1),
+            'label': gettext_lazy('Invalid page.'),
+            'nested': [{'none': None, 'flag': True, 'text': 'é'}],
+            1: 'integer key',
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_parser(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO(b'{"a": [1, 2.5, null]}')), {'a': [1, 2.5, None]})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"a": '))
+
+
+class CoreTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw', first_name='Olive')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.outsider = User.objects.create_user('outsider', 'outsider@example.com', 'pw')
+        cls.project = Project.objects.create(name='Core', owner=cls.owner)
+        cls.project.members.add(cls.member)
+        cls.other_project = Project.objects.create(name='Other', owner=cls.outsider)
+
+    def setUp(self):
+        cache.clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+
+class FastPathTests(CoreTestCase):
+    def slow_and_fast(self, viewset, url):
+        client = self.client_for(self.owner)
+        fast = client.get(url)
+        with mock.patch.object(viewset, 'fast_list', False):
+            slow = client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        return slow.json(), fast.json()
+
+    def test_issue_list_matches_the_serializer(self):
+        for i in range(3):
+            issue = Issue.objects.create(title=f'Issue {i}', project=self.project, reporter=self.owner,
+                                         status=['open', 'closed', 'in_progress'][i])
+            issue.assignees.set([self.member, self.owner][:i])
+            for j in range(i):
+                Comment.objects.create(issue=issue, author=self.member, content=f'Comment {j}')
+        Issue.objects.create(title='Hidden', project=self.other_project, reporter=self.outsider)
+
+        slow, fast = self.slow_and_fast(IssueViewSet, '/api/issues/?ordering=created_at')
+        self.assertEqual(fast, slow)
+        self.assertEqual(len(fast['results']), 3)
+        self.assertEqual(fast['results'][2]['assignees'], [self.owner.pk, self.member.pk])
+
+    def test_message_list_matches_the_serializer(self):
+        room = ChatRoom.objects.create(name='Room', project=self.project)
+        room.members.add(self.owner)
+        Message.objects.bulk_create([
+            Message(room=room, sender=sender, content=f'Message {i}')
+            for i, sender in enumerate([self.owner, self.member, None])
+        ])
+
+        slow, fast = self.slow_and_fast(MessageViewSet, '/api/messages/')
+        self.assertEqual(fast, slow)
+        self.assertEqual([row['sender'] and row['sender']['username'] for row in fast['results']],
+                         ['owner', 'member', None])
+
+
+@mock.patch('core.db.time.sleep')
+class LockRetryTests(TransactionTestCase):
+    def flaky(self, failures, error='database is locked'):
+        calls = []
+
+        def write():
+            calls.append(User.objects.create_user(f'user{len(calls)}'))
+            if len(calls) <= failures:
+                raise OperationalError(error)
+            return len(calls)
+
+        return write, calls
+
+    def test_lock_errors_roll_back_and_retry(self, sleep):
+        write, calls = self.flaky(failures=2)
+        self.assertEqual(run_write_transaction(write), 3)
+        self.assertEqual(sleep.call_count, 2)
+        # Only the successful attempt's write is left
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['user2'])
+
+    def test_other_errors_and_exhausted_retries_are_raised(self, sleep):
+        write, calls = self.flaky(failures=1, error='no such table: nope')
+        with self.assertRaisesMessage(OperationalError, 'no such table'):
+            run_write_transaction(write)
+        self.assertEqual(len(calls), 1)
+
+        write, calls = self.flaky(failures=10)
+        with self.assertRaises(OperationalError):
+            run_write_transaction(write, retries=2)
+        self.assertEqual(len(calls), 3)
+        self.assertFalse(User.objects.exists())
+
+    def test_viewset_writes_are_replayed(self, sleep):
+        owner = User.objects.create_user('owner')
+        project = Project.objects.create(name='Locked', owner=owner)
+        client = APIClient()
+        client.force_authenticate(owner)
+        original = IssueViewSet.perform_create
+        attempts = []
+
+        def perform_create(view, serializer):
+            attempts.append(serializer.validated_data['title'])
+            original(view, serializer)
+            if len(attempts) == 1:
+                raise OperationalError('database is locked')
+
+        with mock.patch.object(IssueViewSet, 'perform_create', autospec=True, side_effect=perform_create):
+            response = client.post('/api/issues/', {'title': 'Once', 'project': project.pk}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(attempts, ['Once', 'Once'])
+        self.assertEqual(list(Issue.objects.values_list('title', flat=True)), ['Once'])
+
+    def test_inside_a_transaction_the_function_joins_it(self, sleep):
+        write, calls = self.flaky(failures=1)
+        with self.assertRaises(OperationalError), transaction.atomic():
+            run_write_transaction(write)
+        self.assertEqual(len(calls), 1)
+
+
+@mock.patch('core.routers.replica_configured', return_value=True)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(pk=41, username='writer')
+        self.reads = []
+
+    def record_read(self, request):
+        self.reads.append(PrimaryReplicaRouter().db_for_read(Issue))
+        return HttpResponse()
+
+    def request(self, method, user=None):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'} if user else {}
+        request = getattr(RequestFactory(), method)('/api/issues/', **headers)
+        ReplicaRoutingMiddleware(self.record_read)(request)
+        return self.reads[-1]
+
+    def test_reads_go_to_the_replica_until_the_user_writes(self, configured):
+        self.assertEqual(self.request('get', self.user), 'replica')
+        self.assertEqual(self.request('post', self.user), 'default')
+        # Pinned after the write; other users and anonymous reads are not
+        self.assertEqual(self.request('get', self.user), 'default')
+        self.assertEqual(self.request('get', User(pk=42, username='reader')), 'replica')
+        self.assertEqual(self.request('get'), 'replica')
+
+        cache.clear()  # the pin expired
+        self.assertEqual(self.request('get', self.user), 'replica')
+
+    def test_writes_and_code_outside_requests_use_the_primary(self, configured):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Issue), 'default')
+        self.assertEqual(router.db_for_write(Issue), 'default')
+
+        def read_in_block(request):
+            with use_primary():
+                self.reads.append(router.db_for_read(Issue))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(read_in_block)(RequestFactory().get('/api/issues/'))
+        self.assertEqual(self.reads, ['default'])
+
+    def test_async_requests_pin_too(self, configured):
+        async def record_read(request):
+            return self.record_read(request)
+
+        middleware = ReplicaRoutingMiddleware(record_read)
+        token = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        asyncio.run(middleware(RequestFactory().patch('/api/issues/1/', **token)))
+        asyncio.run(middleware(RequestFactory().get('/api/issues/', **token)))
+        self.assertEqual(self.reads, ['default', 'default'])
+
+
+class RowCountTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rooms = [ChatRoom.objects.create(name=name, room_type='group') for name in 'AB']
+        for room in self.rooms:
+            room.members.add(self.owner)
+        self.messages = Message.objects.bulk_create([
+            Message(room=room, sender=self.owner, content=f'{room.name}{i}')
+            for room, count in zip(self.rooms, [3, 2]) for i in range(count)
+        ])
+
+    def counts(self):
+        a, b = self.rooms
+        return estimated_rows(Message), estimated_rows(Message, [a.pk]), estimated_rows(Message, [b.pk])
+
+    def test_triggers_follow_inserts_moves_and_deletes(self):
+        self.assertEqual(self.counts(), (5, 3, 2))
+        Message.objects.filter(pk=self.messages[0].pk).update(room=self.rooms[1])
+        self.assertEqual(self.counts(), (5, 2, 3))
+        Message.objects.filter(pk=self.messages[0].pk).update(content='Edited')
+        self.assertEqual(self.counts(), (5, 2, 3))
+        # Cascaded deletes are counted too
+        self.rooms[1].delete()
+        self.assertEqual(self.counts(), (2, 2, 0))
+        self.assertEqual(EstimatedCountPaginator(Message.objects.all(), 10).count, 2)
+        self.assertEqual(EstimatedCountPaginator(Message.objects.filter(content='A1'), 10).count, 1)
+
+    @mock.patch.object(CountFreePagination, 'page_size', 2)
+    def test_pages_link_to_each_other_without_counting(self):
+        client = self.client_for(self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            first = client.get('/api/messages/').json()
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql'].upper()])
+        self.assertEqual(first['estimated_count'], 5)
+        self.assertIsNone(first['previous'])
+        self.assertEqual(first['next'], 'http://testserver/api/messages/?page=2')
+
+        second = client.get(first['next']).json()
+        self.assertEqual(second['previous'], 'http://testserver/api/messages/')
+        last = client.get(second['next']).json()
+        self.assertEqual((len(last['results']), last['next']), (1, None))
+        self.assertEqual(last['previous'], 'http://testserver/api/messages/?page=2')
+
+        contents = [row['content'] for page in (first, second, last) for row in page['results']]
+        self.assertEqual(contents, ['A0', 'A1', 'A2', 'B0', 'B1'])
+        self.assertEqual(client.get('/api/messages/?page=4').status_code, 404)
+        self.assertEqual(client.get('/api/messages/?page=0').status_code, 404)
+        # Not an estimate of a filtered list
+        self.assertIsNone(client.get('/api/messages/?search=A').json()['estimated_count'])
+
+
+class BatchTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = Issue.objects.create(title='Shared', project=cls.project, reporter=cls.owner)
+
+    def batch(self, user, items):
+        return self.client_for(user).post('/api/batch/', items, format='json')
+
+    def test_sub_requests_run_as_the_batch_user(self):
+        url = f'/api/issues/{self.issue.pk}/'
+        response = self.batch(self.member, [
+            {'method': 'PATCH', 'url': url, 'body': {'status': 'closed'}},
+            {'url': url},
+        ])
+        self.assertEqual(response.status_code, 200)
+        patched, read = response.json()['responses']
+        self.assertEqual((patched['status'], read['status']), (200, 200))
+        self.assertEqual(read['body']['status'], 'closed')
+
+        response = self.batch(self.outsider, [
+            {'url': url},
+            {'method': 'PATCH', 'url': url, 'body': {'status': 'open'}},
+        ])
+        self.assertEqual([item['status'] for item in response.json()['responses']], [404, 404])
+        self.assertEqual(Issue.objects.get(pk=self.issue.pk).status, 'closed')
+        self.assertEqual(APIClient().post('/api/batch/', [{'url': url}], format='json').status_code, 401)
+
+    def test_a_failing_item_only_affects_its_own_entry(self):
+        response = self.batch(self.owner, [
+            {'url': '/api/nowhere/'},
+            {'method': 'PATCH', 'url': f'/api/issues/{self.issue.pk}/', 'body': {'status': 'bogus'}},
+            {'url': f'/api/projects/{self.project.pk}/export/?resource=issues'},
+            {'method': 'DELETE', 'url': f'/api/issues/{self.issue.pk}/'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual([item['status'] for item in responses], [404, 400, 400, 204])
+        self.assertIn('status', responses[1]['body'])
+        self.assertIsNone(responses[3]['body'])
+        self.assertFalse(Issue.objects.filter(pk=self.issue.pk).exists())
+
+    def test_size_and_url_limits(self):
+        too_many = [{'method': 'DELETE', 'url': '/api/issues/0/'}] * (BATCH_MAX_REQUESTS + 1)
+        for items in ([], too_many, {'url': '/api/issues/'}):
+            self.assertEqual(self.batch(self.owner, items).status_code, 400)
+        for item in ({'url': '/api/batch/'}, {'url': '/api/async/issues/'}, {'url': '/admin/'},
+                     {'method': 'OPTIONS', 'url': '/api/issues/'}):
+            response = self.batch(self.owner, [item])
+            self.assertEqual(response.status_code, 400, item)
+        self.assertTrue(Issue.objects.exists())
+
+
+class ConcurrentBatchTests(TransactionTestCase):
+    """Runs of GETs are served by worker threads, which need committed rows."""
+
+    def test_consecutive_reads_run_on_the_pool(self):
+        user = User.objects.create_user('reader')
+        projects = [Project.objects.create(name=f'Project {i}', owner=user) for i in range(4)]
+        client = APIClient()
+        client.force_authenticate(user)
+        items = [{'url': f'/api/projects/{project.pk}/'} for project in projects]
+        response = client.post('/api/batch/', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(item['status'], item['body']['name']) for item in response.json()['responses']],
+            [(200, project.name) for project in projects],
+        )
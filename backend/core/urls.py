@@ -1,7 +1,8 @@
 # backend/core/urls.py
 # -----------------------------------------------------------------------------
 # Core URL Configuration
-# - Registers API routes for projects, issues, comments, notifications, and users
+# - Registers API routes for projects, issues, comments, notifications, users,
+#   chat and tournaments
 # - Includes JWT authentication endpoints from users/api.py
 # -----------------------------------------------------------------------------
 from django.contrib import admin
@@ -11,9 +12,22 @@ from rest_framework.routers import DefaultRouter
 # ✅ ViewSets
 from projects.views import ProjectViewSet
 from issues.views import IssueViewSet, CommentViewSet
-from notifications.views import NotificationViewSet
+from notifications.views import NotificationViewSet, NotificationMuteViewSet
 from users.views import UserViewSet   # <-- NEW
 from chat.views import ChatRoomViewSet, MessageViewSet  # <-- NEW
+from tournaments.views import (
+    TournamentViewSet,
+    TeamViewSet,
+    PoolViewSet,
+    MatchViewSet,
+    MatchResultViewSet,
+)
+from tournaments.live import tournament_live
+from core.batch import BatchView
+from projects.async_views import project_list, project_detail
+from issues.async_views import issue_list
+from chat.async_views import message_list
+from notifications.async_views import notification_list
 
 # ---------- API Router ----------
 router = DefaultRouter()
@@ -21,9 +35,15 @@ router.register(r'projects', ProjectViewSet, basename='project')
 router.register(r'issues', IssueViewSet, basename='issue')
 router.register(r'comments', CommentViewSet, basename='comment')
 router.register(r'notifications', NotificationViewSet, basename='notification')
+router.register(r'notification-mutes', NotificationMuteViewSet, basename='notificationmute')
 router.register(r'users', UserViewSet, basename='user')   # <-- NEW
 router.register(r'chat-rooms', ChatRoomViewSet, basename='chatroom')  # <-- NEW
 router.register(r'messages', MessageViewSet, basename='message')  # <-- NEW
+router.register(r'tournaments', TournamentViewSet, basename='tournament')
+router.register(r'teams', TeamViewSet, basename='team')
+router.register(r'pools', PoolViewSet, basename='pool')
+router.register(r'matches', MatchViewSet, basename='match')
+router.register(r'match-results', MatchResultViewSet, basename='matchresult')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -31,6 +51,19 @@ urlpatterns = [
     # ✅ Authentication (JWT endpoints live in users/api.py)
     path('api/auth/', include('users.api')),
 
+    # Async read endpoints (core/asyncapi.py, best served by core.asgi)
+    path('api/async/projects/', project_list, name='async-project-list'),
+    path('api/async/projects/<int:pk>/', project_detail, name='async-project-detail'),
+    path('api/async/issues/', issue_list, name='async-issue-list'),
+    path('api/async/messages/', message_list, name='async-message-list'),
+    path('api/async/notifications/', notification_list, name='async-notification-list'),
+
+    # Several API calls in one request (core/batch.py)
+    path('api/batch/', BatchView.as_view(), name='api-batch'),
+
+    # Live tournament feed (Server-Sent Events, needs the ASGI server)
+    path('api/tournaments/<int:pk>/live/', tournament_live, name='tournament-live'),
+
     # API routes
     path('api/', include(router.urls)),
 ]
@@ -0,0 +1,170 @@
+# backend/issues/activity.py
+"""
+Activity log for projects and issues.
+
+Write paths describe what they changed with the values they already hold
+in memory: the instance before serializer.save() and the validated data,
+the assignee sets they load for notifications anyway, the membership pairs
+of projects/signals.py. No row is re-read just to compute a diff.
+
+Events are not written one by one: inside recording() (wrapped around each
+write request, see ActivityMixin) they are collected and inserted with a
+single bulk_create when the block ends, in the request's transaction.
+Outside recording() record() inserts at once.
+
+Timelines (GET /api/issues/<id>/timeline/, /api/projects/<id>/timeline/)
+are read newest first with an id keyset (?before=<event id>), an index
+range scan on (issue, id) / (project, id) however old the page is.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework import exceptions, serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from core.params import parse_positive_int
+from .models import ActivityEvent
+
+ISSUE_FIELDS = ('title', 'status', 'priority')
+PROJECT_FIELDS = ('name', 'start_date', 'end_date')
+MAX_TIMELINE_LIMIT = 100
+
+TIMELINE_FIELDS = (
+    'id', 'project_id', 'issue_id', 'actor_id', 'actor__username',
+    'verb', 'field', 'old_value', 'new_value', 'created_at',
+)
+
+_pending = ContextVar('activity_pending', default=None)
+
+_datetime_field = serializers.DateTimeField()
+
+
+# -----------------------------------------------------------------------------
+# Writing
+# -----------------------------------------------------------------------------
+def record(events, first=False):
+    """
+    Queue ActivityEvents for the current recording() block, or insert them.
+    `first` puts them before the events already queued (e.g. 'created',
+    known only after save() has recorded the initial members).
+    """
+    events = list(events)
+    pending = _pending.get()
+    if pending is not None:
+        index = 0 if first else len(pending)
+        pending[index:index] = events
+    elif events:
+        ActivityEvent.objects.bulk_create(events)
+
+
+@contextmanager
+def recording():
+    """Collect the events recorded in the block and insert them in one go."""
+    if _pending.get() is not None:
+        # Nested: the outer block writes
+        yield
+        return
+    pending = []
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    if pending:
+        ActivityEvent.objects.bulk_create(pending)
+
+
+class ActivityMixin:
+    """
+    ViewSet mixin: each create / update / destroy request writes its events
+    in one insert. Goes after LockRetryMixin, so a replayed request starts
+    with an empty batch.
+    """
+
+    def create(self, request, *args, **kwargs):
+        with recording():
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with recording():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with recording():
+            return super().destroy(request, *args, **kwargs)
+
+
+def snapshot(instance, fields):
+    """The tracked field values of an instance, before it is saved."""
+    return {name: getattr(instance, name) for name in fields}
+
+
+def event(verb, actor, project_id, issue_id=None, **values):
+    """An unsaved ActivityEvent; `actor` may be a user, an id or None."""
+    return ActivityEvent(
+        project_id=project_id, issue_id=issue_id, actor_id=getattr(actor, 'pk', actor), verb=verb, **values,
+    )
+
+
+def field_changes(before, after, actor, project_id, issue_id=None):
+    """One 'changed' event per field whose value differs between two snapshots."""
+    return [
+        event('changed', actor, project_id, issue_id, field=name, old_value=before[name], new_value=after[name])
+        for name in before
+        if before[name] != after[name]
+    ]
+
+
+def assignee_change(old_ids, new_ids, actor, project_id, issue_id):
+    """A 'changed' assignees event, or [] if the set did not change."""
+    if set(old_ids) == set(new_ids):
+        return []
+    return [event('changed', actor, project_id, issue_id, field='assignees',
+                  old_value=sorted(old_ids), new_value=sorted(new_ids))]
+
+
+def membership_changes(verb, pairs, actor=None):
+    """'member_added' / 'member_removed' events for (project_id, user_id) pairs."""
+    return [event(verb, actor, project_id, new_value=user_id) for project_id, user_id in pairs]
+
+
+# -----------------------------------------------------------------------------
+# Reading
+# -----------------------------------------------------------------------------
+def serialize_event(row):
+    actor = {'id': row['actor_id'], 'username': row['actor__username']} if row['actor_id'] else None
+    return {
+        'id': row['id'],
+        'project': row['project_id'],
+        'issue': row['issue_id'],
+        'actor': actor,
+        'verb': row['verb'],
+        'field': row['field'],
+        'old_value': row['old_value'],
+        'new_value': row['new_value'],
+        'created_at': _datetime_field.to_representation(row['created_at']),
+    }
+
+
+def timeline(request, **target):
+    """
+    One page of the events of a target (project_id= or issue_id=), newest
+    first: {"next", "results"} for ?before=<event id>&limit=.
+    """
+    events = ActivityEvent.objects.filter(**target).order_by('-id')
+    before = request.query_params.get('before')
+    if before is not None:
+        before = parse_positive_int(before)
+        if before is None:
+            raise exceptions.NotFound('Invalid before id.')
+        events = events.filter(id__lt=before)
+    limit = parse_positive_int(request.query_params.get('limit')) or api_settings.PAGE_SIZE
+    limit = min(limit, MAX_TIMELINE_LIMIT)
+
+    rows = list(events.values(*TIMELINE_FIELDS)[:limit + 1])
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_url = replace_query_param(request.build_absolute_uri(), 'before', rows[-1]['id'])
+    return {'next': next_url, 'results': [serialize_event(row) for row in rows]}
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from core.pagination import EstimatedCountPaginator
 from .models import Issue, Comment
 
 # Register your models here.
@@ -7,6 +8,8 @@ from .models import Issue, Comment
 class IssueAdmin(admin.ModelAdmin):
     list_display = ('title', 'project', 'reporter', 'status', 'priority', 'created_at')
     list_filter = ('status','priority','project')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class IssuesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'issues'
+
+    def ready(self):
+        # Register Issue deletion -> dependency closure maintenance
+        from . import signals  # noqa: F401
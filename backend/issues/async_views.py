@@ -0,0 +1,72 @@
+# backend/issues/async_views.py
+"""
+Async issue list (served by core.asgi, see core/asyncapi.py).
+
+GET /api/async/issues/ returns the same payload as GET /api/issues/ (the
+issues of the user's projects) and understands the same query parameters:
+status, priority and project filters, ?search= over title/description and
+?ordering= on created_at or priority.
+"""
+import operator
+from functools import reduce
+
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+
+from core.asyncapi import async_api_view, json_response, paginate
+from core.fastpath import fast_path_for
+from projects.models import Project
+from projects.visibility import ascope_to_projects
+from .models import Issue
+from .serializers import IssueSerializer
+
+# django-filter's ChoiceFilter / ModelChoiceFilter messages
+INVALID_CHOICE = "Select a valid choice. {value} is not one of the available choices."
+INVALID_MODEL_CHOICE = "Select a valid choice. That choice is not one of the available choices."
+
+SEARCH_FIELDS = ('title', 'description')
+ORDERING_FIELDS = ('created_at', 'priority')
+
+
+async def filter_issues(queryset, params):
+    """
+    The IssueViewSet filter / search / ordering backends, as plain ORM calls.
+    Like the project filter there, an unknown project id is a 400.
+    """
+    errors = {}
+    for field, choices in (('status', Issue.STATUS_CHOICES), ('priority', Issue.PRIORITY_CHOICES)):
+        value = params.get(field)
+        if value:
+            if value in dict(choices):
+                queryset = queryset.filter(**{field: value})
+            else:
+                errors[field] = [INVALID_CHOICE.format(value=value)]
+    project = params.get('project')
+    if project:
+        if project.isdigit() and await Project.objects.filter(pk=int(project)).aexists():
+            queryset = queryset.filter(project_id=int(project))
+        else:
+            errors['project'] = [INVALID_MODEL_CHOICE]
+    if errors:
+        raise exceptions.ValidationError(errors)
+
+    terms = params.get(api_settings.SEARCH_PARAM, '').replace(',', ' ').split()
+    for term in terms:
+        queryset = queryset.filter(reduce(operator.or_, (
+            Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS
+        )))
+
+    ordering = [
+        term.strip() for term in params.get(api_settings.ORDERING_PARAM, '').split(',')
+        if term.strip().lstrip('-') in ORDERING_FIELDS
+    ]
+    if ordering:
+        queryset = queryset.order_by(*ordering)
+    return queryset
+
+
+@async_api_view()
+async def issue_list(request):
+    queryset = await filter_issues(await ascope_to_projects(Issue.objects.all(), request.user), request.GET)
+    return json_response(await paginate(request, queryset, fast_path_for(IssueSerializer)))
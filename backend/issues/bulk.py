@@ -0,0 +1,242 @@
+# backend/issues/bulk.py
+"""
+Set-based create / patch / delete of many issues in one transaction.
+
+Used by POST /api/issues/bulk/. Every project, user and issue referenced by
+the payload is resolved with a single IN query per model (projects and
+issues only among the actor's visible projects, see projects/visibility.py;
+others are reported as not existing), writes go through
+bulk_create / bulk_update, and all resulting notifications and activity
+events are inserted in one batch each.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from projects.forecast import invalidate_forecast
+from projects.models import Project
+from projects.visibility import scope_to_projects
+from users.models import User
+from . import activity
+from .models import Issue
+
+DOES_NOT_EXIST = 'Invalid pk "{pk}" - object does not exist.'
+
+
+def _missing_pk_errors(items, field, known_ids):
+    """
+    Build DRF-style {index: {field: [message]}} errors for items that
+    reference pks not present in known_ids. `field` may hold an int or a list.
+    """
+    errors = {}
+    for index, item in enumerate(items):
+        value = item.get(field)
+        if value is None:
+            continue
+        values = value if isinstance(value, list) else [value]
+        missing = [pk for pk in values if pk not in known_ids]
+        if missing:
+            errors[index] = {field: [DOES_NOT_EXIST.format(pk=pk) for pk in missing]}
+    return errors
+
+
+def _merge_errors(*error_dicts):
+    merged = {}
+    for errors in error_dicts:
+        for index, item_errors in errors.items():
+            merged.setdefault(index, {}).update(item_errors)
+    return merged
+
+
+def apply_bulk_changes(data, actor):
+    """
+    Apply validated BulkIssueSerializer data on behalf of `actor`.
+    Raises ValidationError (nothing written) if any referenced pk is unknown.
+    Returns {'created': [ids], 'updated': [ids], 'deleted': count}.
+    """
+    from notifications.models import Notification, ProjectEvent
+
+    creates, updates, deletes = data['create'], data['update'], data['delete']
+
+    # --- Resolve every referenced pk: one IN query per model ----------------
+    project_ids = {item['project'] for item in creates}
+    user_ids = {
+        pk for item in creates + updates for pk in item.get('assignees') or []
+    }
+    issue_ids = {item['id'] for item in updates} | set(deletes)
+
+    projects = {
+        pk: (name, owner_id)
+        for pk, name, owner_id in (
+            scope_to_projects(Project.objects.active().filter(pk__in=project_ids), actor, column='pk')
+            .values_list('pk', 'name', 'owner_id')
+        )
+    }
+    users = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+    issues = {
+        issue.pk: issue
+        for issue in (
+            scope_to_projects(Issue.objects.filter(pk__in=issue_ids), actor)
+            .only('id', 'title', 'status', 'priority', 'project_id', 'reporter_id', 'updated_at')
+        )
+    }
+
+    errors = {}
+    create_errors = _merge_errors(
+        _missing_pk_errors(creates, 'project', projects),
+        _missing_pk_errors(creates, 'assignees', users),
+    )
+    update_errors = _merge_errors(
+        _missing_pk_errors(updates, 'id', issues),
+        _missing_pk_errors(updates, 'assignees', users),
+    )
+    delete_errors = [DOES_NOT_EXIST.format(pk=pk) for pk in deletes if pk not in issues]
+    if create_errors:
+        errors['create'] = create_errors
+    if update_errors:
+        errors['update'] = update_errors
+    if delete_errors:
+        errors['delete'] = delete_errors
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    Assignment = Issue.assignees.through
+    notifications = []
+    events = []
+
+    with transaction.atomic():
+        # --- Create ---------------------------------------------------------
+        new_issues = Issue.objects.bulk_create([
+            Issue(
+                title=item['title'],
+                description=item['description'],
+                project_id=item['project'],
+                reporter=actor,
+                status=item['status'],
+                priority=item['priority'],
+            )
+            for item in creates
+        ])
+        assignments = [
+            Assignment(issue_id=issue.pk, user_id=user_id)
+            for issue, item in zip(new_issues, creates)
+            for user_id in set(item['assignees'])
+        ]
+
+        # --- Patch ----------------------------------------------------------
+        now = timezone.now()
+        changed_status = []
+        reassigned = []
+        for item in updates:
+            issue = issues[item['id']]
+            before = activity.snapshot(issue, activity.ISSUE_FIELDS)
+            if 'status' in item and item['status'] != issue.status:
+                issue.status = item['status']
+                changed_status.append(issue)
+            if 'priority' in item:
+                issue.priority = item['priority']
+            if 'assignees' in item:
+                reassigned.append(issue.pk)
+                assignments.extend(
+                    Assignment(issue_id=issue.pk, user_id=user_id)
+                    for user_id in set(item['assignees'])
+                )
+            # bulk_update() skips auto_now, so bump it explicitly
+            issue.updated_at = now
+            events += activity.field_changes(before, activity.snapshot(issue, activity.ISSUE_FIELDS),
+                                             actor, issue.project_id, issue.pk)
+
+        updated = [issues[item['id']] for item in updates]
+        Issue.objects.bulk_update(updated, ['status', 'priority', 'updated_at'])
+        previous_assignments = set(
+            Assignment.objects.filter(issue_id__in=reassigned).values_list('issue_id', 'user_id')
+        )
+        Assignment.objects.filter(issue_id__in=reassigned).delete()
+        Assignment.objects.bulk_create(assignments)
+
+        # --- Delete ---------------------------------------------------------
+        Issue.objects.filter(pk__in=deletes).delete()
+
+        # --- Activity, as one batch -----------------------------------------
+        events += [
+            activity.event('created', actor, issue.project_id, issue.pk, new_value=issue.title)
+            for issue in new_issues
+        ]
+        previous_assignees = {}
+        for issue_id, user_id in previous_assignments:
+            previous_assignees.setdefault(issue_id, set()).add(user_id)
+        for item in updates:
+            if 'assignees' in item:
+                issue = issues[item['id']]
+                events += activity.assignee_change(previous_assignees.get(issue.pk, set()),
+                                                   set(item['assignees']), actor, issue.project_id, issue.pk)
+        # Events of issues deleted by the same request went with them
+        deleted = set(deletes)
+        events = [event for event in events if event.issue_id not in deleted]
+        events += [
+            activity.event('deleted', actor, issues[pk].project_id, old_value=issues[pk].title)
+            for pk in deleted
+        ]
+        activity.record(events)
+
+        invalidate_forecast(
+            [issue.project_id for issue in new_issues + changed_status]
+            + [issues[pk].project_id for pk in deleted]
+        )
+
+        # --- Notifications, as one batch ------------------------------------
+        # New issues: one broadcast event per issue for the project members
+        # (see notifications/feed.py)
+        ProjectEvent.objects.bulk_create([
+            ProjectEvent(
+                project_id=issue.project_id,
+                actor=actor,
+                type='issue_created',
+                message=f"New issue '{issue.title}' in project '{projects[issue.project_id][0]}'",
+            )
+            for issue in new_issues
+        ])
+
+        # New assignments: the assignees who were not assigned before
+        titles = {issue.pk: issue.title for issue in new_issues + updated}
+        notifications.extend(
+            Notification(
+                recipient_id=assignment.user_id,
+                actor=actor,
+                type='issue_assigned',
+                message=f"You have been assigned to issue '{titles[assignment.issue_id]}'",
+            )
+            for assignment in assignments
+            if assignment.user_id != actor.pk
+            and (assignment.issue_id, assignment.user_id) not in previous_assignments
+        )
+
+        # Status changes: reporter + (current) assignees
+        recipients_by_issue = {
+            issue.pk: {issue.reporter_id} - {None} for issue in changed_status
+        }
+        for issue_id, user_id in (
+            Assignment.objects
+            .filter(issue_id__in=recipients_by_issue)
+            .values_list('issue_id', 'user_id')
+        ):
+            recipients_by_issue[issue_id].add(user_id)
+        for issue in changed_status:
+            notifications.extend(
+                Notification(
+                    recipient_id=user_id,
+                    actor=actor,
+                    type='issue_status_changed',
+                    message=f"Issue '{issue.title}' status changed to {issue.status}",
+                )
+                for user_id in recipients_by_issue[issue.pk]
+                if user_id != actor.pk
+            )
+
+        Notification.objects.bulk_create(notifications)
+
+    return {
+        'created': [issue.pk for issue in new_issues],
+        'updated': [issue.pk for issue in updated],
+        'deleted': len(deletes),
+    }
@@ -0,0 +1,146 @@
+# backend/issues/dependencies.py
+"""
+Issue dependencies ("A blocks B") with a maintained transitive closure.
+
+IssueDependency holds the edges, IssueDependencyPath every (blocker,
+blocked) pair connected by a chain of edges, with the number of distinct
+chains. Reading is then one indexed query whatever the depth:
+
+- transitive blockers of X:   paths WHERE blocked = X  (blocked, blocker index)
+- transitive dependents of X: paths WHERE blocker = X  (unique index)
+- a topological order of a project: its issues by number of transitive
+  blockers (an issue always has more than each of its blockers), then id
+
+Writes update the closure incrementally with set-based statements. With
+anc(A) = the blockers of A plus A itself and desc(B) = the dependents of B
+plus B itself, adding the edge A -> B adds paths(x, A) * paths(B, y) chains
+to every pair of anc(A) x desc(B), and removing it subtracts them (pairs
+left without chains are dropped). Deleting an issue removes, the same way,
+every chain through it. The edge insert itself only succeeds if B does not
+already block A, so a cycle is rejected by that single statement.
+"""
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+from .models import Issue, IssueDependency, IssueDependencyPath
+
+ISSUE_FIELDS = ('id', 'title', 'status', 'priority', 'project_id')
+
+EDGES = IssueDependency._meta.db_table
+PATHS = IssueDependencyPath._meta.db_table
+
+# anc(%(blocker)s) x desc(%(blocked)s) with the number of chains through the pair's edge/node
+_THROUGH = f'''
+    SELECT s.id AS blocker_id, t.id AS blocked_id, s.paths * t.paths AS paths
+    FROM (SELECT blocker_id AS id, paths FROM {PATHS} WHERE blocked_id = %(blocker)s
+          UNION ALL SELECT %(blocker)s, 1) AS s
+    CROSS JOIN (SELECT blocked_id AS id, paths FROM {PATHS} WHERE blocker_id = %(blocked)s
+                UNION ALL SELECT %(blocked)s, 1) AS t
+'''
+
+_INSERT_EDGE = f'''
+    INSERT INTO {EDGES} (blocker_id, blocked_id, created_at)
+    SELECT %(blocker)s, %(blocked)s, %(now)s
+    WHERE NOT EXISTS (SELECT 1 FROM {PATHS} WHERE blocker_id = %(blocked)s AND blocked_id = %(blocker)s)
+'''
+
+_ADD_PATHS = f'''
+    INSERT INTO {PATHS} (blocker_id, blocked_id, paths)
+    SELECT blocker_id, blocked_id, paths FROM ({_THROUGH}) AS through WHERE true
+    ON CONFLICT (blocker_id, blocked_id) DO UPDATE SET paths = {PATHS}.paths + excluded.paths
+'''
+
+_SUBTRACT_PATHS = f'''
+    UPDATE {PATHS} SET paths = {PATHS}.paths - through.paths
+    FROM ({_THROUGH}) AS through
+    WHERE {PATHS}.blocker_id = through.blocker_id AND {PATHS}.blocked_id = through.blocked_id
+'''
+
+_DROP_EMPTY = f'''
+    DELETE FROM {PATHS}
+    WHERE paths = 0 AND (blocker_id IN (SELECT blocker_id FROM {PATHS} WHERE blocked_id = %(blocker)s
+                                        UNION ALL SELECT %(blocker)s))
+'''
+
+
+class DependencyCycle(Exception):
+    """The new dependency would make an issue (transitively) block itself."""
+
+
+def add_dependency(blocker_id, blocked_id):
+    """
+    Record that `blocker_id` blocks `blocked_id`. Returns False if the
+    dependency already exists, raises DependencyCycle if it would close a
+    cycle.
+    """
+    if blocker_id == blocked_id:
+        raise DependencyCycle
+    params = {'blocker': blocker_id, 'blocked': blocked_id, 'now': timezone.now()}
+    with transaction.atomic(), connection.cursor() as cursor:
+        try:
+            with transaction.atomic():
+                cursor.execute(_INSERT_EDGE, params)
+        except IntegrityError:
+            return False
+        if cursor.rowcount == 0:
+            raise DependencyCycle
+        cursor.execute(_ADD_PATHS, params)
+    return True
+
+
+def _subtract(cursor, blocker_id, blocked_id):
+    params = {'blocker': blocker_id, 'blocked': blocked_id}
+    cursor.execute(_SUBTRACT_PATHS, params)
+    cursor.execute(_DROP_EMPTY, params)
+
+
+def remove_dependency(blocker_id, blocked_id):
+    """Remove a dependency and the chains going through it. Returns False if there was none."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        deleted, _ = IssueDependency.objects.filter(blocker_id=blocker_id, blocked_id=blocked_id).delete()
+        if deleted:
+            _subtract(cursor, blocker_id, blocked_id)
+    return bool(deleted)
+
+
+def detach_issue(issue_id):
+    """Remove every chain through an issue that is about to be deleted."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Chains through a node: anc(issue) x desc(issue), like an edge issue -> issue
+        _subtract(cursor, issue_id, issue_id)
+
+
+# -----------------------------------------------------------------------------
+# Reading
+# -----------------------------------------------------------------------------
+def transitive_blockers(issues, issue_id):
+    """Every issue of `issues` that blocks `issue_id`, directly or not."""
+    direct = IssueDependency.objects.filter(blocker=OuterRef('pk'), blocked_id=issue_id)
+    return (
+        issues.filter(dependent_paths__blocked_id=issue_id)
+        .annotate(direct=Exists(direct))
+        .order_by('id')
+        .values(*ISSUE_FIELDS, 'direct')
+    )
+
+
+def transitive_dependents(issues, issue_id):
+    """Every issue of `issues` blocked by `issue_id`, directly or not."""
+    direct = IssueDependency.objects.filter(blocker_id=issue_id, blocked=OuterRef('pk'))
+    return (
+        issues.filter(blocker_paths__blocker_id=issue_id)
+        .annotate(direct=Exists(direct))
+        .order_by('id')
+        .values(*ISSUE_FIELDS, 'direct')
+    )
+
+
+def topological_order(issues, project_id):
+    """The issues of `issues` in a project, every one after all of its blockers."""
+    return (
+        issues.filter(project_id=project_id)
+        .annotate(blocker_count=Count('blocker_paths'))
+        .order_by('blocker_count', 'id')
+        .values(*ISSUE_FIELDS, 'blocker_count')
+    )
@@ -0,0 +1,234 @@
+# backend/issues/importer.py
+"""
+Bulk import of issues (with assignees and comments) into a project.
+
+Used by POST /api/issues/import/ and ``manage.py import_issues``.
+
+- Input is stream-parsed: CSV rows or NDJSON lines (one issue object per
+  line), so a file is never loaded into memory as a whole.
+- Usernames are resolved to ids through one cached lookup: each chunk runs
+  at most one IN query for usernames it has not seen before.
+- Issues, assignee through-rows and comments are written with chunked
+  bulk_create, one transaction per chunk. No per-row notifications are sent.
+- Invalid rows are reported with their row number and skipped; they never
+  abort the rest of the import.
+
+CSV columns: title, description, status, priority, reporter, assignees
+(usernames separated by ';'), created_at, updated_at (defaults to
+created_at, so closed issues are not counted as closed on import day). Comments are only supported in
+NDJSON, as a "comments" list of {"author", "content", "created_at"}.
+"""
+import codecs
+import csv
+import json
+
+from django.db import transaction
+
+from projects.forecast import invalidate_forecast
+from users.models import User
+from .models import Issue, Comment
+from .serializers import ImportIssueSerializer
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+class UsernameCache:
+    """Memoised username -> user id lookup, filled one IN query at a time."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def load(self, usernames):
+        unseen = set(usernames) - self.ids.keys()
+        if not unseen:
+            return
+        found = dict(User.objects.filter(username__in=unseen).values_list('username', 'pk'))
+        for username in unseen:
+            # Cache misses too, so unknown names are not looked up again
+            self.ids[username] = found.get(username)
+
+    def get(self, username):
+        return self.ids.get(username)
+
+
+def parse_rows(stream, file_format):
+    """Yield (row number, raw dict) pairs from a text stream."""
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            row = {key: value for key, value in row.items() if key and value not in (None, '')}
+            if 'assignees' in row:
+                row['assignees'] = [name.strip() for name in row['assignees'].split(';') if name.strip()]
+            yield number, row
+        return
+
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = {'_error': f"Invalid JSON: {exc}"}
+        if not isinstance(row, dict):
+            row = {'_error': "Each line must be a JSON object."}
+        yield number, row
+
+
+def _chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def is_utf8(upload):
+    """Whether an uploaded file decodes as UTF-8, checked chunk by chunk before importing anything."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for chunk in upload.chunks():
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        upload.seek(0)
+    return True
+
+
+class IssueImporter:
+    """
+    Import issues into `project`. Rows without a reporter are attributed to
+    `default_reporter`. Call run() with a text stream; returns a summary dict.
+    """
+
+    def __init__(self, project, default_reporter=None, chunk_size=IMPORT_CHUNK_SIZE):
+        self.project = project
+        self.default_reporter = default_reporter
+        self.chunk_size = chunk_size
+        self.users = UsernameCache()
+        self.created = 0
+        self.comments = 0
+        self.errors = []
+
+    def run(self, stream, file_format):
+        for chunk in _chunked(parse_rows(stream, file_format), self.chunk_size):
+            self.import_chunk(chunk)
+        return {
+            'created': self.created,
+            'comments': self.comments,
+            'errors': self.errors,
+        }
+
+    def validate_chunk(self, chunk):
+        """Return [(row number, validated data)] for the valid rows of a chunk."""
+        valid = []
+        for number, row in chunk:
+            if '_error' in row:
+                self.errors.append({'row': number, 'errors': {'non_field_errors': [row['_error']]}})
+                continue
+            serializer = ImportIssueSerializer(data=row)
+            if not serializer.is_valid():
+                self.errors.append({'row': number, 'errors': serializer.errors})
+                continue
+            valid.append((number, serializer.validated_data))
+
+        self.users.load(
+            name
+            for _, data in valid
+            for name in (
+                [data.get('reporter')]
+                + data['assignees']
+                + [comment['author'] for comment in data['comments']]
+            )
+            if name
+        )
+
+        resolved = []
+        for number, data in valid:
+            errors = {}
+            unknown = [name for name in data['assignees'] if self.users.get(name) is None]
+            if unknown:
+                errors['assignees'] = [f"Unknown user '{name}'." for name in unknown]
+            if data.get('reporter') and self.users.get(data['reporter']) is None:
+                errors['reporter'] = [f"Unknown user '{data['reporter']}'."]
+            unknown = [c['author'] for c in data['comments'] if self.users.get(c['author']) is None]
+            if unknown:
+                errors['comments'] = [f"Unknown user '{name}'." for name in unknown]
+            if errors:
+                self.errors.append({'row': number, 'errors': errors})
+                continue
+            resolved.append((number, data))
+        return resolved
+
+    def import_chunk(self, chunk):
+        rows = self.validate_chunk(chunk)
+        if not rows:
+            return
+
+        default_reporter_id = self.default_reporter.pk if self.default_reporter else None
+        Assignment = Issue.assignees.through
+
+        with transaction.atomic():
+            issues = Issue.objects.bulk_create([
+                Issue(
+                    project=self.project,
+                    title=data['title'],
+                    description=data['description'],
+                    status=data['status'],
+                    priority=data['priority'],
+                    reporter_id=(
+                        self.users.get(data['reporter']) if data.get('reporter')
+                        else default_reporter_id
+                    ),
+                )
+                for _, data in rows
+            ])
+
+            Assignment.objects.bulk_create(
+                [
+                    Assignment(issue_id=issue.pk, user_id=self.users.get(name))
+                    for issue, (_, data) in zip(issues, rows)
+                    for name in set(data['assignees'])
+                ],
+                batch_size=self.chunk_size,
+            )
+
+            comments = []
+            for issue, (_, data) in zip(issues, rows):
+                comments.extend(
+                    Comment(
+                        issue_id=issue.pk,
+                        author_id=self.users.get(comment['author']),
+                        content=comment['content'],
+                    )
+                    for comment in data['comments']
+                )
+            comments = Comment.objects.bulk_create(comments, batch_size=self.chunk_size)
+
+            # auto_now_add / auto_now ignore values passed to bulk_create, so
+            # original timestamps from the source system are restored with
+            # bulk_update (which leaves auto_now alone).
+            dated_issues = []
+            for issue, (_, data) in zip(issues, rows):
+                if 'created_at' in data or 'updated_at' in data:
+                    issue.created_at = data.get('created_at', issue.created_at)
+                    issue.updated_at = data.get('updated_at', issue.created_at)
+                    dated_issues.append(issue)
+            Issue.objects.bulk_update(dated_issues, ['created_at', 'updated_at'], batch_size=self.chunk_size)
+
+            source_comments = [c for _, data in rows for c in data['comments']]
+            dated_comments = []
+            for comment, source in zip(comments, source_comments):
+                if 'created_at' in source:
+                    comment.created_at = source['created_at']
+                    dated_comments.append(comment)
+            Comment.objects.bulk_update(dated_comments, ['created_at'], batch_size=self.chunk_size)
+            invalidate_forecast([self.project.pk])
+
+        self.created += len(issues)
+        self.comments += len(comments)
@@ -0,0 +1,72 @@
+# backend/issues/management/commands/import_issues.py
+"""
+Management command to bulk-import issues (with assignees and comments) into a project.
+Usage:
+    python manage.py import_issues issues.csv --project 3
+    python manage.py import_issues issues.ndjson --project 3 --reporter alice --chunk-size 5000
+"""
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from projects.models import Project
+from users.models import User
+from issues.importer import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, IssueImporter
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import issues from a CSV or NDJSON file into a project'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file to import')
+        parser.add_argument('--project', type=int, required=True, help='Target project id')
+        parser.add_argument(
+            '--format',
+            choices=IMPORT_FORMATS,
+            help='Input format (default: guessed from the file extension)',
+        )
+        parser.add_argument(
+            '--reporter',
+            help='Username used as reporter for rows that do not name one',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help=f'Rows inserted per transaction (default: {IMPORT_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        try:
+            project = Project.objects.active().get(pk=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError(f'Project {options["project"]} does not exist')
+
+        reporter = None
+        if options['reporter']:
+            try:
+                reporter = User.objects.get(username=options['reporter'])
+            except User.DoesNotExist:
+                raise CommandError(f'User "{options["reporter"]}" does not exist')
+
+        self.stdout.write(f'Importing {file_format} issues into "{project.name}"...')
+        importer = IssueImporter(project, default_reporter=reporter, chunk_size=options['chunk_size'])
+        with open(path, newline='', encoding='utf-8') as stream:
+            result = importer.run(stream, file_format)
+
+        for error in result['errors']:
+            self.stdout.write(self.style.ERROR(f'  Row {error["row"]}: {json.dumps(error["errors"])}'))
+
+        # Summary
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('Summary:'))
+        self.stdout.write(self.style.SUCCESS(f'  Issues created: {result["created"]}'))
+        self.stdout.write(self.style.SUCCESS(f'  Comments created: {result["comments"]}'))
+        self.stdout.write(self.style.WARNING(f'  Rows skipped: {len(result["errors"])}'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0003_activity_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blocked', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='blocked_by', to='issues.issue')),
+                ('blocker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocks', to='issues.issue')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('blocked', 'blocker'), name='unique_issue_dependency'), models.CheckConstraint(condition=models.Q(('blocker', models.F('blocked')), _negated=True), name='issue_dependency_not_self')],
+            },
+        ),
+        migrations.CreateModel(
+            name='IssueDependencyPath',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('paths', models.PositiveBigIntegerField(default=1)),
+                ('blocked', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='blocker_paths', to='issues.issue')),
+                ('blocker', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='dependent_paths', to='issues.issue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['blocked', 'blocker'], name='dependency_path_blocked_idx')],
+                'constraints': [models.UniqueConstraint(fields=('blocker', 'blocked'), name='unique_issue_dependency_path')],
+            },
+        ),
+    ]
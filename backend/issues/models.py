@@ -1,7 +1,8 @@
 # Create your models here.
 # backend/issues/models.py
-from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
 from projects.models import Project
 
 class Issue(models.Model):
@@ -38,3 +39,81 @@ class Comment(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='comments', on_delete=models.SET_NULL, null=True)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+class IssueDependency(models.Model):
+    """`blocker` has to be done before `blocked` (see issues/dependencies.py)."""
+    blocker = models.ForeignKey(Issue, related_name='blocks', on_delete=models.CASCADE)
+    blocked = models.ForeignKey(Issue, related_name='blocked_by', on_delete=models.CASCADE, db_index=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['blocked', 'blocker'], name='unique_issue_dependency'),
+            models.CheckConstraint(condition=~models.Q(blocker=models.F('blocked')),
+                                   name='issue_dependency_not_self'),
+        ]
+
+    def __str__(self):
+        return f"{self.blocker_id} blocks {self.blocked_id}"
+
+
+class IssueDependencyPath(models.Model):
+    """
+    Transitive closure of IssueDependency: `blocker` blocks `blocked`
+    through `paths` distinct dependency chains. Maintained by
+    issues/dependencies.py only.
+    """
+    blocker = models.ForeignKey(Issue, related_name='dependent_paths', on_delete=models.CASCADE, db_index=False)
+    blocked = models.ForeignKey(Issue, related_name='blocker_paths', on_delete=models.CASCADE, db_index=False)
+    paths = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['blocker', 'blocked'], name='unique_issue_dependency_path'),
+        ]
+        indexes = [
+            models.Index(fields=['blocked', 'blocker'], name='dependency_path_blocked_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.blocker_id} -> {self.blocked_id} ({self.paths} paths)"
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only activity log of projects and their issues (see
+    issues/activity.py). Events of an issue also carry its project, so a
+    project timeline includes the activity of all its issues.
+    """
+    VERB_CHOICES = [
+        ('created', 'Created'),
+        ('changed', 'Changed'),
+        ('commented', 'Commented'),
+        ('deleted', 'Deleted'),
+        ('member_added', 'Member added'),
+        ('member_removed', 'Member removed'),
+    ]
+
+    # Indexed together with the id below, for the timeline keyset
+    project = models.ForeignKey(Project, related_name='activity', on_delete=models.CASCADE, db_index=False)
+    issue = models.ForeignKey(Issue, related_name='activity', on_delete=models.CASCADE,
+                              null=True, blank=True, db_index=False)
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='activity',
+                              on_delete=models.SET_NULL, null=True, blank=True)
+    verb = models.CharField(max_length=20, choices=VERB_CHOICES)
+    field = models.CharField(max_length=30, blank=True)
+    old_value = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    new_value = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['project', 'id'], name='activity_project_idx'),
+            models.Index(fields=['issue', 'id'], name='activity_issue_idx'),
+        ]
+
+    def __str__(self):
+        target = f"issue {self.issue_id}" if self.issue_id else f"project {self.project_id}"
+        return f"{target}: {self.verb} {self.field}".rstrip()
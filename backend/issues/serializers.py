@@ -25,7 +25,7 @@ class IssueSerializer(serializers.ModelSerializer):
         queryset=User.objects.all(), many=True, required=False
     )
     comments = CommentSerializer(many=True, read_only=True)
-    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())  # ✅ FIXED
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.active())  # ✅ FIXED
 
     class Meta:
         model = Issue
@@ -41,3 +41,68 @@ class IssueSerializer(serializers.ModelSerializer):
         if assignees:
             issue.assignees.set(assignees)
         return issue
+
+
+# -----------------------------------------------------------------------------
+# Bulk endpoint serializers (POST /api/issues/bulk/)
+# Only the shape of each item is validated here; referenced projects, users
+# and issues are resolved together in issues/bulk.py with one IN query each.
+# -----------------------------------------------------------------------------
+class BulkIssueCreateSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    project = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, default='open')
+    priority = serializers.ChoiceField(choices=Issue.PRIORITY_CHOICES, default='medium')
+    assignees = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+
+class BulkIssuePatchSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Issue.PRIORITY_CHOICES, required=False)
+    assignees = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+
+class BulkIssueSerializer(serializers.Serializer):
+    create = serializers.ListField(child=BulkIssueCreateSerializer(), required=False, default=list)
+    update = serializers.ListField(child=BulkIssuePatchSerializer(), required=False, default=list)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    MAX_ITEMS = 1000
+
+    def validate(self, attrs):
+        total = len(attrs['create']) + len(attrs['update']) + len(attrs['delete'])
+        if total == 0:
+            raise serializers.ValidationError("Nothing to do: provide create, update and/or delete.")
+        if total > self.MAX_ITEMS:
+            raise serializers.ValidationError(f"At most {self.MAX_ITEMS} items per request.")
+
+        update_ids = [item['id'] for item in attrs['update']]
+        if len(update_ids) != len(set(update_ids)):
+            raise serializers.ValidationError({'update': "Each issue may only be updated once per request."})
+        if set(update_ids) & set(attrs['delete']):
+            raise serializers.ValidationError({'delete': "Issues cannot be updated and deleted in the same request."})
+        return attrs
+
+
+# -----------------------------------------------------------------------------
+# Import serializers (POST /api/issues/import/, manage.py import_issues)
+# Users are referenced by username and resolved in bulk by issues/importer.py.
+# -----------------------------------------------------------------------------
+class ImportCommentSerializer(serializers.Serializer):
+    author = serializers.CharField()
+    content = serializers.CharField()
+    created_at = serializers.DateTimeField(required=False)
+
+
+class ImportIssueSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, default='open')
+    priority = serializers.ChoiceField(choices=Issue.PRIORITY_CHOICES, default='medium')
+    reporter = serializers.CharField(required=False, allow_blank=True)
+    assignees = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    created_at = serializers.DateTimeField(required=False)
+    updated_at = serializers.DateTimeField(required=False)
+    comments = serializers.ListField(child=ImportCommentSerializer(), required=False, default=list)
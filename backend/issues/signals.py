@@ -0,0 +1,17 @@
+# backend/issues/signals.py
+"""
+Keep the dependency closure (issues/dependencies.py) consistent when
+issues are deleted, whichever way: the API, bulk deletes, project purges
+or the admin. The issue's own edges and closure rows cascade; the chains
+running through it between other issues are removed here.
+"""
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .dependencies import detach_issue
+from .models import Issue
+
+
+@receiver(pre_delete, sender=Issue)
+def detach_deleted_issue(sender, instance, **kwargs):
+    detach_issue(instance.pk)
@@ -1,3 +1,311 @@
-from django.test import TestCase
+import datetime
+import random
+import tempfile
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from notifications.models import Notification
+from projects.models import Project
+from users.models import User
+from .dependencies import DependencyCycle, add_dependency, remove_dependency
+from .models import Issue, IssueDependency, IssueDependencyPath
+
+
+class IssueTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.outsider = User.objects.create_user('outsider', 'outsider@example.com', 'pw')
+        cls.project = Project.objects.create(name='Project', owner=cls.owner)
+        cls.project.members.add(cls.member)
+        cls.other_project = Project.objects.create(name='Other', owner=cls.outsider)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+
+class BulkChangesTests(IssueTestCase):
+    def test_create_update_delete_in_one_request(self):
+        keep = Issue.objects.create(title='Keep', project=self.project, reporter=self.owner)
+        drop = Issue.objects.create(title='Drop', project=self.project, reporter=self.owner)
+        response = self.client_for(self.owner).post('/api/issues/bulk/', {
+            'create': [{'title': 'New', 'project': self.project.pk, 'assignees': [self.member.pk]}],
+            'update': [{'id': keep.pk, 'status': 'closed', 'assignees': [self.member.pk]}],
+            'delete': [drop.pk],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['deleted'], 1)
+        created = Issue.objects.get(pk=response.json()['created'][0])
+        self.assertEqual(list(created.assignees.all()), [self.member])
+        keep.refresh_from_db()
+        self.assertEqual(keep.status, 'closed')
+        self.assertFalse(Issue.objects.filter(pk=drop.pk).exists())
+        # Two new assignments and one status change for the member
+        self.assertEqual(
+            sorted(Notification.objects.filter(recipient=self.member).exclude(type='project_joined')
+                   .values_list('type', flat=True)),
+            ['issue_assigned', 'issue_assigned', 'issue_status_changed'],
+        )
+
+    def test_unknown_references_write_nothing(self):
+        response = self.client_for(self.owner).post('/api/issues/bulk/', {
+            'create': [{'title': 'New', 'project': self.project.pk, 'assignees': [999]}],
+            'delete': [998],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('0', response.json()['create'])
+        self.assertIn('delete', response.json())
+        self.assertFalse(Issue.objects.exists())
+
+    def test_projects_of_others_do_not_exist_for_the_actor(self):
+        foreign = Issue.objects.create(title='Foreign', project=self.other_project, reporter=self.outsider)
+        response = self.client_for(self.member).post('/api/issues/bulk/', {
+            'create': [{'title': 'Sneaky', 'project': self.other_project.pk}],
+            'update': [{'id': foreign.pk, 'status': 'closed'}],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors['create']['0']['project'], [f'Invalid pk "{self.other_project.pk}" - object does not exist.'])
+        self.assertIn('id', errors['update']['0'])
+        self.assertEqual(Issue.objects.filter(project=self.other_project).count(), 1)
+
+
+class AsyncIssueListTests(IssueTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i, status in enumerate(['open', 'closed', 'open']):
+            Issue.objects.create(title=f'Issue {i}', project=cls.project, reporter=cls.owner, status=status)
+        Issue.objects.create(title='Foreign', project=cls.other_project, reporter=cls.outsider)
+
+    def both(self, user, query=''):
+        sync = self.client_for(user).get(f'/api/issues/{query}')
+        response = async_to_sync(AsyncClient().get)(
+            f'/api/async/issues/{query}', headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'},
+        )
+        return (sync.status_code, sync.json()), (response.status_code, response.json())
+
+    def test_same_issues_as_the_sync_list(self):
+        for user, count in [(self.member, 3), (self.outsider, 1)]:
+            (sync_status, sync), (status, body) = self.both(user)
+            self.assertEqual((status, body['count']), (200, count))
+            self.assertEqual(body['results'], sync['results'])
+
+        (_, sync), (_, body) = self.both(self.member, '?status=open&search=issue&ordering=created_at')
+        self.assertEqual([row['title'] for row in body['results']], ['Issue 0', 'Issue 2'])
+        self.assertEqual(body['results'], sync['results'])
+        # Filtering on a project the user cannot see finds nothing in either
+        (_, sync), (_, body) = self.both(self.member, f'?project={self.other_project.pk}')
+        self.assertEqual((body['count'], sync['count']), (0, 0))
+
+    def test_invalid_filters_and_anonymous_requests(self):
+        for query in ['?status=nope&priority=x', '?project=abc', '?project=999999']:
+            (sync_status, sync), (status, body) = self.both(self.member, query)
+            self.assertEqual((status, body), (sync_status, sync))
+            self.assertEqual(status, 400)
+        response = async_to_sync(AsyncClient().get)('/api/async/issues/')
+        self.assertEqual(response.status_code, 401)
+
+
+class ImportTests(IssueTestCase):
+    def upload(self, user, content, project):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        return self.client_for(user).post('/api/issues/import/', {
+            'file': SimpleUploadedFile('issues.csv', content, content_type='text/csv'),
+            'project': project,
+        }, format='multipart')
+
+    def test_imports_valid_rows(self):
+        response = self.upload(self.member, b'title,status\nFirst,open\nSecond,closed\n', self.project.pk)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(Issue.objects.filter(project=self.project).count(), 2)
+
+    def test_invalid_project_ids_are_rejected(self):
+        for project in ('abc', '', 999):
+            response = self.upload(self.member, b'title\nOne\n', project)
+            self.assertEqual(response.status_code, 400, project)
+            self.assertIn('project', response.json())
+
+    def test_cannot_import_into_projects_of_others(self):
+        response = self.upload(self.member, b'title\nOne\n', self.other_project.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Issue.objects.exists())
+
+    def test_source_timestamps_are_kept(self):
+        response = self.upload(self.member, (
+            b'title,status,created_at,updated_at\n'
+            b'Old,closed,2025-01-10T09:00:00Z,\n'
+            b'Fixed,closed,2025-01-10T09:00:00Z,2025-02-01T12:00:00Z\n'
+        ), self.project.pk)
+        self.assertEqual(response.status_code, 201, response.content)
+        dates = dict(Issue.objects.values_list('title', 'updated_at'))
+        # Without updated_at the issue was last touched when it was created
+        self.assertEqual(dates['Old'], datetime.datetime(2025, 1, 10, 9, tzinfo=datetime.timezone.utc))
+        self.assertEqual(dates['Fixed'], datetime.datetime(2025, 2, 1, 12, tzinfo=datetime.timezone.utc))
+
+    def test_command_skips_deleted_projects(self):
+        Project.objects.filter(pk=self.project.pk).update(deleted_at=timezone.now())
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as source:
+            source.write('title\nOne\n')
+            source.flush()
+            with self.assertRaisesMessage(CommandError, 'does not exist'):
+                call_command('import_issues', source.name, project=self.project.pk)
+        self.assertFalse(Issue.objects.exists())
+
+    def test_non_utf8_upload_is_rejected(self):
+        response = self.upload(self.member, 'title\nCafé\n'.encode('latin-1'), self.project.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.json())
+        self.assertFalse(Issue.objects.exists())
+
+
+class ActivityTests(IssueTestCase):
+    def timeline(self, user, url):
+        response = self.client_for(user).get(url)
+        return response.status_code, response.json()
+
+    def test_issue_changes_are_logged_newest_first(self):
+        client = self.client_for(self.owner)
+        issue_id = client.post('/api/issues/', {
+            'title': 'Crash', 'project': self.project.pk, 'assignees': [self.member.pk],
+        }, format='json').json()['id']
+        client.patch(f'/api/issues/{issue_id}/', {'status': 'closed', 'assignees': []}, format='json')
+        comment_id = client.post('/api/comments/', {'issue': issue_id, 'content': 'Fixed'}, format='json').json()['id']
+
+        status, page = self.timeline(self.member, f'/api/issues/{issue_id}/timeline/')
+        self.assertEqual(status, 200)
+        events = [(row['verb'], row['field'], row['old_value'], row['new_value']) for row in page['results']]
+        self.assertEqual(events, [
+            ('commented', '', None, comment_id),
+            ('changed', 'assignees', [self.member.pk], []),
+            ('changed', 'status', 'open', 'closed'),
+            ('created', '', None, 'Crash'),
+        ])
+        self.assertEqual({row['actor']['id'] for row in page['results']}, {self.owner.pk})
+
+    def test_project_timeline_pages_and_is_limited_to_members(self):
+        for i in range(3):
+            self.client_for(self.owner).patch(f'/api/projects/{self.project.pk}/', {'name': f'Name {i}'}, format='json')
+        url = f'/api/projects/{self.project.pk}/timeline/?limit=2'
+
+        status, first = self.timeline(self.member, url)
+        self.assertEqual(status, 200)
+        self.assertEqual([row['new_value'] for row in first['results']], ['Name 2', 'Name 1'])
+        status, second = self.timeline(self.member, first['next'])
+        self.assertEqual([row['new_value'] for row in second['results']], ['Name 0', self.member.pk])
+
+        self.assertEqual(self.timeline(self.outsider, url)[0], 404)
+        self.assertEqual(APIClient().get(url).status_code, 401)
+
+
+def brute_force_chains(edges):
+    """{(blocker, blocked): number of distinct chains} by walking every chain."""
+    successors = {}
+    for blocker, blocked in edges:
+        successors.setdefault(blocker, []).append(blocked)
+    chains = {}
+
+    def walk(start, node):
+        for following in successors.get(node, ()):
+            chains[(start, following)] = chains.get((start, following), 0) + 1
+            walk(start, following)
+
+    for start in list(successors):
+        walk(start, start)
+    return chains
+
+
+class DependencyClosureTests(IssueTestCase):
+    def closure(self):
+        return {
+            (path.blocker_id, path.blocked_id): path.paths
+            for path in IssueDependencyPath.objects.all()
+        }
+
+    def test_closure_matches_brute_force_on_random_dags(self):
+        rng = random.Random(48)
+        issue_ids = [
+            issue.pk for issue in Issue.objects.bulk_create([
+                Issue(title=f'Issue {i}', project=self.project, reporter=self.owner) for i in range(12)
+            ])
+        ]
+        edges = set()
+        for step in range(300):
+            roll = rng.random()
+            if roll < 0.65:
+                blocker, blocked = rng.sample(issue_ids, 2)
+                closes_cycle = (blocked, blocker) in brute_force_chains(edges)
+                if closes_cycle:
+                    with self.assertRaises(DependencyCycle):
+                        add_dependency(blocker, blocked)
+                else:
+                    self.assertEqual(add_dependency(blocker, blocked), (blocker, blocked) not in edges)
+                    edges.add((blocker, blocked))
+            elif roll < 0.95 and edges:
+                edge = rng.choice(sorted(edges))
+                self.assertTrue(remove_dependency(*edge))
+                edges.discard(edge)
+            elif len(issue_ids) > 4:
+                issue_id = issue_ids.pop(rng.randrange(len(issue_ids)))
+                Issue.objects.get(pk=issue_id).delete()
+                edges = {edge for edge in edges if issue_id not in edge}
+                issue_ids.append(Issue.objects.create(title=f'Issue {step}', project=self.project,
+                                                      reporter=self.owner).pk)
+            self.assertEqual(self.closure(), brute_force_chains(edges), f'step {step}')
+        self.assertEqual(set(IssueDependency.objects.values_list('blocker_id', 'blocked_id')), edges)
+
+    def test_topological_order_puts_blockers_first(self):
+        a, b, c, d = Issue.objects.bulk_create([
+            Issue(title=title, project=self.project, reporter=self.owner) for title in 'abcd'
+        ])
+        for blocker, blocked in ((d, c), (c, b), (d, a), (a, b)):
+            add_dependency(blocker.pk, blocked.pk)
+        url = f'/api/projects/{self.project.pk}/topological-order/'
+
+        response = self.client_for(self.member).get(url)
+        self.assertEqual(response.status_code, 200)
+        order = [row['title'] for row in response.json()['results']]
+        self.assertEqual(order[0], 'd')
+        self.assertEqual(order[-1], 'b')
+        self.assertEqual(self.client_for(self.outsider).get(url).status_code, 404)
+        self.assertEqual(APIClient().get(url).status_code, 401)
+
+
+class BlockerApiTests(IssueTestCase):
+    def setUp(self):
+        self.blocked = Issue.objects.create(title='Blocked', project=self.project, reporter=self.owner)
+        self.blocker = Issue.objects.create(title='Blocker', project=self.project, reporter=self.owner)
+        self.url = f'/api/issues/{self.blocked.pk}/blockers/'
+
+    def test_add_list_and_remove_a_blocker(self):
+        client = self.client_for(self.member)
+        self.assertEqual(client.post(self.url, {'issue': self.blocker.pk}, format='json').status_code, 201)
+        self.assertEqual(client.post(self.url, {'issue': self.blocker.pk}, format='json').status_code, 200)
+        self.assertEqual([row['id'] for row in client.get(self.url).json()['results']], [self.blocker.pk])
+
+        reverse = client.post(f'/api/issues/{self.blocker.pk}/blockers/', {'issue': self.blocked.pk}, format='json')
+        self.assertEqual(reverse.status_code, 400)
+        self.assertEqual(client.delete(f'{self.url}{self.blocker.pk}/').status_code, 204)
+        self.assertFalse(IssueDependencyPath.objects.exists())
+
+    def test_invalid_blocker_ids_are_rejected(self):
+        foreign = Issue.objects.create(title='Foreign', project=self.other_project, reporter=self.outsider)
+        client = self.client_for(self.member)
+        for value in ('abc', '', None, -1, 999, foreign.pk, [1]):
+            with self.subTest(value=value):
+                response = client.post(self.url, {'issue': value}, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('issue', response.json())
+        self.assertFalse(IssueDependency.objects.exists())
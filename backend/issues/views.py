@@ -1,15 +1,42 @@
 # Create your views here.
 # backend/issues/views.py
+import io
+
 from django.shortcuts import render
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.db import LockRetryMixin
+from core.fastpath import FastListMixin
+from core.params import parse_positive_int
+from projects.forecast import invalidate_forecast
+from projects.models import Project
+from projects.visibility import scope_to_projects
+from . import activity
+from .activity import ActivityMixin
+from .bulk import apply_bulk_changes
+from .dependencies import (
+    DependencyCycle,
+    add_dependency,
+    remove_dependency,
+    transitive_blockers,
+    transitive_dependents,
+)
+from .importer import IMPORT_FORMATS, IssueImporter, is_utf8
 from .models import Issue, Comment
-from .serializers import IssueSerializer, CommentSerializer
+from .serializers import IssueSerializer, CommentSerializer, BulkIssueSerializer
 from django_filters.rest_framework import DjangoFilterBackend
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(FastListMixin, LockRetryMixin, ActivityMixin, viewsets.ModelViewSet):
     """
     CRUD for issues. Reporter is set automatically on create.
+    Users only see issues of the projects they own or are a member of
+    (see projects/visibility.py).
+    The list is served from values() rows (see core/fastpath.py).
+    Changes are logged to the issue's timeline (see issues/activity.py).
+    Dependencies between issues are kept as a transitive closure
+    (see issues/dependencies.py).
     """
     queryset = Issue.objects.all().select_related('project','reporter').prefetch_related('assignees')
     serializer_class = IssueSerializer
@@ -19,69 +46,193 @@ class IssueViewSet(viewsets.ModelViewSet):
     search_fields = ['title','description']
     ordering_fields = ['created_at','priority']
 
+    def get_queryset(self):
+        return scope_to_projects(super().get_queryset(), self.request.user)
+
     def perform_create(self, serializer):
-        from notifications.models import Notification
+        from notifications.feed import broadcast, notify
         
         issue = serializer.save(reporter=self.request.user)
         
-        # Notify all project members about the new issue
+        # One broadcast event for the project members, personal rows only
+        # for the assignees (see notifications/feed.py)
         project = issue.project
-        recipients = set(project.members.all())
-        recipients.add(project.owner)
-        
-        for member in recipients:
-            if member != self.request.user:
-                Notification.objects.create(
-                    recipient=member,
-                    actor=self.request.user,
-                    type='issue_assigned', # Using existing type, could add 'issue_created'
-                    message=f"New issue '{issue.title}' in project '{project.name}'"
-                )
+        broadcast(project, self.request.user, 'issue_created',
+                  f"New issue '{issue.title}' in project '{project.name}'")
+        notify(issue.assignees.all(), self.request.user, 'issue_assigned',
+               f"You have been assigned to issue '{issue.title}'")
+        activity.record([activity.event('created', self.request.user, issue.project_id, issue.pk,
+                                        new_value=issue.title)])
+        invalidate_forecast([issue.project_id])
 
     def perform_update(self, serializer):
-        from notifications.models import Notification
+        from notifications.feed import notify
         
-        # Get old status to check for changes
-        old_instance = self.get_object()
-        old_status = old_instance.status
+        # Old values are still on the instance until the serializer saves it
+        before = activity.snapshot(serializer.instance, activity.ISSUE_FIELDS)
+        old_project_id = serializer.instance.project_id
+        reassigned = 'assignees' in serializer.validated_data
+        # assignees are prefetched by the queryset: no query for the old set
+        old_assignees = {user.pk for user in serializer.instance.assignees.all()} if reassigned else set()
         
         issue = serializer.save()
+        assignees = set(issue.assignees.values_list('pk', flat=True))
         
         # If status changed, notify reporter and assignees
-        if issue.status != old_status:
-            recipients = set(issue.assignees.all())
-            recipients.add(issue.reporter)
-            
-            for member in recipients:
-                if member != self.request.user:
-                    Notification.objects.create(
-                        recipient=member,
-                        actor=self.request.user,
-                        type='issue_status_changed',
-                        message=f"Issue '{issue.title}' status changed to {issue.status}"
-                    )
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        if issue.status != before['status']:
+            notify(assignees | {issue.reporter_id}, self.request.user, 'issue_status_changed',
+                   f"Issue '{issue.title}' status changed to {issue.status}")
+        if issue.status != before['status'] or issue.project_id != old_project_id:
+            invalidate_forecast([old_project_id, issue.project_id])
+        if reassigned:
+            notify(assignees - old_assignees, self.request.user, 'issue_assigned',
+                   f"You have been assigned to issue '{issue.title}'")
+
+        events = activity.field_changes(before, activity.snapshot(issue, activity.ISSUE_FIELDS),
+                                        self.request.user, issue.project_id, issue.pk)
+        if reassigned:
+            events += activity.assignee_change(old_assignees, assignees, self.request.user,
+                                               issue.project_id, issue.pk)
+        activity.record(events)
+
+    def perform_destroy(self, instance):
+        # The issue's own events go with it; the project timeline keeps a trace
+        activity.record([activity.event('deleted', self.request.user, instance.project_id,
+                                        old_value=instance.title)])
+        invalidate_forecast([instance.project_id])
+        instance.delete()
+
+    @action(detail=True, methods=['get', 'post'])
+    def blockers(self, request, pk=None):
+        """
+        GET  /api/issues/<id>/blockers/ -> every issue blocking this one, directly or not
+        POST /api/issues/<id>/blockers/ {"issue": <blocker id>} -> add a direct blocker
+        """
+        issue = self.get_object()
+        if request.method == 'GET':
+            issues = scope_to_projects(Issue.objects.all(), request.user)
+            return Response({'results': list(transitive_blockers(issues, issue.pk))})
+
+        blocker = parse_positive_int(request.data.get('issue'))
+        if blocker is not None:
+            blocker = (
+                scope_to_projects(Issue.objects.filter(pk=blocker), request.user)
+                .values_list('pk', flat=True)
+                .first()
+            )
+        if blocker is None:
+            return Response({'issue': ['Issue not found.']}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            created = add_dependency(blocker, issue.pk)
+        except DependencyCycle:
+            return Response(
+                {'issue': ['This issue already depends on it: the dependency would create a cycle.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {'blocker': blocker, 'blocked': issue.pk},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=['delete'], url_path=r'blockers/(?P<blocker_id>\d+)')
+    def remove_blocker(self, request, pk=None, blocker_id=None):
+        """DELETE /api/issues/<id>/blockers/<blocker id>/ -> remove a direct blocker"""
+        issue = self.get_object()
+        if not remove_dependency(int(blocker_id), issue.pk):
+            return Response({'detail': 'No such dependency.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['get'])
+    def dependents(self, request, pk=None):
+        """Every issue blocked by this one, directly or not"""
+        issue = self.get_object()
+        issues = scope_to_projects(Issue.objects.all(), request.user)
+        return Response({'results': list(transitive_dependents(issues, issue.pk))})
+
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """Activity of the issue, newest first (?before=<event id>&limit=)"""
+        issue = self.get_object()
+        return Response(activity.timeline(request, issue_id=issue.pk))
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Create, patch (status, priority, assignees) and delete many issues
+        in one transaction.
+        POST /api/issues/bulk/
+        {
+            "create": [{"title": ..., "project": 1, "assignees": [2, 3], ...}],
+            "update": [{"id": 10, "status": "closed", "assignees": [2]}],
+            "delete": [11, 12]
+        }
+        """
+        serializer = BulkIssueSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = apply_bulk_changes(serializer.validated_data, request.user)
+        return Response(result)
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_issues(self, request):
+        """
+        Bulk-import issues from an uploaded CSV or NDJSON file.
+        POST /api/issues/import/ (multipart: file, project, optional format)
+        Invalid rows are skipped and reported; no notifications are sent.
+        Only into the projects the user owns or is a member of.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['No file was submitted.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('format') or (
+            'csv' if upload.name.lower().endswith('.csv') else 'ndjson'
+        )
+        if file_format not in IMPORT_FORMATS:
+            return Response(
+                {'format': [f"Must be one of: {', '.join(IMPORT_FORMATS)}"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        project_id = parse_positive_int(request.data.get('project'))
+        project = None
+        if project_id is not None:
+            project = scope_to_projects(
+                Project.objects.active().filter(pk=project_id), request.user, column='pk',
+            ).first()
+        if project is None:
+            return Response({'project': ['Project not found.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not is_utf8(upload):
+            return Response({'file': ['The file is not valid UTF-8.']}, status=status.HTTP_400_BAD_REQUEST)
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        try:
+            result = IssueImporter(project, default_reporter=request.user).run(stream, file_format)
+        except UnicodeDecodeError:
+            # Already ruled out by is_utf8(), but never let it become a 500
+            return Response({'file': ['The file is not valid UTF-8.']}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+
+
+class CommentViewSet(LockRetryMixin, ActivityMixin, viewsets.ModelViewSet):
+    """
+    CRUD for comments on the issues of the user's projects.
+    """
     queryset = Comment.objects.all().select_related('author','issue')
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return scope_to_projects(super().get_queryset(), self.request.user, column='issue__project_id')
+
     def perform_create(self, serializer):
-        from notifications.models import Notification
+        from notifications.feed import notify
         
         comment = serializer.save(author=self.request.user)
         issue = comment.issue
         
         # Notify reporter and assignees
-        recipients = set(issue.assignees.all())
-        recipients.add(issue.reporter)
-        
-        for member in recipients:
-            if member != self.request.user:
-                Notification.objects.create(
-                    recipient=member,
-                    actor=self.request.user,
-                    type='issue_commented',
-                    message=f"New comment on issue '{issue.title}'"
-                )
+        recipients = set(issue.assignees.values_list('pk', flat=True))
+        recipients.add(issue.reporter_id)
+        notify(recipients, self.request.user, 'issue_commented', f"New comment on issue '{issue.title}'")
+        activity.record([activity.event('commented', self.request.user, issue.project_id, issue.pk,
+                                        new_value=comment.pk)])
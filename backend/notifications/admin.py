@@ -1,3 +1,14 @@
 from django.contrib import admin
+from core.pagination import EstimatedCountPaginator
+from .models import Notification
 
 # Register your models here.
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'actor', 'type', 'is_read', 'created_at')
+    list_filter = ('type', 'is_read')
+    search_fields = ('message', 'recipient__username')
+    raw_id_fields = ('recipient', 'actor')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,41 @@
+# backend/notifications/archive.py
+"""
+Archiving read notifications past the retention policy into
+NotificationArchive blocks, one per recipient and month (see core/archive.py).
+Unread notifications are never archived.
+"""
+import datetime
+
+from django.utils import timezone
+
+from core.archive import ARCHIVE_BLOCK_SIZE, archive_rows, pack, retention_policy
+from .models import Notification, NotificationArchive
+
+ARCHIVED_FIELDS = ('actor_id', 'type', 'message', 'created_at')
+
+
+def expired_notifications(now=None):
+    """Read notifications past the retention policy, or None when it is disabled."""
+    days = retention_policy('notifications_read_days')
+    if days is None:
+        return None
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=days)
+    return Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+
+def _create_block(recipient_id, month, rows):
+    NotificationArchive.objects.create(
+        recipient_id=recipient_id,
+        month=month,
+        notification_count=len(rows),
+        data=pack(rows),
+    )
+
+
+def archive_read_notifications(now=None, block_size=ARCHIVE_BLOCK_SIZE, pause=0):
+    """Yields (recipient id, month, notifications archived) per block."""
+    notifications = expired_notifications(now)
+    if notifications is None:
+        return iter(())
+    return archive_rows(notifications, 'recipient_id', ARCHIVED_FIELDS, _create_block,
+                        block_size=block_size, pause=pause)
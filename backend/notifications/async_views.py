@@ -0,0 +1,14 @@
+# backend/notifications/async_views.py
+"""
+Async notification list (served by core.asgi, see core/asyncapi.py).
+
+GET /api/async/notifications/ returns the same payload as
+GET /api/notifications/: the current user's notification feed.
+"""
+from core.asyncapi import async_api_view, json_response
+from .feed import aread_feed
+
+
+@async_api_view()
+async def notification_list(request):
+    return json_response(await aread_feed(request, request.user))
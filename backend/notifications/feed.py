@@ -0,0 +1,254 @@
+# backend/notifications/feed.py
+"""
+Notification feed: personal rows + project broadcasts, merged on read.
+
+Writing one Notification per project member on every project edit or new
+issue does not scale with big projects. Such events are stored once, as a
+ProjectEvent (broadcast()), and only targeted events (assignment, status
+changes and comments for the people involved, project membership) still
+get a row per recipient (notify()).
+
+A user's feed is one UNION ALL query over
+- their Notification rows
+- the ProjectEvents of their visible projects (projects/visibility.py)
+  not caused by themselves
+minus their NotificationMutes, ordered newest first and paginated with a
+keyset cursor on (created_at, kind, id), so every page is an index range
+scan however deep it is. A broadcast is read when its id is at or below
+the user's BroadcastReadMark, or below the BroadcastJoinMark set when the
+user joined its project, so a new member does not inherit the project's
+whole history as unread.
+"""
+import base64
+import binascii
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+from django.db.models import BooleanField, Case, F, Q, Value, When
+from django.utils.dateparse import parse_datetime
+from rest_framework import exceptions, serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from core.counters import estimated_rows
+from projects.visibility import visible_project_ids
+from .models import BroadcastJoinMark, BroadcastReadMark, Notification, NotificationMute, ProjectEvent
+
+PERSONAL = 'personal'
+BROADCAST = 'broadcast'
+CURSOR_PARAM = 'cursor'
+
+FEED_FIELDS = ('id', 'actor_id', 'actor__username', 'type', 'message', 'created_at')
+
+_datetime_field = serializers.DateTimeField()
+
+
+# -----------------------------------------------------------------------------
+# Writing
+# -----------------------------------------------------------------------------
+def broadcast(project, actor, type, message):
+    """Notify every member of `project` with a single stored event."""
+    return ProjectEvent.objects.create(project=project, actor=actor, type=type, message=message)
+
+
+def notify(recipients, actor, type, message):
+    """One Notification per recipient (users or ids), skipping the actor, in one insert."""
+    recipient_ids = {getattr(recipient, 'pk', recipient) for recipient in recipients}
+    recipient_ids.discard(getattr(actor, 'pk', None))
+    return Notification.objects.bulk_create([
+        Notification(recipient_id=recipient_id, actor=actor, type=type, message=message)
+        for recipient_id in recipient_ids
+    ])
+
+
+def last_event_id():
+    return ProjectEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def mark_broadcasts_read(user, until):
+    """Move the user's watermark forward to `until` (never backwards)."""
+    mark, created = BroadcastReadMark.objects.get_or_create(user=user, defaults={'last_read_id': until})
+    if not created and until > mark.last_read_id:
+        BroadcastReadMark.objects.filter(pk=mark.pk, last_read_id__lt=until).update(last_read_id=until)
+    BroadcastJoinMark.objects.filter(user=user, last_event_id__lte=until).delete()
+
+
+def mark_projects_joined(pairs):
+    """
+    Record that users joined projects ((project_id, user_id) pairs) now:
+    the events posted so far count as read for them, in one upsert.
+    """
+    until = last_event_id()
+    BroadcastJoinMark.objects.bulk_create(
+        [
+            BroadcastJoinMark(project_id=project_id, user_id=user_id, last_event_id=until)
+            for project_id, user_id in set(pairs)
+        ],
+        update_conflicts=True,
+        unique_fields=['user', 'project'],
+        update_fields=['last_event_id'],
+    )
+
+
+# -----------------------------------------------------------------------------
+# Reading
+# -----------------------------------------------------------------------------
+@dataclass
+class FeedContext:
+    """Everything about the user the feed query depends on."""
+    user: object
+    project_ids: frozenset
+    last_read_id: int = 0
+    joined: dict = field(default_factory=dict)
+    muted_types: set = field(default_factory=set)
+    muted_projects: set = field(default_factory=set)
+    muted_pairs: list = field(default_factory=list)
+
+    @classmethod
+    def load(cls, user):
+        context = cls(
+            user=user,
+            project_ids=visible_project_ids(user),
+            last_read_id=(
+                BroadcastReadMark.objects.filter(user=user).values_list('last_read_id', flat=True).first() or 0
+            ),
+        )
+        context.joined = dict(
+            BroadcastJoinMark.objects
+            .filter(user=user, last_event_id__gt=context.last_read_id)
+            .values_list('project_id', 'last_event_id')
+        )
+        for project_id, type in NotificationMute.objects.filter(user=user).values_list('project_id', 'type'):
+            if project_id is None:
+                context.muted_types.add(type)
+            elif not type:
+                context.muted_projects.add(project_id)
+            else:
+                context.muted_pairs.append((project_id, type))
+        return context
+
+    def broadcast_project_ids(self):
+        return self.project_ids - self.muted_projects
+
+    def read_broadcasts(self):
+        """Condition on ProjectEvent matching the broadcasts the user has read."""
+        condition = Q(id__lte=self.last_read_id)
+        for project_id, until in self.joined.items():
+            condition |= Q(project_id=project_id, id__lte=until)
+        return condition
+
+
+aload_context = sync_to_async(FeedContext.load)
+
+
+def encode_cursor(row):
+    raw = f"{row['created_at'].isoformat()}|{row['kind']}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(value):
+    try:
+        created_at, kind, pk = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        if created_at is None or kind not in (PERSONAL, BROADCAST):
+            raise ValueError
+        return created_at, kind, int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise exceptions.NotFound("Invalid cursor")
+
+
+def _after_cursor(kind, cursor):
+    """Rows of one side of the feed that sort after `cursor` (newest first)."""
+    created_at, cursor_kind, pk = cursor
+    if kind < cursor_kind:
+        return Q(created_at__lte=created_at)
+    if kind == cursor_kind:
+        return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+    return Q(created_at__lt=created_at)
+
+
+def feed_queryset(context, cursor=None):
+    """The merged feed as a values() UNION ALL, newest first."""
+    user = context.user
+    personal = Notification.objects.filter(recipient=user).exclude(type__in=context.muted_types)
+    broadcasts = (
+        ProjectEvent.objects
+        .filter(project_id__in=context.broadcast_project_ids())
+        .exclude(actor=user)
+        .exclude(type__in=context.muted_types)
+    )
+    for project_id, type in context.muted_pairs:
+        broadcasts = broadcasts.exclude(project_id=project_id, type=type)
+    if cursor is not None:
+        personal = personal.filter(_after_cursor(PERSONAL, cursor))
+        broadcasts = broadcasts.filter(_after_cursor(BROADCAST, cursor))
+
+    # Same columns in the same order on both sides of the UNION
+    personal = personal.order_by().annotate(
+        kind=Value(PERSONAL), read=F('is_read'),
+    ).values(*FEED_FIELDS, 'kind', 'read')
+    broadcasts = broadcasts.order_by().annotate(
+        kind=Value(BROADCAST),
+        read=Case(When(context.read_broadcasts(), then=Value(True)), default=Value(False),
+                  output_field=BooleanField()),
+    ).values(*FEED_FIELDS, 'kind', 'read')
+    return personal.union(broadcasts, all=True).order_by('-created_at', '-kind', '-id')
+
+
+def feed_estimate(context):
+    personal = estimated_rows(Notification, [context.user.pk])
+    events = estimated_rows(ProjectEvent, context.broadcast_project_ids())
+    if personal is None or events is None:
+        return None
+    return personal + events
+
+
+aestimate = sync_to_async(feed_estimate)
+
+
+def serialize_row(row, user):
+    """A feed row in NotificationSerializer's format, plus its `kind`."""
+    actor = {'id': row['actor_id'], 'username': row['actor__username']} if row['actor_id'] else None
+    return {
+        'id': row['id'],
+        'kind': row['kind'],
+        'recipient': {'id': user.pk, 'username': user.username},
+        'actor': actor,
+        'type': row['type'],
+        'message': row['message'],
+        'is_read': bool(row['read']),
+        'created_at': _datetime_field.to_representation(row['created_at']),
+    }
+
+
+def page_size():
+    return api_settings.PAGE_SIZE
+
+
+def build_page(url, rows, context, estimated_count):
+    """{"estimated_count", "next", "results"} from up to page_size + 1 feed rows."""
+    size = page_size()
+    has_next = len(rows) > size
+    rows = rows[:size]
+    return {
+        'estimated_count': estimated_count,
+        'next': replace_query_param(url, CURSOR_PARAM, encode_cursor(rows[-1])) if has_next else None,
+        'results': [serialize_row(row, context.user) for row in rows],
+    }
+
+
+def read_feed(request, user):
+    """One page of the user's feed for `request` (?cursor=)."""
+    cursor = request.GET.get(CURSOR_PARAM)
+    cursor = decode_cursor(cursor) if cursor else None
+    context = FeedContext.load(user)
+    rows = list(feed_queryset(context, cursor)[:page_size() + 1])
+    return build_page(request.build_absolute_uri(), rows, context, feed_estimate(context))
+
+
+async def aread_feed(request, user):
+    cursor = request.GET.get(CURSOR_PARAM)
+    cursor = decode_cursor(cursor) if cursor else None
+    context = await aload_context(user)
+    rows = [row async for row in feed_queryset(context, cursor)[:page_size() + 1]]
+    return build_page(request.build_absolute_uri(), rows, context, await aestimate(context))
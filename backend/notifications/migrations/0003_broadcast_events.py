@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from core.counters import row_count_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notification_row_counts'),
+        ('projects', '0002_project_end_date_project_funds_allocated_and_more'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastReadMark',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='broadcast_read_mark', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_read_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NotificationMute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(blank=True, choices=[('issue_assigned', 'Issue Assigned'), ('issue_created', 'Issue Created'), ('issue_commented', 'Issue Commented'), ('issue_status_changed', 'Issue Status Changed'), ('project_joined', 'Project Joined'), ('general', 'General')], max_length=50)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('issue_assigned', 'Issue Assigned'), ('issue_created', 'Issue Created'), ('issue_commented', 'Issue Commented'), ('issue_status_changed', 'Issue Status Changed'), ('project_joined', 'Project Joined'), ('general', 'General')], default='general', max_length=50)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('issue_assigned', 'Issue Assigned'), ('issue_created', 'Issue Created'), ('issue_commented', 'Issue Commented'), ('issue_status_changed', 'Issue Status Changed'), ('project_joined', 'Project Joined'), ('general', 'General')], default='general', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'created_at', 'id'], name='notification_feed_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationmute',
+            name='project',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notification_mutes', to='projects.project'),
+        ),
+        migrations.AddField(
+            model_name='notificationmute',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_mutes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='projectevent',
+            name='actor',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='broadcast_events_sent', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='projectevent',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcast_events', to='projects.project'),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationmute',
+            constraint=models.UniqueConstraint(fields=('user', 'project', 'type'), name='unique_notification_mute'),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationmute',
+            constraint=models.CheckConstraint(condition=models.Q(('project__isnull', False), models.Q(('type', ''), _negated=True), _connector='OR'), name='notification_mute_not_empty'),
+        ),
+        migrations.AddIndex(
+            model_name='projectevent',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='projectevent_feed_idx'),
+        ),
+        row_count_triggers('notifications_projectevent', 'project_id'),
+    ]
@@ -6,6 +6,7 @@ from django.conf import settings
 class Notification(models.Model):
     TYPE_CHOICES = [
         ('issue_assigned', 'Issue Assigned'),
+        ('issue_created', 'Issue Created'),
         ('issue_commented', 'Issue Commented'),
         ('issue_status_changed', 'Issue Status Changed'),
         ('project_joined', 'Project Joined'),
@@ -30,6 +31,137 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of one user's feed (notifications/feed.py)
+            models.Index(fields=['recipient', 'created_at', 'id'], name='notification_feed_idx'),
+        ]
 
     def __str__(self):
         return f"To {self.recipient.username}: {self.message[:30]}"
+
+
+class ProjectEvent(models.Model):
+    """
+    A notification for every member of a project (e.g. "project updated",
+    "new issue"), stored once and merged into each member's feed when it is
+    read (see notifications/feed.py).
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        related_name='broadcast_events',
+        on_delete=models.CASCADE
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='broadcast_events_sent',
+        on_delete=models.SET_NULL,
+        null=True, blank=True
+    )
+    type = models.CharField(max_length=50, choices=Notification.TYPE_CHOICES, default='general')
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='projectevent_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"To {self.project}: {self.message[:30]}"
+
+
+class BroadcastReadMark(models.Model):
+    """
+    Read watermark of a user's project events: every event with an id up
+    to `last_read_id` counts as read.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        related_name='broadcast_read_mark',
+        on_delete=models.CASCADE,
+        primary_key=True
+    )
+    last_read_id = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user.username} read up to {self.last_read_id}"
+
+
+class BroadcastJoinMark(models.Model):
+    """
+    Per-project read watermark set when a user joins a project (as a member
+    or new owner): the project's events up to `last_event_id` predate them
+    and count as read. Dropped once BroadcastReadMark moves past it.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='broadcast_join_marks',
+        on_delete=models.CASCADE
+    )
+    project = models.ForeignKey(
+        'projects.Project',
+        related_name='broadcast_join_marks',
+        on_delete=models.CASCADE
+    )
+    last_event_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'project')
+
+    def __str__(self):
+        return f"{self.user.username} joined {self.project} after {self.last_event_id}"
+
+
+class NotificationMute(models.Model):
+    """
+    Hide a user's notifications of one type, all events of one project, or
+    only one type of events of one project. Applied when the feed is read.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='notification_mutes',
+        on_delete=models.CASCADE
+    )
+    project = models.ForeignKey(
+        'projects.Project',
+        related_name='notification_mutes',
+        on_delete=models.CASCADE,
+        null=True, blank=True
+    )
+    type = models.CharField(max_length=50, choices=Notification.TYPE_CHOICES, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'project', 'type'], name='unique_notification_mute'),
+            models.CheckConstraint(
+                condition=models.Q(project__isnull=False) | ~models.Q(type=''),
+                name='notification_mute_not_empty',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} mutes {self.project or 'all projects'} / {self.type or 'all types'}"
+
+
+class NotificationArchive(models.Model):
+    """
+    Expired read notifications moved out of the notification table (see
+    manage.py archive_expired): one zlib-compressed JSON block per recipient
+    and month.
+    """
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='notification_archives',
+        on_delete=models.CASCADE
+    )
+    month = models.DateField(help_text="First day of the month of the archived notifications")
+    notification_count = models.PositiveIntegerField()
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['recipient', 'month']
+
+    def __str__(self):
+        return f"{self.recipient.username} {self.month:%Y-%m} ({self.notification_count} notifications)"
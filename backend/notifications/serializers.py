@@ -1,6 +1,6 @@
 # backend/notifications/serializers.py
 from rest_framework import serializers
-from .models import Notification
+from .models import Notification, NotificationMute
 from users.models import User
 
 
@@ -28,3 +28,20 @@ class NotificationSerializer(serializers.ModelSerializer):
             "created_at",
         )
         read_only_fields = ("id", "recipient", "actor", "created_at")
+
+
+class NotificationMuteSerializer(serializers.ModelSerializer):
+    """A mute preference of the current user (see notifications/feed.py)."""
+
+    class Meta:
+        model = NotificationMute
+        fields = ("id", "project", "type")
+
+    def validate(self, attrs):
+        project, type = attrs.get("project"), attrs.get("type", "")
+        if project is None and not type:
+            raise serializers.ValidationError("Mute a project, a notification type, or both.")
+        user = self.context["request"].user
+        if NotificationMute.objects.filter(user=user, project=project, type=type).exists():
+            raise serializers.ValidationError("This mute already exists.")
+        return attrs
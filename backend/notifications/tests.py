@@ -1,3 +1,116 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.models import Project
+from users.models import User
+from .feed import broadcast, notify
+from .models import BroadcastJoinMark
+
+
+class FeedTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.project = Project.objects.create(name='Project', owner=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def feed(self, url='/api/notifications/'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+class FeedCursorTests(FeedTestCase):
+    def test_cursor_walks_personal_and_broadcast_rows_once(self):
+        self.project.members.add(self.member)
+        for i in range(4):
+            broadcast(self.project, self.owner, 'general', f'Event {i}')
+            notify([self.member], self.owner, 'general', f'Personal {i}')
+        # Own events are left out
+        broadcast(self.project, self.member, 'general', 'Mine')
+
+        seen, url = [], '/api/notifications/'
+        with mock.patch('notifications.feed.page_size', return_value=3):
+            while url:
+                page = self.feed(url)
+                self.assertLessEqual(len(page['results']), 3)
+                seen.extend(page['results'])
+                url = page['next']
+
+        self.assertEqual(len(seen), 9)  # 4 + 4 + project_joined
+        self.assertEqual(len({(row['kind'], row['id']) for row in seen}), 9)
+        keys = [(row['created_at'], row['kind'], row['id']) for row in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+        self.assertNotIn('Mine', [row['message'] for row in seen])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/notifications/?cursor=nope')
+        self.assertEqual(response.status_code, 404)
+
+
+class BroadcastReadMarkTests(FeedTestCase):
+    def broadcast_read_flags(self):
+        return {
+            row['message']: row['is_read'] for row in self.feed()['results'] if row['kind'] == 'broadcast'
+        }
+
+    def test_events_before_joining_are_read(self):
+        broadcast(self.project, self.owner, 'general', 'Before')
+        self.project.members.add(self.member)
+        broadcast(self.project, self.owner, 'general', 'After')
+        self.assertEqual(self.broadcast_read_flags(), {'Before': True, 'After': False})
+
+    def test_new_owner_does_not_inherit_unread_history(self):
+        broadcast(self.project, self.owner, 'general', 'Before')
+        project = Project.objects.get(pk=self.project.pk)
+        project.owner = self.member
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertEqual(self.broadcast_read_flags(), {'Before': True})
+
+    def test_mark_broadcasts_read_moves_the_watermark_and_drops_join_marks(self):
+        self.project.members.add(self.member)
+        first = broadcast(self.project, self.owner, 'general', 'First')
+        broadcast(self.project, self.owner, 'general', 'Second')
+
+        response = self.client.post('/api/notifications/mark_broadcasts_read/', {'until': first.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.broadcast_read_flags(), {'First': True, 'Second': False})
+        self.assertFalse(BroadcastJoinMark.objects.filter(user=self.member).exists())
+
+        # Never backwards
+        self.client.post('/api/notifications/mark_broadcasts_read/', {}, format='json')
+        self.client.post('/api/notifications/mark_broadcasts_read/', {'until': 0}, format='json')
+        self.assertEqual(self.broadcast_read_flags(), {'First': True, 'Second': True})
+        response = self.client.post('/api/notifications/mark_broadcasts_read/', {'until': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncFeedTests(FeedTestCase):
+    def async_feed(self, user):
+        response = async_to_sync(AsyncClient().get)(
+            '/api/async/notifications/', headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_same_feed_as_the_sync_endpoint(self):
+        self.project.members.add(self.member)
+        broadcast(self.project, self.owner, 'general', 'Project news')
+        notify([self.member], self.owner, 'general', 'Personal')
+        notify([self.owner], self.member, 'general', 'Not for the member')
+
+        body = self.async_feed(self.member)
+        self.assertEqual(body, self.feed())
+        self.assertEqual({row['message'] for row in body['results']} - {'Project news', 'Personal'},
+                         {"You have been added to project 'Project'"})
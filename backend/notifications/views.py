@@ -2,14 +2,18 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import Notification
-from .serializers import NotificationSerializer
+from core.db import LockRetryMixin
+from .feed import last_event_id, mark_broadcasts_read, read_feed
+from .models import Notification, NotificationMute
+from .serializers import NotificationSerializer, NotificationMuteSerializer
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(LockRetryMixin, viewsets.ModelViewSet):
     """
     API endpoint for notifications.
-    - Lists only the current user's notifications
+    - Lists the current user's feed: their own notifications merged with
+      the broadcast events of their projects, minus muted ones
+      (see notifications/feed.py), newest first, paginated with ?cursor=
     - Allows marking as read/unread
     - Supports bulk mark-all-read
     """
@@ -20,6 +24,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """Limit queryset to logged-in user's notifications."""
         return Notification.objects.filter(recipient=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        return Response(read_feed(request, request.user))
+
     def perform_create(self, serializer):
         """Ensure recipient is always the logged-in user."""
         serializer.save(recipient=self.request.user)
@@ -47,7 +54,40 @@ class NotificationViewSet(viewsets.ModelViewSet):
     def mark_all_read(self, request):
         """Mark all of the user's notifications as read."""
         updated = self.get_queryset().update(is_read=True)
+        mark_broadcasts_read(request.user, last_event_id())
         return Response(
             {"status": f"{updated} notifications marked as read"},
             status=status.HTTP_200_OK,
         )
+
+    @action(detail=False, methods=["post"])
+    def mark_broadcasts_read(self, request):
+        """
+        Mark the project broadcasts up to an event id as read
+        (default: all of them).
+        POST /api/notifications/mark_broadcasts_read/ {"until": 123}
+        """
+        until = request.data.get("until", None)
+        if until is None:
+            until = last_event_id()
+        elif not isinstance(until, int) or isinstance(until, bool) or until < 0:
+            return Response({"until": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        mark_broadcasts_read(request.user, until)
+        return Response({"status": f"broadcasts up to {until} marked as read"}, status=status.HTTP_200_OK)
+
+
+class NotificationMuteViewSet(viewsets.ModelViewSet):
+    """
+    The current user's mute preferences: a notification type everywhere,
+    every event of a project, or one type of event of a project.
+    Muted notifications are hidden from the feed when it is read.
+    """
+    serializer_class = NotificationMuteSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    http_method_names = ["get", "post", "delete", "head", "options"]
+
+    def get_queryset(self):
+        return NotificationMute.objects.filter(user=self.request.user).select_related("project")
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
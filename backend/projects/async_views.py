@@ -0,0 +1,94 @@
+# backend/projects/async_views.py
+"""
+Async read endpoints for projects (served by core.asgi, see core/asyncapi.py).
+
+- GET /api/async/projects/       -> same payload as GET /api/projects/
+- GET /api/async/projects/<id>/  -> same payload as GET /api/projects/<id>/
+
+ProjectSerializer's method fields (member_count, progress, stats) are
+computed for the whole page with two grouped queries instead of four
+COUNT queries per project.
+"""
+from django.db.models import Count
+from rest_framework import exceptions
+
+from core.asyncapi import async_api_view, json_response, paginate
+from core.fastpath import Loader, fast_path_for
+from issues.models import Issue
+from .models import Project
+from .serializers import ProjectSerializer
+
+
+class MemberCountLoader(Loader):
+    def query(self, pks):
+        return (
+            Project.members.through.objects
+            .filter(project_id__in=pks)
+            .values('project_id')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+
+    def group(self, rows, pks):
+        counts = dict.fromkeys(pks, 0)
+        counts.update((row['project_id'], row['count']) for row in rows)
+        return counts
+
+
+class IssueStatusLoader(Loader):
+    """Issue count per status: {project pk: {status: count}}."""
+
+    def query(self, pks):
+        return (
+            Issue.objects
+            .filter(project_id__in=pks)
+            .values('project_id', 'status')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+
+    def group(self, rows, pks):
+        grouped = {pk: {} for pk in pks}
+        for row in rows:
+            grouped[row['project_id']][row['status']] = row['count']
+        return grouped
+
+
+def _stats(counts):
+    return {
+        'total': sum(counts.values()),
+        'open': counts.get('open', 0),
+        'in_progress': counts.get('in_progress', 0),
+        'closed': counts.get('closed', 0),
+    }
+
+
+def _progress(counts):
+    total = sum(counts.values())
+    return int((counts.get('closed', 0) / total) * 100) if total else 0
+
+
+_issue_status = IssueStatusLoader()
+COMPUTED_FIELDS = {
+    'member_count': (MemberCountLoader(), None),
+    'progress': (_issue_status, _progress),
+    'stats': (_issue_status, _stats),
+}
+
+
+def _fast_path():
+    return fast_path_for(ProjectSerializer, COMPUTED_FIELDS)
+
+
+@async_api_view(public=True)
+async def project_list(request):
+    return json_response(await paginate(request, Project.objects.active().order_by('pk'), _fast_path()))
+
+
+@async_api_view(public=True)
+async def project_detail(request, pk):
+    fast_path = _fast_path()
+    results = await fast_path.abuild_many(fast_path.values(Project.objects.active().filter(pk=pk)))
+    if not results:
+        raise exceptions.NotFound("No Project matches the given query.")
+    return json_response(results[0])
@@ -0,0 +1,171 @@
+# backend/projects/exports.py
+"""
+Streaming export of a project's issues, comments and chat messages.
+
+Rows are read with ``values()`` + ``iterator(chunk_size=...)`` so no model
+instances are built and memory stays flat no matter how many rows a
+project has. Output is produced chunk by chunk as CSV or NDJSON and can
+be gzip-compressed on the fly.
+
+Under ASGI, Django reads a synchronous streaming iterator to the end before
+sending anything, so there the chunks are handed over through astream(),
+which pulls them one at a time on the request's sync thread.
+"""
+import csv
+import datetime
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.negotiation import DefaultContentNegotiation
+
+from .visibility import scope_to_projects, scope_to_rooms
+
+# Rows fetched from the database per round trip (and written per chunk)
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _issue_rows(project, user):
+    from issues.models import Issue
+    return scope_to_projects(Issue.objects.filter(project=project), user)
+
+
+def _comment_rows(project, user):
+    from issues.models import Comment
+    return scope_to_projects(Comment.objects.filter(issue__project=project), user, column='issue__project_id')
+
+
+def _message_rows(project, user):
+    # Chat history is only exported for rooms the requesting user belongs to
+    from chat.models import Message
+    return scope_to_rooms(Message.objects.filter(room__project=project), user)
+
+
+EXPORT_RESOURCES = {
+    'issues': (
+        _issue_rows,
+        ('id', 'title', 'description', 'status', 'priority',
+         'reporter_id', 'reporter__username', 'created_at', 'updated_at'),
+    ),
+    'comments': (
+        _comment_rows,
+        ('id', 'issue_id', 'issue__title', 'author_id', 'author__username',
+         'content', 'created_at'),
+    ),
+    'messages': (
+        _message_rows,
+        ('id', 'room_id', 'room__name', 'sender_id', 'sender__username',
+         'content', 'created_at', 'is_read'),
+    ),
+}
+
+
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """
+    The export endpoint uses ``?format=`` to pick the export format, so it
+    must not be treated as DRF's renderer override. Errors render as JSON.
+    """
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderer = renderers[0]
+        return renderer, renderer.media_type
+
+
+def export_rows(project, resource, user):
+    """Return a values() queryset streaming the requested resource in pk order."""
+    build_queryset, fields = EXPORT_RESOURCES[resource]
+    return (
+        build_queryset(project, user)
+        .order_by('pk')
+        .values(*fields)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def _chunked(rows, size=EXPORT_CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _LineBuffer:
+    """File-like object that just collects what csv.writer writes."""
+    def __init__(self):
+        self.lines = []
+
+    def write(self, value):
+        self.lines.append(value)
+
+    def pop(self):
+        data, self.lines = ''.join(self.lines), []
+        return data
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(rows, fields):
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.pop()
+    for chunk in _chunked(rows):
+        for row in chunk:
+            writer.writerow([_csv_value(row[field]) for field in fields])
+        yield buffer.pop()
+
+
+def stream_ndjson(rows, fields):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for chunk in _chunked(rows):
+        yield ''.join(encoder.encode(row) + '\n' for row in chunk)
+
+
+def gzip_stream(chunks):
+    """Compress a stream of text chunks into a gzip byte stream on the fly."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+_DONE = object()
+
+
+async def astream(chunks):
+    """
+    Async iterator over a sync chunk iterator for ASGI responses. next() runs
+    thread-sensitive, so every chunk is read on the same thread and database
+    connection as the rest of the request.
+    """
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    chunks = iter(chunks)
+    while (chunk := await next_chunk(chunks, _DONE)) is not _DONE:
+        yield chunk
+
+
+def build_export_stream(project, resource, export_format, user, compress=False):
+    """Return the (possibly gzipped) chunk iterator for a project export."""
+    _, fields = EXPORT_RESOURCES[resource]
+    rows = export_rows(project, resource, user)
+    if export_format == 'csv':
+        stream = stream_csv(rows, fields)
+    else:
+        stream = stream_ndjson(rows, fields)
+    if compress:
+        return gzip_stream(stream)
+    return (chunk.encode('utf-8') for chunk in stream)
@@ -0,0 +1,171 @@
+# backend/projects/forecast.py
+"""
+Project completion forecast from issue throughput.
+
+The history is the project's daily throughput: issues opened per day
+(created_at) and issues closed per day (updated_at of closed issues, the
+last change of an issue being its closing in practice), read with one
+grouped query over the last HISTORY_DAYS days.
+
+The burndown of the open issues is then simulated FORECAST_RUNS times by
+bootstrapping: every simulated day replays a randomly drawn historical day
+(its opened and closed counts together, so busy days stay busy on both
+sides). All runs are simulated at once as NumPy arrays of shape
+(runs, days), in batches; a run completes on the first day its cumulative
+net closings reach the open issue count. Runs that have not finished within
+MAX_HORIZON_DAYS count as unfinished.
+
+The result is cached per project and day until the next issue status
+change (including issues created or deleted) in the project, see
+invalidate_forecast().
+
+Requires NumPy.
+"""
+import datetime
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, IntegerField, Value
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+HISTORY_DAYS = 90
+MAX_HORIZON_DAYS = 730
+FORECAST_RUNS = 10_000
+BATCH_SIZE = 2_000
+PERCENTILES = (10, 50, 90)
+
+FORECAST_CACHE_KEY = 'projects:forecast:{project_id}:{day}'
+FORECAST_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def load_throughput(project, today):
+    """
+    (opened per day, closed per day) arrays over the history window and the
+    number of open issues, from one query.
+    """
+    from issues.models import Issue
+
+    issues = Issue.objects.filter(project=project).order_by()
+    start = today - datetime.timedelta(days=HISTORY_DAYS - 1)
+    opened = (
+        issues.annotate(day=TruncDate('created_at'), kind=Value(0, output_field=IntegerField()))
+        .values('kind', 'day').annotate(total=Count('id'))
+    )
+    closed = (
+        issues.filter(status='closed')
+        .annotate(day=TruncDate('updated_at'), kind=Value(1, output_field=IntegerField()))
+        .values('kind', 'day').annotate(total=Count('id'))
+    )
+
+    daily = np.zeros((2, HISTORY_DAYS), dtype=np.int64)
+    totals = [0, 0]
+    first_day = today
+    for row in opened.union(closed, all=True):
+        totals[row['kind']] += row['total']
+        first_day = min(first_day, row['day'])
+        if row['day'] >= start:
+            daily[row['kind'], min((row['day'] - start).days, HISTORY_DAYS - 1)] += row['total']
+
+    # A young project only has history since its first issue
+    history_days = min(HISTORY_DAYS, (today - first_day).days + 1)
+    daily = daily[:, HISTORY_DAYS - history_days:]
+    return daily[0], daily[1], totals[0] - totals[1]
+
+
+def simulate_completion(opened, closed, open_issues, runs=FORECAST_RUNS, seed=None):
+    """
+    Days until the open issue count reaches zero for every run
+    (MAX_HORIZON_DAYS + 1 when it does not within the horizon).
+    """
+    rng = np.random.default_rng(seed)
+    days = np.full(runs, MAX_HORIZON_DAYS + 1, dtype=np.int64)
+    if open_issues <= 0:
+        days[:] = 0
+        return days
+    net = closed - opened
+    if not len(net) or not closed.any():
+        return days
+
+    for start in range(0, runs, BATCH_SIZE):
+        batch = min(BATCH_SIZE, runs - start)
+        sampled = rng.integers(0, len(net), size=(batch, MAX_HORIZON_DAYS))
+        burned = np.cumsum(net[sampled], axis=1)
+        done = burned >= open_issues
+        finished = done.any(axis=1)
+        # argmax finds the first True; day 0 is today, so done on day i means i + 1 days
+        days[start:start + batch][finished] = done[finished].argmax(axis=1) + 1
+    return days
+
+
+def summarize(project, today, opened, closed, open_issues, days):
+    runs = len(days)
+    finished = days <= MAX_HORIZON_DAYS
+
+    def date_after(day_count):
+        return today + datetime.timedelta(days=int(day_count))
+
+    completion = {}
+    sorted_days = np.sort(days)
+    for percentile in PERCENTILES:
+        day_count = sorted_days[min(runs - 1, int(np.ceil(runs * percentile / 100)) - 1)]
+        completion[f'p{percentile}'] = date_after(day_count) if day_count <= MAX_HORIZON_DAYS else None
+
+    # Cumulative probability of being done, week by week, until (almost) certain
+    distribution = []
+    if finished.any():
+        last = int(days[finished].max())
+        for day_count in range(0, last + 7, 7):
+            probability = float(np.count_nonzero(days <= day_count)) / runs
+            distribution.append({'date': date_after(day_count), 'probability': round(probability, 4)})
+            if probability >= 0.99:
+                break
+
+    on_time = None
+    if project.end_date is not None:
+        on_time = round(float(np.count_nonzero(days <= (project.end_date - today).days)) / runs, 4)
+
+    return {
+        'project': project.pk,
+        'as_of': today,
+        'open_issues': open_issues,
+        'history_days': len(opened),
+        'throughput': {
+            'opened_per_day': round(float(opened.mean()), 3) if len(opened) else 0.0,
+            'closed_per_day': round(float(closed.mean()), 3) if len(closed) else 0.0,
+        },
+        'runs': runs,
+        'horizon_days': MAX_HORIZON_DAYS,
+        'completion': completion,
+        'unfinished_probability': round(float(np.count_nonzero(~finished)) / runs, 4),
+        'end_date': project.end_date,
+        'on_time_probability': on_time,
+        'distribution': distribution,
+    }
+
+
+def forecast_project(project):
+    """The project's completion forecast, cached until the next status change."""
+    today = timezone.localdate()
+    key = FORECAST_CACHE_KEY.format(project_id=project.pk, day=today.isoformat())
+    document = cache.get(key)
+    if document is None:
+        opened, closed, open_issues = load_throughput(project, today)
+        days = simulate_completion(opened, closed, open_issues)
+        document = summarize(project, today, opened, closed, open_issues, days)
+        cache.set(key, document, FORECAST_CACHE_TIMEOUT)
+    return document
+
+
+def invalidate_forecast(project_ids):
+    """
+    Drop the cached forecasts of projects whose issues changed status, now
+    and again once the transaction commits (see tournaments/bracket.py).
+    """
+    day = timezone.localdate().isoformat()
+    keys = [FORECAST_CACHE_KEY.format(project_id=project_id, day=day) for project_id in set(project_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -1,62 +1,195 @@
 # backend/projects/management/commands/create_project_chatrooms.py
 """
-Management command to create chat rooms for existing projects that don't have one.
-Usage: python manage.py create_project_chatrooms
+Management command to create chat rooms for existing projects that don't have one
+and to reconcile project chat room membership with the project's owner + members.
+Projects and rooms pending deletion (projects/purge.py) are left alone.
+
+Everything is done set-based, one batch of projects/rooms at a time:
+- missing rooms are found with a single anti-join and inserted with bulk_create
+- membership is diffed against Project.members and repaired with bulk
+  through-table inserts/deletes
+
+Usage:
+    python manage.py create_project_chatrooms
+    python manage.py create_project_chatrooms --dry-run
+    python manage.py create_project_chatrooms --batch-size 5000
 """
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from projects.models import Project
+from projects.visibility import invalidate_visibility
 from chat.models import ChatRoom
 
 
 class Command(BaseCommand):
-    help = 'Create chat rooms for existing projects that don\'t have one'
+    help = (
+        'Create chat rooms for existing projects that don\'t have one and '
+        'sync room membership with the project owner and members'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without writing anything',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of projects / rooms processed per batch (default: 1000)',
+        )
 
     def handle(self, *args, **options):
-        self.stdout.write('Creating chat rooms for existing projects...')
-        
-        # Get all projects
-        projects = Project.objects.all()
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('Dry run: no changes will be written.'))
+
+        self.stdout.write('Creating chat rooms for projects without one...')
+        created_count, pending_members = self.create_missing_rooms(batch_size, dry_run)
+
+        self.stdout.write('Reconciling project chat room membership...')
+        added_count, removed_count = self.reconcile_members(batch_size, dry_run)
+        # In a dry run the new rooms don't exist yet, so their initial members
+        # are not seen by the reconciliation pass; report them as additions.
+        added_count += pending_members
+
+        # Summary
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('Summary:'))
+        self.stdout.write(self.style.SUCCESS(f'  Created: {created_count} chat rooms'))
+        self.stdout.write(self.style.SUCCESS(f'  Members added: {added_count}'))
+        self.stdout.write(self.style.WARNING(f'  Members removed: {removed_count}'))
+        self.stdout.write(self.style.SUCCESS(f'  Total projects: {Project.objects.active().count()}'))
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+    def desired_members(self, project_ids):
+        """
+        Return {project_id: {user_id, ...}} with the owner and members
+        of every given project, using two queries in total.
+        """
+        desired = {
+            project_id: {owner_id}
+            for project_id, owner_id in (
+                Project.objects.filter(pk__in=project_ids).values_list('pk', 'owner_id')
+            )
+        }
+        memberships = (
+            Project.members.through.objects
+            .filter(project_id__in=project_ids)
+            .values_list('project_id', 'user_id')
+        )
+        for project_id, user_id in memberships:
+            desired[project_id].add(user_id)
+        return desired
+
+    def create_missing_rooms(self, batch_size, dry_run):
+        """
+        Create a project chat room for every project that has none (rooms
+        pending deletion do not count). Returns (rooms created, members the new rooms would get in a dry run).
+        """
+        missing = (
+            Project.objects.active()
+            .filter(~Exists(ChatRoom.objects.filter(project=OuterRef('pk'), deleted_at__isnull=True)))
+            .order_by('pk')
+            .values_list('pk', 'name')
+        )
         created_count = 0
-        skipped_count = 0
-        
-        for project in projects:
-            # Check if project already has a chat room
-            existing_room = ChatRoom.objects.filter(project=project).first()
-            
-            if existing_room:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f'  Skipped: "{project.name}" (already has chat room: {existing_room.name})'
-                    )
+        pending_members = 0
+        last_pk = 0
+
+        while True:
+            batch = list(missing.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+
+            if dry_run:
+                desired = self.desired_members([pk for pk, _ in batch])
+                pending_members += sum(len(users) for users in desired.values())
+            else:
+                ChatRoom.objects.bulk_create(
+                    [
+                        ChatRoom(name=f"{name} - Discussion", room_type='project', project_id=pk)
+                        for pk, name in batch
+                    ],
+                    batch_size=batch_size,
                 )
-                skipped_count += 1
-                continue
-            
-            # Create chat room for this project
-            chat_room = ChatRoom.objects.create(
-                name=f"{project.name} - Discussion",
-                room_type='project',
-                project=project
-            )
-            
-            # Add project owner to the chat room
-            chat_room.members.add(project.owner)
-            
-            # Add all project members to the chat room
-            if project.members.exists():
-                chat_room.members.add(*project.members.all())
-            
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'  ✓ Created chat room for "{project.name}" with {chat_room.members.count()} members'
+
+            created_count += len(batch)
+            verb = 'to create' if dry_run else 'created'
+            self.stdout.write(self.style.SUCCESS(f'  ✓ {created_count} chat rooms {verb}'))
+
+        return created_count, pending_members
+
+    def reconcile_members(self, batch_size, dry_run):
+        """
+        Make every project chat room's members equal to the project's
+        owner + members. Returns (memberships added, memberships removed).
+        """
+        Membership = ChatRoom.members.through
+        rooms = (
+            ChatRoom.objects
+            .filter(room_type='project', project__isnull=False, deleted_at__isnull=True,
+                    project__deleted_at__isnull=True)
+            .order_by('pk')
+            .values_list('pk', 'project_id')
+        )
+        added_count = 0
+        removed_count = 0
+        last_pk = 0
+
+        while True:
+            batch = list(rooms.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+
+            room_ids = [room_id for room_id, _ in batch]
+            desired = self.desired_members({project_id for _, project_id in batch})
+
+            current = {}
+            for row_id, room_id, user_id in (
+                Membership.objects
+                .filter(chatroom_id__in=room_ids)
+                .values_list('pk', 'chatroom_id', 'user_id')
+            ):
+                current.setdefault(room_id, {})[user_id] = row_id
+
+            to_add = []
+            to_remove = []
+            changed_users = set()
+            for room_id, project_id in batch:
+                wanted = desired.get(project_id, set())
+                existing = current.get(room_id, {})
+                to_add.extend(
+                    Membership(chatroom_id=room_id, user_id=user_id)
+                    for user_id in wanted - existing.keys()
                 )
+                removed = {user_id: row_id for user_id, row_id in existing.items() if user_id not in wanted}
+                to_remove.extend(removed.values())
+                changed_users.update(wanted - existing.keys(), removed)
+
+            if not dry_run and (to_add or to_remove):
+                with transaction.atomic():
+                    Membership.objects.bulk_create(to_add, batch_size=batch_size, ignore_conflicts=True)
+                    for start in range(0, len(to_remove), batch_size):
+                        Membership.objects.filter(pk__in=to_remove[start:start + batch_size]).delete()
+                    # Through-table writes send no m2m_changed signals
+                    invalidate_visibility(changed_users)
+
+            added_count += len(to_add)
+            removed_count += len(to_remove)
+            self.stdout.write(
+                f'  Checked {len(batch)} rooms: +{len(to_add)} / -{len(to_remove)} members'
             )
-            created_count += 1
-        
-        # Summary
-        self.stdout.write('')
-        self.stdout.write(self.style.SUCCESS(f'Summary:'))
-        self.stdout.write(self.style.SUCCESS(f'  Created: {created_count} chat rooms'))
-        self.stdout.write(self.style.WARNING(f'  Skipped: {skipped_count} projects'))
-        self.stdout.write(self.style.SUCCESS(f'  Total projects: {projects.count()}'))
+
+        return added_count, removed_count
@@ -0,0 +1,70 @@
+# backend/projects/management/commands/purge_deleted.py
+"""
+Purge projects and chat rooms marked as deleted by the API, in small
+chunks (see projects/purge.py). Safe to interrupt and re-run.
+
+Usage:
+    python manage.py purge_deleted
+    python manage.py purge_deleted --chunk-size 200 --pause 0.05
+    python manage.py purge_deleted --interval 60      # keep running as a worker
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.models import ChatRoom
+from projects.models import Project
+from projects.purge import PURGE_CHUNK_SIZE, purge_project, purge_room
+
+
+class Command(BaseCommand):
+    help = 'Delete pending-delete projects and chat rooms in bounded chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=PURGE_CHUNK_SIZE,
+            help=f'Rows deleted per transaction (default: {PURGE_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between chunks, leaving the write lock to other writers',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Keep running and look for new deletions every INTERVAL seconds',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+        purge_options = {'chunk_size': options['chunk_size'], 'pause': options['pause']}
+
+        while True:
+            # Rooms of a deleted project go with the project
+            rooms = list(
+                ChatRoom.objects
+                .filter(deleted_at__isnull=False)
+                .exclude(project__deleted_at__isnull=False)
+                .values_list('pk', 'name')
+            )
+            projects = list(Project.objects.filter(deleted_at__isnull=False).values_list('pk', 'name'))
+            for label, items, purge in (('room', rooms, purge_room), ('project', projects, purge_project)):
+                for pk, name in items:
+                    self.stdout.write(f"Purging {label} {pk} '{name}'...")
+                    total = 0
+                    for model, deleted in purge(pk, **purge_options):
+                        total += deleted
+                        self.stdout.write(f'  -{deleted} {model._meta.label}')
+                    self.stdout.write(self.style.SUCCESS(f"  ✓ {label} {pk} purged ({total} rows)"))
+
+            if options['interval'] is None:
+                if not rooms and not projects:
+                    self.stdout.write('Nothing to purge.')
+                return
+            time.sleep(options['interval'])
@@ -3,6 +3,12 @@
 from django.db import models
 from django.conf import settings
 
+class ProjectQuerySet(models.QuerySet):
+    def active(self):
+        """Projects not waiting to be purged (see projects/purge.py)."""
+        return self.filter(deleted_at__isnull=True)
+
+
 class Project(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -21,5 +27,18 @@ class Project(models.Model):
         help_text="Budget allocated to the project"
     )
 
+    # Set by DELETE /api/projects/<id>/; the rows are purged in chunks later
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = ProjectQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the loaded owner so a re-assignment can be detected on
+        # save (projects/signals.py) without re-fetching the row.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_owner_id = instance.__dict__.get('owner_id')
+        return instance
+
     def __str__(self):
         return self.name
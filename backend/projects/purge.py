@@ -0,0 +1,112 @@
+# backend/projects/purge.py
+"""
+Deferred, chunked deletion of projects and chat rooms.
+
+Deleting a big project in one go cascades through its issues, comments,
+assignments, chat rooms, messages and notifications in a single
+transaction, holding SQLite's write lock for as long as that takes. So
+DELETE only marks the project (and its rooms) with `deleted_at`, which hides
+them everywhere at once, and `manage.py purge_deleted` removes the rows
+later:
+
+- children first, leaves before parents, so every DELETE only cascades
+  into rows that are already gone
+- at most `chunk_size` rows per transaction (run_write_transaction, which
+  also retries on lock contention), with an optional pause in between so
+  other writers get the lock
+- the project / room row itself last, so an interrupted purge simply
+  continues on the next run
+"""
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.db import run_write_transaction
+from .models import Project
+from .visibility import invalidate_visibility
+
+PURGE_CHUNK_SIZE = 500
+
+
+def _room_steps(room_filter):
+    from chat.models import ChatRoom, Message, MessageArchive
+    return [
+        (Message, {f'room__{key}': value for key, value in room_filter.items()}),
+        (MessageArchive, {f'room__{key}': value for key, value in room_filter.items()}),
+        (ChatRoom.members.through, {f'chatroom__{key}': value for key, value in room_filter.items()}),
+        (ChatRoom, room_filter),
+    ]
+
+
+def _project_steps(project_id):
+    from issues.models import ActivityEvent, Comment, Issue
+    from notifications.models import BroadcastJoinMark, NotificationMute, ProjectEvent
+    return [
+        (ActivityEvent, {'project_id': project_id}),
+        (Comment, {'issue__project_id': project_id}),
+        (Issue.assignees.through, {'issue__project_id': project_id}),
+        (Issue, {'project_id': project_id}),
+        *_room_steps({'project_id': project_id}),
+        (ProjectEvent, {'project_id': project_id}),
+        (NotificationMute, {'project_id': project_id}),
+        (BroadcastJoinMark, {'project_id': project_id}),
+        (Project.members.through, {'project_id': project_id}),
+        (Project, {'pk': project_id}),
+    ]
+
+
+def mark_project_deleted(project):
+    """Hide a project and its chat rooms; the rows are purged later."""
+    from chat.models import ChatRoom
+
+    now = timezone.now()
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk).update(deleted_at=now)
+        rooms = ChatRoom.objects.filter(project=project, deleted_at__isnull=True)
+        room_members = list(ChatRoom.members.through.objects.filter(chatroom__in=rooms).values_list('user_id', flat=True))
+        rooms.update(deleted_at=now)
+        members = list(project.members.values_list('pk', flat=True))
+        invalidate_visibility([project.owner_id, *members, *room_members])
+    project.deleted_at = now
+
+
+def mark_room_deleted(room):
+    """Hide a chat room; its messages are purged later."""
+    from chat.models import ChatRoom
+
+    now = timezone.now()
+    with transaction.atomic():
+        ChatRoom.objects.filter(pk=room.pk).update(deleted_at=now)
+        invalidate_visibility(ChatRoom.members.through.objects.filter(chatroom=room).values_list('user_id', flat=True))
+    room.deleted_at = now
+
+
+def _delete_chunk(model, lookup, chunk_size):
+    pks = list(model.objects.filter(**lookup).order_by().values_list('pk', flat=True)[:chunk_size])
+    if pks:
+        model.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def purge(steps, chunk_size=PURGE_CHUNK_SIZE, pause=0):
+    """
+    Delete the rows of every (model, lookup) step in chunks, in order.
+    Yields (model, rows deleted in the chunk) after every chunk.
+    """
+    for model, lookup in steps:
+        while True:
+            deleted = run_write_transaction(_delete_chunk, model, lookup, chunk_size)
+            if not deleted:
+                break
+            yield model, deleted
+            if pause:
+                time.sleep(pause)
+
+
+def purge_project(project_id, **options):
+    return purge(_project_steps(project_id), **options)
+
+
+def purge_room(room_id, **options):
+    return purge(_room_steps({'pk': room_id}), **options)
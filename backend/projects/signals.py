@@ -0,0 +1,175 @@
+# backend/projects/signals.py
+"""
+Keep project chat rooms in sync with Project.members.
+
+Whenever members are added to / removed from a project (PATCH on
+/api/projects/<id>/, the admin, or user.projects.add(...)), the change is
+applied to the project's chat rooms with one bulk through-table write per
+direction, and the matching 'project_joined' notifications are created in
+the same pass.
+
+The user who made the change can be set on the project as
+``project._membership_actor`` before saving; otherwise the project owner
+is used as the notification actor.
+
+Membership and ownership changes also drop the affected users' cached
+visible project / room ids (see projects/visibility.py), new members and
+owners get a broadcast join mark (see notifications/feed.py), and
+membership changes are logged to the project timeline (see
+issues/activity.py).
+"""
+from django.db.models import F, Q
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from .models import Project
+from .visibility import invalidate_visibility
+
+
+def _membership_pairs(instance, reverse, pk_set):
+    """
+    Normalise a Project.members m2m_changed call into a list of
+    (project_id, user_id) pairs, whichever side the change came from.
+    """
+    if reverse:
+        # user.projects.add(...): instance is the user, pk_set are projects
+        return [(project_id, instance.pk) for project_id in pk_set]
+    return [(instance.pk, user_id) for user_id in pk_set]
+
+
+def add_members_to_rooms(pairs, actor=None):
+    """
+    Add users to the chat rooms of their projects and notify them,
+    using one bulk insert for the memberships and one for the notifications.
+    The project events posted before they joined count as read for them.
+    """
+    from chat.models import ChatRoom
+    from notifications.feed import mark_projects_joined
+    from notifications.models import Notification
+
+    if not pairs:
+        return
+    invalidate_visibility(user_id for _, user_id in pairs)
+
+    project_ids = {project_id for project_id, _ in pairs}
+    projects = {
+        pk: (name, owner_id)
+        for pk, name, owner_id in (
+            Project.objects.filter(pk__in=project_ids).values_list('pk', 'name', 'owner_id')
+        )
+    }
+    rooms = (
+        ChatRoom.objects
+        .filter(project_id__in=project_ids, room_type='project')
+        .values_list('pk', 'project_id')
+    )
+    rooms_by_project = {}
+    for room_id, project_id in rooms:
+        rooms_by_project.setdefault(project_id, []).append(room_id)
+
+    Membership = ChatRoom.members.through
+    Membership.objects.bulk_create(
+        [
+            Membership(chatroom_id=room_id, user_id=user_id)
+            for project_id, user_id in pairs
+            for room_id in rooms_by_project.get(project_id, [])
+        ],
+        ignore_conflicts=True,
+    )
+
+    notifications = []
+    for project_id, user_id in pairs:
+        name, owner_id = projects[project_id]
+        actor_id = actor.pk if actor is not None else owner_id
+        if user_id == actor_id:
+            continue
+        notifications.append(
+            Notification(
+                recipient_id=user_id,
+                actor_id=actor_id,
+                type='project_joined',
+                message=f"You have been added to project '{name}'",
+            )
+        )
+    Notification.objects.bulk_create(notifications)
+    mark_projects_joined(pairs)
+
+
+def remove_members_from_rooms(pairs):
+    """
+    Remove users from the chat rooms of their projects with a single delete.
+    Project owners always stay in their project's rooms.
+    """
+    from chat.models import ChatRoom
+
+    if not pairs:
+        return
+    invalidate_visibility(user_id for _, user_id in pairs)
+
+    # One OR-term per project (PATCH on a project) or per user
+    # (user.projects.remove(...)), whichever side has fewer distinct values.
+    by_project, by_user = {}, {}
+    for project_id, user_id in pairs:
+        by_project.setdefault(project_id, []).append(user_id)
+        by_user.setdefault(user_id, []).append(project_id)
+    condition = Q()
+    if len(by_project) <= len(by_user):
+        for project_id, user_ids in by_project.items():
+            condition |= Q(chatroom__project_id=project_id, user_id__in=user_ids)
+    else:
+        for user_id, project_ids in by_user.items():
+            condition |= Q(chatroom__project_id__in=project_ids, user_id=user_id)
+
+    (
+        ChatRoom.members.through.objects
+        .filter(condition, chatroom__room_type='project')
+        .exclude(chatroom__project__owner_id=F('user_id'))
+        .delete()
+    )
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def sync_project_room_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Apply Project.members changes to the project's chat rooms.
+    clear() does not report which rows it removed, so they are captured
+    in pre_clear and applied in post_clear.
+    """
+    from issues import activity
+
+    actor = None if reverse else getattr(instance, '_membership_actor', None)
+    if action == 'post_add':
+        pairs = _membership_pairs(instance, reverse, pk_set)
+        add_members_to_rooms(pairs, actor=actor)
+        activity.record(activity.membership_changes('member_added', pairs, actor))
+    elif action == 'post_remove':
+        pairs = _membership_pairs(instance, reverse, pk_set)
+        remove_members_from_rooms(pairs)
+        activity.record(activity.membership_changes('member_removed', pairs, actor))
+    elif action == 'pre_clear':
+        if reverse:
+            cleared = set(instance.projects.values_list('pk', flat=True))
+        else:
+            cleared = set(instance.members.values_list('pk', flat=True))
+        instance._cleared_project_members = cleared
+    elif action == 'post_clear':
+        cleared = instance.__dict__.pop('_cleared_project_members', set())
+        pairs = _membership_pairs(instance, reverse, cleared)
+        remove_members_from_rooms(pairs)
+        activity.record(activity.membership_changes('member_removed', pairs, actor))
+
+
+@receiver(post_save, sender=Project)
+def invalidate_owner_visibility(sender, instance, created, **kwargs):
+    """
+    A new or re-assigned project changes what its (old and new) owner can
+    see. The old owner is the one loaded with the instance (Project.from_db).
+    """
+    from notifications.feed import mark_projects_joined
+
+    previous_owner_id = getattr(instance, '_loaded_owner_id', None) or instance.owner_id
+    instance._loaded_owner_id = instance.owner_id
+    if created or previous_owner_id != instance.owner_id:
+        invalidate_visibility([instance.owner_id, previous_owner_id])
+    if not created and previous_owner_id != instance.owner_id:
+        mark_projects_joined([(instance.pk, instance.owner_id)])
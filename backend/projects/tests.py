@@ -1,3 +1,302 @@
-from django.test import TestCase
+import io
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from chat.models import ChatRoom, Message
+from issues.models import Issue
+from notifications.models import Notification
+from projects.models import Project
+from projects.purge import _project_steps, purge_project
+from projects.visibility import visible_project_ids
+from users.models import User
+
+
+def auth_header(user):
+    return f'Bearer {AccessToken.for_user(user)}'
+
+
+class ExportStreamingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.project = Project.objects.create(name='Export', owner=cls.owner)
+        Issue.objects.bulk_create([
+            Issue(title=f'Issue {i}', project=cls.project, reporter=cls.owner) for i in range(5)
+        ])
+
+    def export_url(self, export_format='csv'):
+        return f'/api/projects/{self.project.pk}/export/?resource=issues&format={export_format}'
+
+    def test_wsgi_export_is_a_sync_stream(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        response = client.get(self.export_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.is_async)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 6)
+
+    async def test_asgi_export_is_an_async_stream(self):
+        response = await AsyncClient().get(self.export_url('ndjson'), headers={'Authorization': auth_header(self.owner)})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(b''.join(chunks).count(b'\n'), 5)
+
+
+def async_get(url, user=None):
+    headers = {'Authorization': auth_header(user)} if user is not None else {}
+    response = async_to_sync(AsyncClient().get)(url, headers=headers)
+    return response.status_code, response.json()
+
+
+class AsyncReadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.project = Project.objects.create(name='Listed', owner=cls.owner)
+        cls.project.members.add(cls.member)
+        Issue.objects.create(title='Closed', project=cls.project, reporter=cls.owner, status='closed')
+        Issue.objects.create(title='Open', project=cls.project, reporter=cls.owner)
+        cls.deleted = Project.objects.create(name='Deleted', owner=cls.owner, deleted_at=timezone.now())
+
+    def test_list_and_detail_match_the_sync_endpoints(self):
+        client = APIClient()
+        status, body = async_get('/api/async/projects/')
+        sync = client.get('/api/projects/').json()
+        self.assertEqual(status, 200)
+        self.assertEqual((body['count'], body['results']), (sync['count'], sync['results']))
+        self.assertEqual([row['name'] for row in body['results']], ['Listed'])
+
+        status, body = async_get(f'/api/async/projects/{self.project.pk}/', self.member)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, client.get(f'/api/projects/{self.project.pk}/').json())
+        self.assertEqual(body['progress'], 50)
+
+    def test_projects_pending_deletion_are_not_found(self):
+        self.assertEqual(async_get(f'/api/async/projects/{self.deleted.pk}/')[0], 404)
+        self.assertEqual(APIClient().get(f'/api/projects/{self.deleted.pk}/').status_code, 404)
+
+
+class VisibilityCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.project = Project.objects.create(name='Visible', owner=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_membership_changes_drop_cached_ids(self):
+        self.assertEqual(visible_project_ids(self.member), frozenset())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.members.add(self.member)
+        self.assertEqual(visible_project_ids(self.member), {self.project.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.member.projects.remove(self.project)
+        self.assertEqual(visible_project_ids(self.member), frozenset())
+
+    def test_owner_change_drops_both_owners_cached_ids(self):
+        project = Project.objects.get(pk=self.project.pk)
+        self.assertEqual(visible_project_ids(self.owner), {project.pk})
+        self.assertEqual(visible_project_ids(self.member), frozenset())
+
+        project.owner = self.member
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertEqual(visible_project_ids(self.owner), frozenset())
+        self.assertEqual(visible_project_ids(self.member), {project.pk})
+
+    def test_save_without_owner_change_reads_nothing(self):
+        project = Project.objects.get(pk=self.project.pk)
+        project.name = 'Renamed'
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(1):
+            project.save()
+        self.assertEqual(callbacks, [])
+
+
+class ForecastCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.project = Project.objects.create(name='Forecast', owner=cls.owner)
+        Issue.objects.bulk_create([
+            Issue(title=f'Issue {i}', project=cls.project, reporter=cls.owner, status=status)
+            for i, status in enumerate(['open', 'open', 'closed', 'closed', 'closed'])
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def forecast(self):
+        return self.client.get(f'/api/projects/{self.project.pk}/forecast/').json()
+
+    def test_changing_the_end_date_refreshes_the_forecast(self):
+        self.assertIsNone(self.forecast()['end_date'])
+        self.client.patch(f'/api/projects/{self.project.pk}/', {'end_date': '2030-01-01'}, format='json')
+        forecast = self.forecast()
+        self.assertEqual(forecast['end_date'], '2030-01-01')
+        self.assertIsNotNone(forecast['on_time_probability'])
+
+    def test_other_changes_keep_the_cached_forecast(self):
+        self.forecast()
+        self.client.patch(f'/api/projects/{self.project.pk}/', {'name': 'Renamed'}, format='json')
+        with self.assertNumQueries(2):  # the project and its members, no issue query
+            self.forecast()
+
+
+class PurgeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        project_id = self.client.post('/api/projects/', {
+            'name': 'Doomed', 'members': [self.member.pk],
+        }, format='json').json()['id']
+        self.project = Project.objects.get(pk=project_id)
+        for i in range(3):
+            issue = self.client.post('/api/issues/', {
+                'title': f'Issue {i}', 'project': project_id, 'assignees': [self.member.pk],
+            }, format='json').json()
+            self.client.post('/api/comments/', {'issue': issue['id'], 'content': 'Noted'}, format='json')
+        room = ChatRoom.objects.get(project=self.project)
+        Message.objects.bulk_create([Message(room=room, sender=self.owner, content=str(i)) for i in range(5)])
+
+    def test_delete_hides_at_once_and_purge_removes_children_first(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/projects/{self.project.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(f'/api/projects/{self.project.pk}/').status_code, 404)
+        self.assertEqual(visible_project_ids(self.member), frozenset())
+        self.assertTrue(Issue.objects.filter(project=self.project).exists())
+
+        steps = _project_steps(self.project.pk)
+        expected = [(model, model.objects.filter(**lookup).count()) for model, lookup in steps]
+        expected = [(model, count) for model, count in expected if count]
+        self.assertGreaterEqual(len(expected), 8)
+        deleted = {}
+        for model, count in purge_project(self.project.pk, chunk_size=2):
+            self.assertLessEqual(count, 2)
+            deleted[model] = deleted.get(model, 0) + count
+
+        # Every step deletes all of its own rows: nothing was removed earlier
+        # by the cascade of a parent
+        self.assertEqual(list(deleted.items()), expected)
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertFalse(ChatRoom.objects.filter(project_id=self.project.pk).exists())
+
+
+class MembershipSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.ann = User.objects.create_user('ann', 'ann@example.com', 'pw')
+        cls.ben = User.objects.create_user('ben', 'ben@example.com', 'pw')
+        cls.project = Project.objects.create(name='Synced', owner=cls.owner)
+        cls.room = ChatRoom.objects.create(name='Synced - Discussion', project=cls.project)
+        cls.room.members.add(cls.owner)
+        cls.other = Project.objects.create(name='Other', owner=cls.owner)
+        cls.other_room = ChatRoom.objects.create(name='Other - Discussion', project=cls.other)
+
+    def room_members(self, room=None):
+        return set((room or self.room).members.values_list('username', flat=True))
+
+    def test_added_and_removed_members_follow_into_the_room(self):
+        self.project._membership_actor = self.ann
+        self.project.members.add(self.ann, self.ben)
+        self.assertEqual(self.room_members(), {'owner', 'ann', 'ben'})
+        # The actor is not told about their own change
+        self.assertEqual(
+            list(Notification.objects.filter(type='project_joined').values_list('recipient__username', 'actor__username')),
+            [('ben', 'ann')],
+        )
+
+        self.project.members.remove(self.ann)
+        self.assertEqual(self.room_members(), {'owner', 'ben'})
+        self.project.members.clear()
+        self.assertEqual(self.room_members(), {'owner'})
+
+    def test_changes_from_the_user_side(self):
+        self.ann.projects.add(self.project, self.other)
+        self.assertEqual(self.room_members(), {'owner', 'ann'})
+        self.assertEqual(self.room_members(self.other_room), {'ann'})
+        self.ann.projects.remove(self.other)
+        self.assertEqual(self.room_members(self.other_room), set())
+        self.ann.projects.clear()
+        self.assertEqual(self.room_members(), {'owner'})
+
+    def test_the_owner_stays_in_the_room(self):
+        self.project.members.add(self.owner, self.ann)
+        self.project.members.remove(self.owner, self.ann)
+        self.assertEqual(self.room_members(), {'owner'})
+
+
+class CreateProjectChatroomsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.stranger = User.objects.create_user('stranger', 'stranger@example.com', 'pw')
+
+    def setUp(self):
+        # Projects created outside the API have no room
+        self.roomless = Project.objects.create(name='Roomless', owner=self.owner)
+        self.roomless.members.add(self.member)
+        self.drifted = Project.objects.create(name='Drifted', owner=self.owner)
+        self.drifted.members.add(self.member)
+        self.room = ChatRoom.objects.create(name='Drifted Chat', project=self.drifted)
+        self.room.members.add(self.stranger)
+
+    def members_of(self, project):
+        return set(
+            ChatRoom.members.through.objects
+            .filter(chatroom__project=project)
+            .values_list('user_id', flat=True)
+        )
+
+    def test_dry_run_writes_nothing(self):
+        call_command('create_project_chatrooms', '--dry-run', stdout=io.StringIO())
+        self.assertFalse(ChatRoom.objects.filter(project=self.roomless).exists())
+        self.assertEqual(self.members_of(self.drifted), {self.stranger.pk})
+
+    def test_rooms_are_created_and_membership_reconciled(self):
+        call_command('create_project_chatrooms', '--batch-size', '1', stdout=io.StringIO())
+        self.assertEqual(ChatRoom.objects.filter(project=self.roomless).count(), 1)
+        self.assertEqual(self.members_of(self.roomless), {self.owner.pk, self.member.pk})
+        self.assertEqual(self.members_of(self.drifted), {self.owner.pk, self.member.pk})
+
+        # A second run has nothing left to do
+        output = io.StringIO()
+        call_command('create_project_chatrooms', stdout=output)
+        self.assertEqual(ChatRoom.objects.filter(project__in=[self.roomless, self.drifted]).count(), 2)
+
+    def test_projects_and_rooms_pending_deletion_are_left_alone(self):
+        deleted = Project.objects.create(name='Deleted', owner=self.owner, deleted_at=timezone.now())
+        ChatRoom.objects.filter(pk=self.room.pk).update(deleted_at=timezone.now())
+
+        output = io.StringIO()
+        call_command('create_project_chatrooms', stdout=output)
+        self.assertFalse(ChatRoom.objects.filter(project=deleted).exists())
+        # The deleted room is not repaired; the project gets a live one instead
+        self.assertEqual(
+            set(ChatRoom.objects.filter(project=self.drifted, deleted_at__isnull=True).values_list('name', flat=True)),
+            {'Drifted - Discussion'},
+        )
+        self.assertEqual(list(self.room.members.all()), [self.stranger])
+        self.assertIn('Created: 2 chat rooms', output.getvalue())
+        self.assertIn('Total projects: 2', output.getvalue())
@@ -6,12 +6,29 @@
 # This improves usability (public can browse) while keeping
 # data integrity and write operations secure.
 
-from rest_framework import viewsets, permissions
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.db import LockRetryMixin
+from issues import activity
+from issues.activity import ActivityMixin
+from .exports import (
+    EXPORT_FORMATS,
+    EXPORT_RESOURCES,
+    ExportContentNegotiation,
+    astream,
+    build_export_stream,
+)
+from .forecast import invalidate_forecast
 from .models import Project
+from .purge import mark_project_deleted
 from .serializers import ProjectSerializer
+from .visibility import scope_to_projects
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(LockRetryMixin, ActivityMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows projects to be viewed or edited.
 
@@ -19,11 +36,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
     - GET  /api/projects/<id>/      -> Retrieve single project (public)
     - POST /api/projects/           -> Create a new project (auth required)
     - PUT/PATCH /api/projects/<id>/ -> Update project (auth required)
-    - DELETE /api/projects/<id>/    -> Delete project (auth required)
+    - DELETE /api/projects/<id>/    -> Delete project (auth required, purged in the background)
+    - GET  /api/projects/<id>/export/ -> Stream issues/comments/messages (auth required)
+    - GET  /api/projects/<id>/timeline/ -> Activity of the project and its issues (owner / members)
+    - GET  /api/projects/<id>/topological-order/ -> Issues in dependency order (owner / members)
+    - GET  /api/projects/<id>/forecast/ -> Completion date distribution (public)
     """
     queryset = (
         Project.objects
-        .all()
+        .active()
         .select_related('owner')      # Optimise queries: fetch related owner in one SQL
         .prefetch_related('members')  # Prefetch many-to-many members to avoid N+1 queries
     )
@@ -32,16 +53,26 @@ class ProjectViewSet(viewsets.ModelViewSet):
     # ✅ Allow public read (GET/HEAD/OPTIONS) but restrict write actions
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    # Actions only the project's owner and members may use (404 for others)
+    member_actions = {'timeline', 'topological_order'}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.member_actions:
+            queryset = scope_to_projects(queryset, self.request.user, column='pk')
+        return queryset
+
     def perform_create(self, serializer):
         """
         When a logged-in user creates a project, automatically:
         1. Set them as the project owner
         2. Create a chat room for the project
         3. Add owner and members to the chat room
-        4. Notify members that they have been added
+
+        Members are notified that they have been added by the
+        Project.members sync in projects/signals.py.
         """
         from chat.models import ChatRoom
-        from notifications.models import Notification
         
         # Save the project with the owner
         project = serializer.save(owner=self.request.user)
@@ -53,41 +84,115 @@ class ProjectViewSet(viewsets.ModelViewSet):
             project=project
         )
         
-        # Add the owner to the chat room
-        chat_room.members.add(self.request.user)
-        
-        # Add all project members to the chat room and notify them
-        if project.members.exists():
-            chat_room.members.add(*project.members.all())
-            
-            # Notify members
-            for member in project.members.all():
-                if member != self.request.user:
-                    Notification.objects.create(
-                        recipient=member,
-                        actor=self.request.user,
-                        type='project_joined',
-                        message=f"You have been added to project '{project.name}'"
-                    )
+        # Add the owner and all project members to the chat room. Later member
+        # changes are kept in sync by projects/signals.py.
+        chat_room.members.add(self.request.user, *project.members.all())
+
+        activity.record([activity.event('created', self.request.user, project.pk, new_value=project.name)],
+                        first=True)
 
     def perform_update(self, serializer):
         """
-        Notify members when project is updated.
+        Notify members when project is updated, with one broadcast event
+        for the whole project (see notifications/feed.py).
         """
-        from notifications.models import Notification
+        from notifications.feed import broadcast
         
+        # Member additions made by this request are notified on behalf of the
+        # requesting user (see projects/signals.py).
+        serializer.instance._membership_actor = self.request.user
+        before = activity.snapshot(serializer.instance, activity.PROJECT_FIELDS)
         project = serializer.save()
         
-        # Notify all members about the update
-        recipients = set(project.members.all())
-        if project.owner != self.request.user:
-            recipients.add(project.owner)
-            
-        for member in recipients:
-            if member != self.request.user:
-                Notification.objects.create(
-                    recipient=member,
-                    actor=self.request.user,
-                    type='general',
-                    message=f"Project '{project.name}' has been updated"
-                )
+        broadcast(project, self.request.user, 'general', f"Project '{project.name}' has been updated")
+        after = activity.snapshot(project, activity.PROJECT_FIELDS)
+        activity.record(activity.field_changes(before, after, self.request.user, project.pk))
+        if any(before[name] != after[name] for name in ('start_date', 'end_date')):
+            # The cached forecast reports against the project's dates
+            invalidate_forecast([project.pk])
+
+    def perform_destroy(self, instance):
+        """
+        Hide the project and its chat rooms right away; the cascade through
+        issues, comments and messages runs later in small chunks
+        (manage.py purge_deleted).
+        """
+        mark_project_deleted(instance)
+
+    @action(detail=True, methods=['get'])
+    def forecast(self, request, pk=None):
+        """
+        Completion date distribution from the project's issue throughput
+        (bootstrap simulation, see projects/forecast.py). Cached until the
+        next issue status change in the project.
+        GET /api/projects/<id>/forecast/
+        """
+        from .forecast import forecast_project
+
+        project = self.get_object()
+        return Response(forecast_project(project))
+
+    @action(detail=True, methods=['get'], url_path='topological-order',
+            permission_classes=[permissions.IsAuthenticated])
+    def topological_order(self, request, pk=None):
+        """
+        The project's issues ordered so that every issue comes after all of
+        its blockers (see issues/dependencies.py).
+        GET /api/projects/<id>/topological-order/
+        """
+        from issues.dependencies import topological_order
+        from issues.models import Issue
+
+        project = self.get_object()
+        issues = scope_to_projects(Issue.objects.all(), request.user)
+        return Response({'results': list(topological_order(issues, project.pk))})
+
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def timeline(self, request, pk=None):
+        """
+        Activity of the project and its issues, newest first.
+        GET /api/projects/<id>/timeline/?before=<event id>&limit=
+        """
+        project = self.get_object()
+        return Response(activity.timeline(request, project_id=project.pk))
+
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[permissions.IsAuthenticated],
+        content_negotiation_class=ExportContentNegotiation,
+    )
+    def export(self, request, pk=None):
+        """
+        Stream a project's data as CSV or NDJSON.
+        GET /api/projects/<id>/export/?resource=issues|comments|messages&format=csv|ndjson[&gzip=1]
+        """
+        resource = request.query_params.get('resource', 'issues')
+        export_format = request.query_params.get('format', 'csv')
+        compress = request.query_params.get('gzip') in ('1', 'true')
+
+        if resource not in EXPORT_RESOURCES:
+            return Response(
+                {'resource': f"Must be one of: {', '.join(EXPORT_RESOURCES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'format': f"Must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        project = self.get_object()
+        filename = f"project-{project.pk}-{resource}.{export_format}"
+        content_type = EXPORT_FORMATS[export_format]
+        if compress:
+            filename += '.gz'
+            content_type = 'application/gzip'
+
+        stream = build_export_stream(project, resource, export_format, request.user, compress=compress)
+        if isinstance(request._request, ASGIRequest):
+            # Keep streaming under ASGI instead of buffering the whole export
+            stream = astream(stream)
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,133 @@
+# backend/projects/visibility.py
+"""
+Per-user visible project and chat room ids.
+
+A user sees the issues and comments of the projects they own or are a
+member of, and the messages of the chat rooms they are a member of,
+except for projects and rooms pending deletion (projects/purge.py). Both
+id sets are read with one indexed query, cached per user and used to scope
+the issue, comment, message and room querysets with `IN (...)` on an
+indexed foreign key instead of joining the membership tables on every
+request. Users with very many projects or rooms get an indexed EXISTS
+subquery instead of a long IN list.
+
+The cache entries are dropped whenever the user's memberships change:
+- Project.members changes (projects/signals.py, which also writes the
+  project chat room memberships directly)
+- project ownership changes (projects/signals.py)
+- ChatRoom.members changes (chat/signals.py)
+- create_project_chatrooms membership repairs
+
+Invalidation only reaches the cache of the process that made the change.
+With the default per-process cache, other workers keep their entries until
+VISIBILITY_CACHE_SECONDS runs out, so that is kept to a few seconds (a
+revoked member can read for that long at most); raise it only together
+with a shared cache backend.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Project
+
+PROJECTS_CACHE_KEY = 'visible:projects:{user_id}'
+ROOMS_CACHE_KEY = 'visible:rooms:{user_id}'
+
+# Above this many ids the scope is an EXISTS subquery, not an IN list
+INLINE_IDS_LIMIT = 500
+
+
+def _cache_seconds():
+    return getattr(settings, 'VISIBILITY_CACHE_SECONDS', 5)
+
+
+def _load_project_ids(user_id):
+    owned = Project.objects.active().filter(owner_id=user_id).order_by().values_list('pk', flat=True)
+    joined = (
+        Project.members.through.objects
+        .filter(user_id=user_id, project__deleted_at__isnull=True)
+        .values_list('project_id', flat=True)
+    )
+    return frozenset(owned.union(joined))
+
+
+def _load_room_ids(user_id):
+    from chat.models import ChatRoom
+    return frozenset(
+        ChatRoom.members.through.objects
+        .filter(user_id=user_id, chatroom__deleted_at__isnull=True)
+        .values_list('chatroom_id', flat=True)
+    )
+
+
+def _cached(key, loader, user_id):
+    ids = cache.get(key)
+    if ids is None:
+        ids = loader(user_id)
+        cache.set(key, ids, _cache_seconds())
+    return ids
+
+
+def visible_project_ids(user):
+    """Ids of the projects `user` owns or is a member of."""
+    return _cached(PROJECTS_CACHE_KEY.format(user_id=user.pk), _load_project_ids, user.pk)
+
+
+def visible_room_ids(user):
+    """Ids of the chat rooms `user` is a member of."""
+    return _cached(ROOMS_CACHE_KEY.format(user_id=user.pk), _load_room_ids, user.pk)
+
+
+avisible_project_ids = sync_to_async(visible_project_ids)
+avisible_room_ids = sync_to_async(visible_room_ids)
+
+
+def invalidate_visibility(user_ids):
+    """Forget the cached project and room ids of `user_ids` once the current transaction commits."""
+    keys = [
+        key.format(user_id=user_id)
+        for user_id in set(user_ids) - {None}
+        for key in (PROJECTS_CACHE_KEY, ROOMS_CACHE_KEY)
+    ]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _in_projects(queryset, column, user, ids):
+    if len(ids) <= INLINE_IDS_LIMIT:
+        return queryset.filter(**{f'{column}__in': ids})
+    owned = Project.objects.active().filter(pk=OuterRef(column), owner_id=user.pk)
+    joined = Project.members.through.objects.filter(
+        project_id=OuterRef(column), user_id=user.pk, project__deleted_at__isnull=True,
+    )
+    return queryset.filter(Exists(owned) | Exists(joined))
+
+
+def _in_rooms(queryset, column, user, ids):
+    from chat.models import ChatRoom
+    if len(ids) <= INLINE_IDS_LIMIT:
+        return queryset.filter(**{f'{column}__in': ids})
+    joined = ChatRoom.members.through.objects.filter(
+        chatroom_id=OuterRef(column), user_id=user.pk, chatroom__deleted_at__isnull=True,
+    )
+    return queryset.filter(Exists(joined))
+
+
+def scope_to_projects(queryset, user, column='project_id'):
+    """Restrict `queryset` to rows whose `column` is one of the user's visible projects."""
+    return _in_projects(queryset, column, user, visible_project_ids(user))
+
+
+def scope_to_rooms(queryset, user, column='room_id'):
+    """Restrict `queryset` to rows whose `column` is one of the user's chat rooms."""
+    return _in_rooms(queryset, column, user, visible_room_ids(user))
+
+
+async def ascope_to_projects(queryset, user, column='project_id'):
+    return _in_projects(queryset, column, user, await avisible_project_ids(user))
+
+
+async def ascope_to_rooms(queryset, user, column='room_id'):
+    return _in_rooms(queryset, column, user, await avisible_room_ids(user))
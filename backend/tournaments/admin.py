@@ -0,0 +1,35 @@
+# backend/tournaments/admin.py
+from django.contrib import admin
+from .models import Tournament, Team, Pool, Match, MatchResult
+
+
+@admin.register(Tournament)
+class TournamentAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'current_stage', 'start_date', 'end_date', 'created_by')
+    list_filter = ('status', 'current_stage')
+    search_fields = ('name',)
+
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ('name', 'tournament', 'matches_played', 'points', 'goals_for', 'goals_against')
+    list_filter = ('tournament',)
+    search_fields = ('name',)
+
+
+@admin.register(Pool)
+class PoolAdmin(admin.ModelAdmin):
+    list_display = ('name', 'tournament')
+    list_filter = ('tournament',)
+    filter_horizontal = ('teams',)
+
+
+@admin.register(Match)
+class MatchAdmin(admin.ModelAdmin):
+    list_display = ('team_home', 'team_away', 'tournament', 'stage', 'match_date', 'status')
+    list_filter = ('stage', 'status', 'tournament')
+
+
+@admin.register(MatchResult)
+class MatchResultAdmin(admin.ModelAdmin):
+    list_display = ('match', 'home_score', 'away_score', 'winner')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TournamentsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tournaments'
+
+    def ready(self):
+        # Register MatchResult / Match -> incremental standings updates
+        from . import signals  # noqa: F401
@@ -0,0 +1,277 @@
+# backend/tournaments/bracket.py
+"""
+Knockout stage: seeding, advancement and the cached bracket document.
+
+- seed_knockout() turns the final group tables into the first knockout
+  round (round of 16, quarter finals, semi finals or final, depending on
+  how many teams qualify). Seeds are placed so the best teams meet last.
+- advance_bracket() runs whenever a knockout match is completed: once both
+  matches feeding the same next-round slot have a winner, the next-round
+  match is created (semi final losers also get a third place match). A
+  corrected result re-pairs the next round as long as it is unplayed.
+- bracket_json() returns the whole tree as one pre-rendered JSON document,
+  cached until a match or result of that tournament changes.
+"""
+import datetime
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Match, MatchResult, Team, Tournament
+from .scheduling import FIRST_KICKOFF
+from .standings import pool_tables
+
+# Knockout stages in playing order, with the number of teams entering each
+KNOCKOUT_STAGES = ['round_of_16', 'quarter', 'semi', 'final']
+STAGE_TEAMS = {'round_of_16': 16, 'quarter': 8, 'semi': 4, 'final': 2}
+STAGE_NAMES = dict(Match.STAGE_CHOICES)
+
+BRACKET_CACHE_KEY = 'tournaments:bracket:{tournament_id}'
+BRACKET_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def bracket_order(size):
+    """
+    Seed indexes in bracket order: adjacent pairs play each other and the
+    top two seeds can only meet in the final. bracket_order(4) == [0, 3, 1, 2]
+    """
+    order = [0]
+    while len(order) < size:
+        count = len(order) * 2
+        order = [seed for top in order for seed in (top, count - 1 - top)]
+    return order
+
+
+def decide_winner(match, result):
+    """
+    Winner of a knockout match: regulation score, then extra time, then
+    penalties. Returns a team id, or None while the tie is unresolved.
+    """
+    for home, away in (
+        (result.home_score, result.away_score),
+        (result.home_score_et, result.away_score_et),
+        (result.home_score_pen, result.away_score_pen),
+    ):
+        if home is not None and away is not None and home != away:
+            return match.team_home_id if home > away else match.team_away_id
+    return None
+
+
+def _next_day(*dates):
+    return max(dates) + datetime.timedelta(days=1)
+
+
+def seed_knockout(tournament, per_pool=2):
+    """
+    Create the first knockout round from the group tables: the top
+    `per_pool` teams of every pool qualify, pool winners seeded ahead of
+    runners-up, each group ordered by points, goal difference, goals scored.
+    """
+    if tournament.current_stage != 'group':
+        raise serializers.ValidationError("The tournament is not in the group stage.")
+    if tournament.matches.filter(stage='group').exclude(status__in=['completed', 'cancelled']).exists():
+        raise serializers.ValidationError("All group matches must be completed first.")
+
+    tables = pool_tables(tournament)
+    seeds = []
+    for position in range(1, per_pool + 1):
+        rows = [row for table in tables for row in table['table'] if row['rank'] == position]
+        rows.sort(key=lambda row: (-row['points'], -row['goal_difference'], -row['goals_for'], row['team']['name']))
+        seeds.extend(row['team']['id'] for row in rows)
+
+    sizes = [size for size in STAGE_TEAMS.values() if size <= len(seeds)]
+    if not sizes:
+        raise serializers.ValidationError("At least two teams are needed for a knockout stage.")
+    size = max(sizes)
+    stage = next(stage for stage, teams in STAGE_TEAMS.items() if teams == size)
+    order = bracket_order(size)
+
+    last_match = tournament.matches.order_by('-match_date').values_list('match_date', flat=True).first()
+    if last_match is not None:
+        kickoff = _next_day(last_match)
+    else:
+        kickoff = timezone.make_aware(datetime.datetime.combine(tournament.start_date, FIRST_KICKOFF))
+
+    with transaction.atomic():
+        matches = Match.objects.bulk_create([
+            Match(
+                tournament=tournament,
+                team_home_id=seeds[order[2 * slot]],
+                team_away_id=seeds[order[2 * slot + 1]],
+                stage=stage,
+                bracket_slot=slot,
+                match_date=kickoff,
+            )
+            for slot in range(size // 2)
+        ])
+        tournament.current_stage = stage
+        tournament.save(update_fields=['current_stage', 'updated_at'])
+    invalidate_bracket(tournament.pk)
+    return matches
+
+
+def _place_next_match(tournament_id, stage, slot, team_ids, kickoff):
+    """
+    Create the match of a next-round slot, or re-pair it after a corrected
+    feeder result. A match already under way keeps its teams: a correction
+    that would change them is rejected.
+    """
+    home_id, away_id = team_ids
+    played = ExpressionWrapper(
+        Q(result__isnull=False) | ~Q(status='scheduled'), output_field=BooleanField(),
+    )
+    existing = (
+        Match.objects
+        .filter(tournament_id=tournament_id, stage=stage, bracket_slot=slot)
+        .annotate(played=played)
+        .values_list('team_home_id', 'team_away_id', 'played')
+        .first()
+    )
+    if existing is not None:
+        if existing[:2] == (home_id, away_id):
+            return
+        if existing[2]:
+            raise serializers.ValidationError(
+                f"The {STAGE_NAMES[stage].lower()} is already under way; its teams cannot change."
+            )
+    Match.objects.update_or_create(
+        tournament_id=tournament_id,
+        stage=stage,
+        bracket_slot=slot,
+        defaults={'team_home_id': home_id, 'team_away_id': away_id},
+        create_defaults={'team_home_id': home_id, 'team_away_id': away_id, 'match_date': kickoff},
+    )
+
+
+def advance_bracket(match):
+    """
+    Called when a knockout match is completed or its result corrected.
+    Creates (or re-pairs, while unplayed) the next-round match once both
+    feeder matches have a winner, and finishes the tournament after the
+    final.
+    """
+    if match.stage not in KNOCKOUT_STAGES or match.bracket_slot is None:
+        return
+    tournament = Tournament.objects.get(pk=match.tournament_id)
+
+    if match.stage == 'final':
+        decided = MatchResult.objects.filter(match_id=match.pk, winner__isnull=False).exists()
+        if decided and tournament.current_stage != 'finished':
+            tournament.current_stage = 'finished'
+            tournament.status = 'completed'
+            tournament.save(update_fields=['current_stage', 'status', 'updated_at'])
+        return
+
+    feeders = list(
+        Match.objects
+        .filter(
+            tournament_id=match.tournament_id,
+            stage=match.stage,
+            bracket_slot__in=[match.bracket_slot & ~1, match.bracket_slot | 1],
+            status='completed',
+            result__winner__isnull=False,
+        )
+        .order_by('bracket_slot')
+        .values_list('team_home_id', 'team_away_id', 'result__winner_id', 'match_date')
+    )
+    if len(feeders) < 2:
+        return
+
+    next_stage = KNOCKOUT_STAGES[KNOCKOUT_STAGES.index(match.stage) + 1]
+    next_slot = match.bracket_slot // 2
+    winners = [winner for _, _, winner, _ in feeders]
+    losers = [home if winner == away else away for home, away, winner, _ in feeders]
+    kickoff = _next_day(*[match_date for _, _, _, match_date in feeders])
+
+    with transaction.atomic():
+        _place_next_match(match.tournament_id, next_stage, next_slot, winners, kickoff)
+        if match.stage == 'semi':
+            _place_next_match(match.tournament_id, 'third_place', 0, losers, kickoff)
+        current = tournament.current_stage
+        if current in KNOCKOUT_STAGES and KNOCKOUT_STAGES.index(next_stage) > KNOCKOUT_STAGES.index(current):
+            tournament.current_stage = next_stage
+            tournament.save(update_fields=['current_stage', 'updated_at'])
+
+
+# -----------------------------------------------------------------------------
+# Bracket document
+# -----------------------------------------------------------------------------
+def _team(team_id, names):
+    if team_id is None:
+        return None
+    return {'id': team_id, 'name': names.get(team_id)}
+
+
+def build_bracket(tournament):
+    """The whole knockout tree, with empty slots for rounds not yet drawn."""
+    names = dict(Team.objects.filter(tournament=tournament).values_list('id', 'name'))
+    matches = {}
+    for match in (
+        Match.objects
+        .filter(tournament=tournament, bracket_slot__isnull=False)
+        .exclude(stage='group')
+        .select_related('result')
+    ):
+        result = getattr(match, 'result', None)
+        matches[(match.stage, match.bracket_slot)] = {
+            'id': match.pk,
+            'slot': match.bracket_slot,
+            'match_date': match.match_date,
+            'status': match.status,
+            'home': _team(match.team_home_id, names),
+            'away': _team(match.team_away_id, names),
+            'result': None if result is None else {
+                'home_score': result.home_score,
+                'away_score': result.away_score,
+                'home_score_et': result.home_score_et,
+                'away_score_et': result.away_score_et,
+                'home_score_pen': result.home_score_pen,
+                'away_score_pen': result.away_score_pen,
+            },
+            'winner': _team(result.winner_id, names) if result is not None else None,
+        }
+
+    first = next((stage for stage in KNOCKOUT_STAGES if any(s == stage for s, _ in matches)), None)
+    rounds = []
+    if first is not None:
+        for stage in KNOCKOUT_STAGES[KNOCKOUT_STAGES.index(first):]:
+            slots = STAGE_TEAMS[stage] // 2
+            rounds.append({
+                'stage': stage,
+                'name': STAGE_NAMES[stage],
+                'matches': [
+                    matches.get((stage, slot), {'id': None, 'slot': slot, 'home': None, 'away': None})
+                    for slot in range(slots)
+                ],
+            })
+    return {
+        'tournament': tournament.pk,
+        'current_stage': tournament.current_stage,
+        'rounds': rounds,
+        'third_place': matches.get(('third_place', 0)),
+    }
+
+
+def bracket_json(tournament):
+    """Pre-rendered bracket JSON (bytes), served from the cache when possible."""
+    key = BRACKET_CACHE_KEY.format(tournament_id=tournament.pk)
+    document = cache.get(key)
+    if document is None:
+        document = json.dumps(build_bracket(tournament), cls=DjangoJSONEncoder).encode('utf-8')
+        cache.set(key, document, BRACKET_CACHE_TIMEOUT)
+    return document
+
+
+def invalidate_bracket(tournament_id):
+    """
+    Drop the cached bracket now and again once the transaction commits, so a
+    request racing the write cannot re-cache the old tree.
+    """
+    key = BRACKET_CACHE_KEY.format(tournament_id=tournament_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
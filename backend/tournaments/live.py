@@ -0,0 +1,211 @@
+# backend/tournaments/live.py
+"""
+Live tournament scoreboard over Server-Sent Events.
+
+GET /api/tournaments/<id>/live/ keeps the connection open and pushes:
+
+    event: score      data: {"match": 12, "score": [2, 1], "status": "ongoing"}
+    event: standings  data: {"match": 12, "rows": [{team line}, {team line}]}
+
+`score` is sent whenever a MatchResult is saved, `standings` when a match
+is completed (with the refreshed lines of both teams).
+
+All spectators of a process share one fan-out (LiveHub): an event is
+encoded once and put on every subscriber's queue, so thousands of open
+connections cost one asyncio task each instead of a polling loop each.
+Score updates for the same match are coalesced to at most
+TOURNAMENT_LIVE_MAX_EVENTS_PER_SECOND per match; only the latest score of a
+burst is delivered. The rate-limit bookkeeping of a match is dropped once
+its completed score is sent, and that of a tournament when its last
+spectator leaves.
+
+The stream must be served by core.asgi.application (uvicorn, daphne, ...).
+The hub is per process: with several ASGI workers each one only sees the
+writes it handles itself, so a shared broker would be needed to fan out
+across processes.
+"""
+import asyncio
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, StreamingHttpResponse
+
+from .models import Team, Tournament
+from .standings import STAT_FIELDS
+
+KEEPALIVE_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def _encode(event, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f"event: {event}\ndata: {payload}\n\n".encode('utf-8')
+
+
+class LiveHub:
+    """In-process pub/sub of encoded SSE messages, keyed by tournament."""
+
+    def __init__(self):
+        self.loop = None
+        self.subscribers = {}
+        self.last_sent = {}  # (tournament id, coalesce key) -> monotonic time
+        self.pending = {}    # (tournament id, coalesce key) -> (message, last)
+        self.lock = threading.Lock()
+
+    @property
+    def min_interval(self):
+        rate = getattr(settings, 'TOURNAMENT_LIVE_MAX_EVENTS_PER_SECOND', 2)
+        return 1.0 / rate if rate else 0.0
+
+    # -- subscribers (event loop thread) --------------------------------------
+    def subscribe(self, tournament_id):
+        self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.lock:
+            self.subscribers.setdefault(tournament_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, tournament_id, queue):
+        with self.lock:
+            queues = self.subscribers.get(tournament_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self.subscribers[tournament_id]
+                    self._forget(tournament_id)
+
+    def _forget(self, tournament_id):
+        for state in (self.last_sent, self.pending):
+            for key in [key for key in state if key[0] == tournament_id]:
+                del state[key]
+
+    def has_subscribers(self, tournament_id):
+        return tournament_id in self.subscribers
+
+    # -- publishing (any thread) ----------------------------------------------
+    def publish(self, tournament_id, event, data, coalesce_key=None, last=False):
+        """
+        Queue an event for every spectator of a tournament. Events sharing a
+        coalesce_key are rate-limited, keeping only the most recent one;
+        `last` marks the final event of a key, after which its rate-limit
+        state is dropped. Cheap no-op when nobody is watching.
+        """
+        if self.loop is None or not self.has_subscribers(tournament_id):
+            return
+        message = _encode(event, data)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._dispatch(tournament_id, message, coalesce_key, last)
+        else:
+            self.loop.call_soon_threadsafe(self._dispatch, tournament_id, message, coalesce_key, last)
+
+    def _dispatch(self, tournament_id, message, coalesce_key, last=False):
+        if coalesce_key is None:
+            self._broadcast(tournament_id, message)
+            return
+        if not self.has_subscribers(tournament_id):
+            return  # the last spectator left in the meantime
+        key = (tournament_id, coalesce_key)
+        waiting = key in self.pending
+        self.pending[key] = (message, last)
+        if waiting:
+            return  # a flush is already scheduled; it will send the newest message
+        delay = self.last_sent.get(key, 0) + self.min_interval - time.monotonic()
+        if delay <= 0:
+            self._flush(key)
+        else:
+            self.loop.call_later(delay, self._flush, key)
+
+    def _flush(self, key):
+        message, last = self.pending.pop(key, (None, False))
+        if message is None:
+            return
+        if last:
+            self.last_sent.pop(key, None)
+        else:
+            self.last_sent[key] = time.monotonic()
+        self._broadcast(key[0], message)
+
+    def _broadcast(self, tournament_id, message):
+        with self.lock:
+            queues = list(self.subscribers.get(tournament_id, ()))
+        for queue in queues:
+            if queue.full():
+                # Slow client: drop its oldest event rather than block everyone
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+hub = LiveHub()
+
+
+# -----------------------------------------------------------------------------
+# Publishers used by tournaments/signals.py (run after the write commits)
+# -----------------------------------------------------------------------------
+def publish_score(match, result):
+    hub.publish(
+        match.tournament_id,
+        'score',
+        {'match': match.pk, 'score': [result.home_score, result.away_score], 'status': match.status},
+        coalesce_key=match.pk,
+        last=match.status == 'completed',
+    )
+
+
+def publish_standings(*matches):
+    """One `standings` event per match, reading all team lines in one query."""
+    matches = [match for match in matches if hub.has_subscribers(match.tournament_id)]
+    if not matches:
+        return
+    team_ids = {team_id for match in matches for team_id in (match.team_home_id, match.team_away_id)}
+    rows = {
+        row['id']: row
+        for row in Team.objects.filter(pk__in=team_ids).values('id', 'name', *STAT_FIELDS)
+    }
+    for match in matches:
+        hub.publish(match.tournament_id, 'standings', {
+            'match': match.pk,
+            'rows': [rows[team_id] for team_id in (match.team_home_id, match.team_away_id) if team_id in rows],
+        })
+
+
+# -----------------------------------------------------------------------------
+# View
+# -----------------------------------------------------------------------------
+async def _event_stream(tournament_id):
+    # Subscribed when the server starts streaming, not when the view
+    # returns: a response that is never iterated leaves no queue behind.
+    queue = hub.subscribe(tournament_id)
+    try:
+        yield b": connected\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield message
+    finally:
+        hub.unsubscribe(tournament_id, queue)
+
+
+async def tournament_live(request, pk):
+    """
+    Server-Sent Events feed of score and standings changes for a tournament.
+    GET /api/tournaments/<id>/live/ (public, like the tournament itself)
+    """
+    exists = await sync_to_async(Tournament.objects.filter(pk=pk).exists)()
+    if not exists:
+        raise Http404("Tournament not found.")
+
+    response = StreamingHttpResponse(_event_stream(pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
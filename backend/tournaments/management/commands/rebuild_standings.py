@@ -0,0 +1,31 @@
+# backend/tournaments/management/commands/rebuild_standings.py
+"""
+Management command to recompute team standings from scratch.
+Standings are normally maintained incrementally; use this after bulk
+data fixes or imports that bypassed the model signals.
+Usage:
+    python manage.py rebuild_standings
+    python manage.py rebuild_standings --tournament 3
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from tournaments.models import Tournament
+from tournaments.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = 'Recompute team standings from all completed group-stage results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tournament', type=int, help='Only rebuild this tournament')
+
+    def handle(self, *args, **options):
+        tournament = None
+        if options['tournament'] is not None:
+            try:
+                tournament = Tournament.objects.get(pk=options['tournament'])
+            except Tournament.DoesNotExist:
+                raise CommandError(f'Tournament {options["tournament"]} does not exist')
+
+        updated = rebuild_standings(tournament)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt standings for {updated} teams'))
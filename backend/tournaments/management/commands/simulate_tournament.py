@@ -0,0 +1,44 @@
+# backend/tournaments/management/commands/simulate_tournament.py
+"""
+Management command to run the Monte Carlo outcome simulation for a tournament.
+Usage:
+    python manage.py simulate_tournament 3
+    python manage.py simulate_tournament 3 --runs 500000 --seed 42
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from tournaments.models import Tournament
+
+
+class Command(BaseCommand):
+    help = 'Simulate the rest of a tournament and print qualification / title probabilities'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament', type=int, help='Tournament id')
+        parser.add_argument('--runs', type=int, default=None, help='Number of simulated tournaments')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed (disables the cache)')
+
+    def handle(self, *args, **options):
+        from tournaments.simulation import DEFAULT_RUNS, MAX_RUNS, simulate_tournament
+
+        runs = options['runs'] or DEFAULT_RUNS
+        if not 1 <= runs <= MAX_RUNS:
+            raise CommandError(f'--runs must be between 1 and {MAX_RUNS}')
+        try:
+            tournament = Tournament.objects.get(pk=options['tournament'])
+        except Tournament.DoesNotExist:
+            raise CommandError(f'Tournament {options["tournament"]} does not exist')
+
+        started = time.perf_counter()
+        result = simulate_tournament(tournament, runs=runs, seed=options['seed'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f'{"Team":<30} {"Qualify":>8} {"Final":>8} {"Title":>8}')
+        for row in result['teams']:
+            self.stdout.write(
+                f'{row["team"]["name"]:<30} {row["qualify"]:>8.2%} '
+                f'{row["reach"]["final"]:>8.2%} {row["title"]:>8.2%}'
+            )
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(f'{runs} runs in {elapsed:.2f}s'))
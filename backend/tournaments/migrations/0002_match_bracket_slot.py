@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='bracket_slot',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Position within a knockout stage; slots 2n and 2n+1 feed slot n of the next stage', null=True),
+        ),
+    ]
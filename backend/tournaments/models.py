@@ -0,0 +1,179 @@
+# backend/tournaments/models.py
+from django.db import models
+from django.conf import settings
+
+
+class Tournament(models.Model):
+    STATUS_CHOICES = [
+        ('upcoming', 'Upcoming'),
+        ('ongoing', 'Ongoing'),
+        ('completed', 'Completed'),
+    ]
+    STAGE_CHOICES = [
+        ('registration', 'Registration'),
+        ('group', 'Group Stage'),
+        ('round_of_16', 'Round of 16'),
+        ('quarter', 'Quarter Finals'),
+        ('semi', 'Semi Finals'),
+        ('final', 'Final'),
+        ('finished', 'Finished'),
+    ]
+
+    name = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='upcoming')
+    current_stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default='registration')
+    max_teams = models.IntegerField(default=16)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='tournaments_created',
+        on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.name
+
+
+class Team(models.Model):
+    tournament = models.ForeignKey(Tournament, related_name='teams', on_delete=models.CASCADE)
+    name = models.CharField(max_length=200)
+    logo_url = models.URLField(blank=True, null=True)
+    description = models.TextField(blank=True)
+    members = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='tournament_teams', blank=True)
+    registration_date = models.DateTimeField(auto_now_add=True)
+
+    # Standings
+    matches_played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    draws = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    goals_for = models.IntegerField(default=0)
+    goals_against = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-points', '-goals_for']
+        unique_together = ('tournament', 'name')
+
+    def __str__(self):
+        return self.name
+
+
+class Pool(models.Model):
+    """
+    A group-stage pool. Every team in a pool plays every other team once.
+    """
+    tournament = models.ForeignKey(Tournament, related_name='pools', on_delete=models.CASCADE)
+    name = models.CharField(max_length=50)
+    teams = models.ManyToManyField(Team, related_name='pools')
+
+    class Meta:
+        ordering = ['name']
+        unique_together = ('tournament', 'name')
+
+    def __str__(self):
+        return f"{self.tournament.name} - {self.name}"
+
+
+class Match(models.Model):
+    STAGE_CHOICES = [
+        ('group', 'Group Stage'),
+        ('round_of_16', 'Round of 16'),
+        ('quarter', 'Quarter Final'),
+        ('semi', 'Semi Final'),
+        ('third_place', 'Third Place'),
+        ('final', 'Final'),
+    ]
+    STATUS_CHOICES = [
+        ('scheduled', 'Scheduled'),
+        ('ongoing', 'Ongoing'),
+        ('completed', 'Completed'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    tournament = models.ForeignKey(Tournament, related_name='matches', on_delete=models.CASCADE)
+    pool = models.ForeignKey(
+        Pool,
+        related_name='matches',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    team_home = models.ForeignKey(Team, related_name='home_matches', on_delete=models.CASCADE)
+    team_away = models.ForeignKey(Team, related_name='away_matches', on_delete=models.CASCADE)
+    stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default='group')
+    match_date = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='scheduled')
+    bracket_slot = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="Position within a knockout stage; slots 2n and 2n+1 feed slot n of the next stage"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['match_date']
+        verbose_name_plural = 'Matches'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the loaded status so the standings signals can tell when a
+        # match enters or leaves 'completed' without re-fetching it.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def __str__(self):
+        return f"{self.team_home.name} vs {self.team_away.name} ({self.get_stage_display()})"
+
+
+# Result fields a knockout winner is decided from
+DECISION_FIELDS = (
+    'home_score', 'away_score', 'home_score_et', 'away_score_et', 'home_score_pen', 'away_score_pen',
+)
+
+
+class MatchResult(models.Model):
+    match = models.OneToOneField(Match, related_name='result', on_delete=models.CASCADE)
+    home_score = models.IntegerField(default=0)
+    away_score = models.IntegerField(default=0)
+    home_score_et = models.IntegerField(null=True, blank=True, help_text="Extra time score")
+    away_score_et = models.IntegerField(null=True, blank=True, help_text="Extra time score")
+    home_score_pen = models.IntegerField(null=True, blank=True, help_text="Penalty shootout score")
+    away_score_pen = models.IntegerField(null=True, blank=True, help_text="Penalty shootout score")
+    winner = models.ForeignKey(
+        Team,
+        related_name='matches_won',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the loaded scores so edits can be applied to the standings
+        # as a delta, and the knockout winner recomputed, without re-fetching
+        # the old row.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_scores = (
+            instance.__dict__.get('home_score'),
+            instance.__dict__.get('away_score'),
+        )
+        instance._loaded_decision = (
+            *(instance.__dict__.get(name) for name in DECISION_FIELDS),
+            instance.__dict__.get('winner_id'),
+        )
+        return instance
+
+    def __str__(self):
+        return f"{self.match}: {self.home_score}-{self.away_score}"
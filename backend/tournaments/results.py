@@ -0,0 +1,120 @@
+# backend/tournaments/results.py
+"""
+Batch ingestion of match results.
+
+Used by POST /api/tournaments/<id>/results/bulk/. A whole round of results
+is written in one transaction with a fixed number of queries:
+
+- one IN query for the referenced matches (with their teams and any
+  existing result), which also validates winners against the match teams
+- bulk_create for new results, bulk_update for existing ones
+- one bulk_update for Match.status
+- standings rebuilt once for the tournament, the bracket advanced once per
+  next-round slot and the cached bracket dropped once
+
+Bulk writes bypass the per-row signals in tournaments/signals.py, which is
+the point: the work they would do per match is done here per batch.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .bracket import KNOCKOUT_STAGES, advance_bracket, decide_winner, invalidate_bracket
+from .live import publish_score, publish_standings
+from .models import Match, MatchResult
+from .standings import counts_towards_standings, rebuild_standings
+
+RESULT_FIELDS = (
+    'home_score', 'away_score', 'home_score_et', 'away_score_et',
+    'home_score_pen', 'away_score_pen', 'winner_id',
+)
+
+
+def ingest_results(tournament, items):
+    """
+    Upsert validated BulkMatchResultSerializer items for `tournament`.
+    Raises ValidationError (nothing written) for unknown matches or winners
+    that did not play the match.
+    Returns {'created': [match ids], 'updated': [match ids]}.
+    """
+    match_ids = [item['match'] for item in items]
+    matches = {
+        match.pk: match
+        for match in (
+            Match.objects
+            .filter(tournament=tournament, pk__in=match_ids)
+            .select_related('result')
+        )
+    }
+
+    errors = {}
+    for index, item in enumerate(items):
+        match = matches.get(item['match'])
+        if match is None:
+            errors[index] = {'match': [f'Invalid pk "{item["match"]}" - object does not exist.']}
+        elif item.get('winner') is not None and item['winner'] not in (match.team_home_id, match.team_away_id):
+            errors[index] = {'winner': ["The winner must be one of the two teams of the match."]}
+    if errors:
+        raise serializers.ValidationError({'results': errors})
+
+    now = timezone.now()
+    created, updated, changed_matches = [], [], []
+    for item in items:
+        match = matches[item['match']]
+        result = getattr(match, 'result', None)
+        if result is None:
+            result = MatchResult(match=match)
+            created.append(result)
+        else:
+            updated.append(result)
+        for field in RESULT_FIELDS:
+            key = 'winner' if field == 'winner_id' else field
+            if key in item:
+                setattr(result, field, item[key])
+        if match.stage != 'group' and item.get('winner') is None:
+            result.winner_id = decide_winner(match, result)
+        result.updated_at = now
+
+        new_status = item.get('status', 'completed')
+        if new_status != match.status:
+            match.status = new_status
+            match.updated_at = now
+            changed_matches.append(match)
+
+    counted = [m for m in matches.values() if counts_towards_standings(m.stage, m.status)]
+    affects_standings = bool(counted) or any(
+        counts_towards_standings(m.stage, m._loaded_status) for m in changed_matches
+    )
+
+    with transaction.atomic():
+        MatchResult.objects.bulk_create(created)
+        MatchResult.objects.bulk_update(updated, [*RESULT_FIELDS, 'updated_at'])
+        Match.objects.bulk_update(changed_matches, ['status', 'updated_at'])
+        if affects_standings:
+            rebuild_standings(tournament)
+
+        # One advancement per next-round slot: advance_bracket() looks at
+        # both feeder matches, so calling it for either one is enough.
+        advanced = set()
+        for match in matches.values():
+            if match.stage not in KNOCKOUT_STAGES or match.bracket_slot is None or match.status != 'completed':
+                continue
+            key = (match.stage, match.bracket_slot // 2)
+            if key not in advanced:
+                advanced.add(key)
+                advance_bracket(match)
+        invalidate_bracket(tournament.pk)
+
+        def publish():
+            for result in created + updated:
+                publish_score(result.match, result)
+            publish_standings(*counted)
+
+        transaction.on_commit(publish)
+
+    for match in changed_matches:
+        match._loaded_status = match.status
+    return {
+        'created': [result.match_id for result in created],
+        'updated': [result.match_id for result in updated],
+    }
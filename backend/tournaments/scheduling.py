@@ -0,0 +1,144 @@
+# backend/tournaments/scheduling.py
+"""
+Group-stage fixture generation.
+
+Every pool gets a single round robin built with the circle method: one team
+stays fixed while the others rotate, giving n-1 rounds in which every team
+plays at most once. Round k of every pool is played in the same time slot,
+and the slots are spread evenly across the tournament's start/end dates.
+All matches are written with a single bulk_create.
+"""
+import datetime
+import math
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Match, MatchResult, Pool
+
+# Kick-off of the first match of a day, and spacing between slots on
+# days that have to host more than one round.
+FIRST_KICKOFF = datetime.time(12, 0)
+SLOT_LENGTH = datetime.timedelta(hours=2)
+
+
+def round_robin_rounds(team_ids):
+    """
+    Return a list of rounds, each a list of (home, away) pairs, in which
+    every team meets every other team exactly once (circle method).
+    With an odd number of teams one team rests each round.
+    """
+    teams = list(team_ids)
+    if len(teams) < 2:
+        return []
+    if len(teams) % 2:
+        teams.append(None)  # bye
+
+    n = len(teams)
+    rounds = []
+    for round_index in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is None or away is None:
+                continue
+            # Alternate home advantage from one round to the next
+            if round_index % 2:
+                home, away = away, home
+            pairs.append((home, away))
+        rounds.append(pairs)
+        # Keep the first team fixed and rotate everyone else one place
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def slot_datetimes(start_date, end_date, slot_count):
+    """
+    Spread `slot_count` consecutive slots over the days between start_date
+    and end_date (inclusive). When there are more slots than days, a day
+    hosts several slots, SLOT_LENGTH apart.
+    """
+    days = max((end_date - start_date).days + 1, 1)
+    per_day = max(math.ceil(slot_count / days), 1)
+    slots = []
+    for slot in range(slot_count):
+        if per_day == 1:
+            day, position = slot * days // slot_count, 0
+        else:
+            day, position = divmod(slot, per_day)
+        kickoff = datetime.datetime.combine(start_date + datetime.timedelta(days=day), FIRST_KICKOFF)
+        slots.append(timezone.make_aware(kickoff + position * SLOT_LENGTH))
+    return slots
+
+
+def generate_group_fixtures(tournament, replace=False):
+    """
+    Create round-robin group matches for every pool of `tournament` that has
+    none yet (or for all pools when `replace` is True, after deleting the
+    existing group matches). Returns the list of created matches.
+    Replacing is refused once any group match has a result.
+    """
+    with transaction.atomic():
+        if replace:
+            if MatchResult.objects.filter(match__tournament=tournament, match__stage='group').exists():
+                raise serializers.ValidationError(
+                    {'replace': "Group matches already have results and cannot be replaced."}
+                )
+            tournament.matches.filter(stage='group').delete()
+
+        already_scheduled = set(
+            tournament.matches
+            .filter(stage='group', pool__isnull=False)
+            .values_list('pool_id', flat=True)
+        )
+        pool_teams = {}
+        memberships = (
+            Pool.teams.through.objects
+            .filter(pool__tournament=tournament)
+            .order_by('pool__name', 'team_id')
+            .values_list('pool_id', 'team_id')
+        )
+        for pool_id, team_id in memberships:
+            if pool_id not in already_scheduled:
+                pool_teams.setdefault(pool_id, []).append(team_id)
+
+        # Round k of every pool shares slot k. A team that (unusually) sits
+        # in several pools is pushed to its next free slot instead.
+        busy = {}
+        fixtures = []
+        for pool_id, team_ids in pool_teams.items():
+            for round_index, pairs in enumerate(round_robin_rounds(team_ids)):
+                for home, away in pairs:
+                    slot = round_index
+                    while slot in busy.get(home, ()) or slot in busy.get(away, ()):
+                        slot += 1
+                    busy.setdefault(home, set()).add(slot)
+                    busy.setdefault(away, set()).add(slot)
+                    fixtures.append((slot, pool_id, home, away))
+
+        if not fixtures:
+            return []
+
+        slots = slot_datetimes(
+            tournament.start_date,
+            tournament.end_date,
+            max(slot for slot, _, _, _ in fixtures) + 1,
+        )
+        matches = Match.objects.bulk_create([
+            Match(
+                tournament=tournament,
+                pool_id=pool_id,
+                team_home_id=home,
+                team_away_id=away,
+                stage='group',
+                match_date=slots[slot],
+            )
+            for slot, pool_id, home, away in sorted(fixtures)
+        ])
+
+        if tournament.current_stage == 'registration':
+            tournament.current_stage = 'group'
+            tournament.save(update_fields=['current_stage', 'updated_at'])
+
+    return matches
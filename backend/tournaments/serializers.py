@@ -0,0 +1,133 @@
+# backend/tournaments/serializers.py
+from rest_framework import serializers
+from .models import Tournament, Team, Pool, Match, MatchResult
+from users.models import User
+
+
+class UserSimpleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'username')
+
+
+class TeamSerializer(serializers.ModelSerializer):
+    members = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), many=True, required=False
+    )
+
+    class Meta:
+        model = Team
+        fields = (
+            'id', 'tournament', 'name', 'logo_url', 'description', 'members',
+            'registration_date', 'matches_played', 'wins', 'draws', 'losses',
+            'goals_for', 'goals_against', 'points',
+        )
+        read_only_fields = (
+            'registration_date', 'matches_played', 'wins', 'draws', 'losses',
+            'goals_for', 'goals_against', 'points',
+        )
+
+    def validate(self, attrs):
+        tournament = attrs.get('tournament')
+        if self.instance is None and tournament is not None:
+            if tournament.teams.count() >= tournament.max_teams:
+                raise serializers.ValidationError(
+                    {'tournament': f"Tournament is full ({tournament.max_teams} teams)."}
+                )
+        return attrs
+
+
+class PoolSerializer(serializers.ModelSerializer):
+    teams = serializers.PrimaryKeyRelatedField(
+        queryset=Team.objects.all(), many=True, required=False
+    )
+
+    class Meta:
+        model = Pool
+        fields = ('id', 'tournament', 'name', 'teams')
+
+    def validate(self, attrs):
+        tournament = attrs.get('tournament') or getattr(self.instance, 'tournament', None)
+        foreign = [team.name for team in attrs.get('teams', []) if team.tournament_id != tournament.pk]
+        if foreign:
+            raise serializers.ValidationError(
+                {'teams': [f"Team '{name}' is not registered in this tournament." for name in foreign]}
+            )
+        return attrs
+
+
+class MatchResultSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MatchResult
+        fields = (
+            'id', 'match', 'home_score', 'away_score',
+            'home_score_et', 'away_score_et', 'home_score_pen', 'away_score_pen',
+            'winner', 'created_at', 'updated_at',
+        )
+        read_only_fields = ('created_at', 'updated_at')
+
+
+class BulkMatchResultItemSerializer(serializers.Serializer):
+    match = serializers.IntegerField()
+    home_score = serializers.IntegerField(min_value=0)
+    away_score = serializers.IntegerField(min_value=0)
+    home_score_et = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    away_score_et = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    home_score_pen = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    away_score_pen = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    winner = serializers.IntegerField(required=False, allow_null=True)
+    status = serializers.ChoiceField(choices=Match.STATUS_CHOICES, default='completed')
+
+
+class BulkMatchResultSerializer(serializers.Serializer):
+    results = serializers.ListField(child=BulkMatchResultItemSerializer(), allow_empty=False)
+
+    MAX_ITEMS = 500
+
+    def validate_results(self, value):
+        if len(value) > self.MAX_ITEMS:
+            raise serializers.ValidationError(f"At most {self.MAX_ITEMS} results per request.")
+        match_ids = [item['match'] for item in value]
+        if len(match_ids) != len(set(match_ids)):
+            raise serializers.ValidationError("Each match may only appear once per request.")
+        return value
+
+
+class MatchSerializer(serializers.ModelSerializer):
+    result = MatchResultSerializer(read_only=True)
+
+    class Meta:
+        model = Match
+        fields = (
+            'id', 'tournament', 'pool', 'team_home', 'team_away', 'stage',
+            'match_date', 'status', 'result', 'created_at', 'updated_at',
+        )
+        read_only_fields = ('created_at', 'updated_at')
+
+    def validate(self, attrs):
+        home = attrs.get('team_home') or getattr(self.instance, 'team_home', None)
+        away = attrs.get('team_away') or getattr(self.instance, 'team_away', None)
+        if home is not None and home == away:
+            raise serializers.ValidationError({'team_away': "A team cannot play itself."})
+        return attrs
+
+
+class TournamentSerializer(serializers.ModelSerializer):
+    created_by = UserSimpleSerializer(read_only=True)
+    team_count = serializers.IntegerField(source='teams.count', read_only=True)
+
+    class Meta:
+        model = Tournament
+        fields = (
+            'id', 'name', 'description', 'start_date', 'end_date', 'status',
+            'current_stage', 'max_teams', 'created_by', 'team_count',
+            'created_at', 'updated_at',
+        )
+        read_only_fields = ('created_at', 'updated_at')
+
+    def validate(self, attrs):
+        start = attrs.get('start_date') or getattr(self.instance, 'start_date', None)
+        end = attrs.get('end_date') or getattr(self.instance, 'end_date', None)
+        if start and end and end < start:
+            raise serializers.ValidationError({'end_date': "End date must be on or after the start date."})
+        return attrs
@@ -0,0 +1,122 @@
+# backend/tournaments/signals.py
+"""
+Keep Team standings and the knockout bracket up to date incrementally.
+
+- MatchResult created / edited / deleted -> signed delta for both teams
+- Match entering / leaving 'completed'    -> add / remove its result
+- Knockout match completed               -> create the next-round match
+- Any match / result change               -> drop the cached bracket
+- Result saved / standings changed        -> live feed events (after commit)
+
+Old values come from what was loaded from the database (see from_db on
+Match and MatchResult), so no extra query is needed to diff an edit.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .bracket import advance_bracket, decide_winner, invalidate_bracket
+from .live import publish_score, publish_standings
+from .models import DECISION_FIELDS, Match, MatchResult
+from .standings import apply_result_change, counts_towards_standings
+
+
+def decision_scores(result):
+    return tuple(getattr(result, name) for name in DECISION_FIELDS)
+
+
+def _counted_match(match_id):
+    """The match (team ids only) if its result counts towards the standings."""
+    match = (
+        Match.objects
+        .filter(pk=match_id)
+        .values('team_home_id', 'team_away_id', 'stage', 'status')
+        .first()
+    )
+    if match is None or not counts_towards_standings(match['stage'], match['status']):
+        return None
+    return Match(team_home_id=match['team_home_id'], team_away_id=match['team_away_id'])
+
+
+@receiver(pre_save, sender=MatchResult)
+def set_knockout_winner(sender, instance, raw=False, **kwargs):
+    """
+    Knockout results get their winner from score, extra time or penalties,
+    recomputed (or cleared) whenever those change, unless the save sets the
+    winner itself.
+    """
+    if raw or instance.match.stage == 'group':
+        return
+    loaded = getattr(instance, '_loaded_decision', None)
+    if loaded is None:
+        if instance.winner_id is None:
+            instance.winner_id = decide_winner(instance.match, instance)
+        return
+    *scores, winner_id = loaded
+    if instance.winner_id == winner_id and decision_scores(instance) != tuple(scores):
+        instance.winner_id = decide_winner(instance.match, instance)
+
+
+@receiver(post_save, sender=MatchResult)
+def apply_saved_result(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    match = instance.match
+    invalidate_bracket(match.tournament_id)
+    if match.status == 'completed':
+        advance_bracket(match)
+    old_scores = None if created else getattr(instance, '_loaded_scores', None)
+    new_scores = (instance.home_score, instance.away_score)
+    instance._loaded_scores = new_scores
+    instance._loaded_decision = (*decision_scores(instance), instance.winner_id)
+    if old_scores == new_scores:
+        return
+    transaction.on_commit(lambda: publish_score(match, instance))
+    counted = _counted_match(instance.match_id)
+    if counted is not None:
+        apply_result_change(counted, old_scores=old_scores, new_scores=new_scores)
+        transaction.on_commit(lambda: publish_standings(match))
+
+
+@receiver(post_delete, sender=MatchResult)
+def revert_deleted_result(sender, instance, **kwargs):
+    tournament_id = Match.objects.filter(pk=instance.match_id).values_list('tournament_id', flat=True).first()
+    if tournament_id is not None:
+        invalidate_bracket(tournament_id)
+    scores = getattr(instance, '_loaded_scores', None) or (instance.home_score, instance.away_score)
+    match = _counted_match(instance.match_id)
+    if match is not None:
+        apply_result_change(match, old_scores=scores)
+
+
+@receiver(post_save, sender=Match)
+def apply_match_status(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_bracket(instance.tournament_id)
+    old_status = None if created else getattr(instance, '_loaded_status', None)
+    instance._loaded_status = instance.status
+    if instance.status == 'completed' and old_status != 'completed':
+        advance_bracket(instance)
+    counted_before = counts_towards_standings(instance.stage, old_status)
+    counted_now = counts_towards_standings(instance.stage, instance.status)
+    if counted_before == counted_now:
+        return
+    result = (
+        MatchResult.objects
+        .filter(match_id=instance.pk)
+        .values_list('home_score', 'away_score')
+        .first()
+    )
+    if result is None:
+        return
+    if counted_now:
+        apply_result_change(instance, new_scores=result)
+    else:
+        apply_result_change(instance, old_scores=result)
+    transaction.on_commit(lambda: publish_standings(instance))
+
+
+@receiver(post_delete, sender=Match)
+def drop_deleted_match(sender, instance, **kwargs):
+    invalidate_bracket(instance.tournament_id)
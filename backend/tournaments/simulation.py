@@ -0,0 +1,286 @@
+# backend/tournaments/simulation.py
+"""
+Monte Carlo tournament outcome simulator.
+
+Plays out the rest of a tournament many times (100k+ runs) from its current
+state and reports, per team, the probability of qualifying for the knockout
+stage, reaching each knockout round and winning the title.
+
+Scores are drawn from Poisson distributions whose rates come from each
+team's goals_for / goals_against per match (shrunk towards the tournament
+average so teams with few matches are not extreme). Everything is done with
+NumPy arrays of shape (runs, matches) / (runs, teams): each group fixture and
+each knockout round is simulated for all runs at once, never match by match
+in Python. Runs are processed in batches to keep memory bounded.
+
+A bracket slot without a team (a cancelled or not yet drawn first-round
+match) is a bye: the team on the other side of it goes through unplayed.
+
+Simplifications: group ties the simulation cannot separate on points, goal
+difference and goals scored are broken at random rather than head-to-head,
+and a knockout draw goes to extra time (a third of the normal scoring rate)
+and then to a 50/50 penalty shootout.
+
+Requires NumPy.
+"""
+import hashlib
+import json
+
+import numpy as np
+from django.core.cache import cache
+
+from .bracket import KNOCKOUT_STAGES, STAGE_TEAMS, bracket_order
+from .models import Match, Pool, Team
+
+DEFAULT_RUNS = 100_000
+MAX_RUNS = 1_000_000
+# Requested run counts are rounded up to one of these, so the cache holds at
+# most len(RUN_SIZES) documents per tournament state
+RUN_SIZES = (10_000, 50_000, 100_000, 500_000, MAX_RUNS)
+ANONYMOUS_MAX_RUNS = 50_000
+BATCH_SIZE = 10_000
+
+# Pseudo-matches at the tournament average added to every team's record
+PRIOR_MATCHES = 2
+# Goals per team per match assumed before any match has been played
+DEFAULT_GOAL_RATE = 1.35
+EXTRA_TIME_FACTOR = 1 / 3
+
+SIMULATION_CACHE_KEY = 'tournaments:simulation:{tournament_id}:{state}'
+SIMULATION_CACHE_TIMEOUT = 60 * 60
+
+
+def load_state(tournament):
+    """Everything the simulation depends on, as plain (hashable) data."""
+    teams = list(
+        Team.objects
+        .filter(tournament=tournament)
+        .order_by('pk')
+        .values('id', 'name', 'matches_played', 'goals_for', 'goals_against', 'points')
+    )
+    pools = list(
+        Pool.teams.through.objects
+        .filter(pool__tournament=tournament)
+        .order_by('pool__name', 'team_id')
+        .values_list('pool_id', 'team_id')
+    )
+    matches = list(
+        Match.objects
+        .filter(tournament=tournament)
+        .exclude(status='cancelled')
+        .order_by('pk')
+        .values_list('stage', 'status', 'bracket_slot', 'team_home_id', 'team_away_id', 'result__winner_id')
+    )
+    return {'teams': teams, 'pools': pools, 'matches': matches}
+
+
+def run_size(requested, max_runs=MAX_RUNS):
+    """The smallest of RUN_SIZES covering `requested`, at most `max_runs`."""
+    return min(next(size for size in RUN_SIZES if size >= min(requested, MAX_RUNS)), max_runs)
+
+
+def team_counts(teams, team_count):
+    """Occurrences of every team index in an array, ignoring empty slots (-1)."""
+    return np.bincount(teams[teams >= 0], minlength=team_count)
+
+
+def state_hash(state, runs, per_pool):
+    payload = json.dumps([state, runs, per_pool], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class TournamentSimulator:
+    """Vectorised simulation of one tournament state."""
+
+    def __init__(self, state, per_pool=2, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.per_pool = per_pool
+        self.teams = state['teams']
+        self.index = {team['id']: i for i, team in enumerate(self.teams)}
+        team_count = len(self.teams)
+
+        played = np.array([t['matches_played'] for t in self.teams], dtype=float)
+        scored = np.array([t['goals_for'] for t in self.teams], dtype=float)
+        conceded = np.array([t['goals_against'] for t in self.teams], dtype=float)
+        self.base_points = np.array([t['points'] for t in self.teams], dtype=np.int64)
+        self.base_gd = (scored - conceded).astype(np.int64)
+        self.base_gf = scored.astype(np.int64)
+
+        average = scored.sum() / played.sum() if played.sum() else DEFAULT_GOAL_RATE
+        average = average or DEFAULT_GOAL_RATE
+        self.average = average
+        self.attack = (scored + PRIOR_MATCHES * average) / (played + PRIOR_MATCHES) / average
+        self.defence = (conceded + PRIOR_MATCHES * average) / (played + PRIOR_MATCHES) / average
+
+        self.pools = {}
+        for pool_id, team_id in state['pools']:
+            self.pools.setdefault(pool_id, []).append(self.index[team_id])
+        self.pools = [np.array(members) for members in self.pools.values()]
+
+        # Remaining group fixtures as home/away incidence matrices (matches x teams)
+        remaining = [
+            (self.index[home], self.index[away])
+            for stage, status, _, home, away, _ in state['matches']
+            if stage == 'group' and status != 'completed'
+        ]
+        self.group_home = np.array([home for home, _ in remaining], dtype=np.int64)
+        self.group_away = np.array([away for _, away in remaining], dtype=np.int64)
+        self.home_incidence = np.zeros((len(remaining), team_count), dtype=np.int64)
+        self.away_incidence = np.zeros((len(remaining), team_count), dtype=np.int64)
+        self.home_incidence[np.arange(len(remaining)), self.group_home] = 1
+        self.away_incidence[np.arange(len(remaining)), self.group_away] = 1
+
+        # Knockout bracket already drawn: first-round slots and decided matches
+        knockout = [m for m in state['matches'] if m[0] in KNOCKOUT_STAGES and m[2] is not None]
+        self.first_stage = min((m[0] for m in knockout), key=KNOCKOUT_STAGES.index, default=None)
+        self.drawn_bracket = None
+        self.decided = {}
+        if self.first_stage is not None:
+            size = STAGE_TEAMS[self.first_stage]
+            bracket = np.full(size, -1, dtype=np.int64)
+            for stage, status, slot, home, away, winner in knockout:
+                if stage == self.first_stage:
+                    bracket[2 * slot], bracket[2 * slot + 1] = self.index[home], self.index[away]
+                if status == 'completed' and winner is not None:
+                    self.decided[(stage, slot)] = self.index[winner]
+            self.drawn_bracket = bracket
+
+    # -------------------------------------------------------------------------
+    def rates(self, home, away):
+        """Poisson scoring rates for arrays of home / away team indexes."""
+        return (
+            self.average * self.attack[home] * self.defence[away],
+            self.average * self.attack[away] * self.defence[home],
+        )
+
+    def play_group(self, runs):
+        """Final (points, goal difference, goals for) per run and team."""
+        lam_home, lam_away = self.rates(self.group_home, self.group_away)
+        home_goals = self.rng.poisson(lam_home, size=(runs, len(lam_home)))
+        away_goals = self.rng.poisson(lam_away, size=(runs, len(lam_away)))
+        home_points = 3 * (home_goals > away_goals) + (home_goals == away_goals)
+        away_points = 3 * (away_goals > home_goals) + (home_goals == away_goals)
+
+        points = self.base_points + home_points @ self.home_incidence + away_points @ self.away_incidence
+        diff = home_goals - away_goals
+        gd = self.base_gd + diff @ self.home_incidence - diff @ self.away_incidence
+        gf = self.base_gf + home_goals @ self.home_incidence + away_goals @ self.away_incidence
+        return points, gd, gf
+
+    def draw_bracket(self, points, gd, gf):
+        """
+        Seed the knockout bracket for every run, like seed_knockout(): top
+        `per_pool` of each pool, winners ahead of runners-up. Returns the
+        (runs, bracket size) array of team indexes and the qualified mask.
+        """
+        noise = self.rng.random(points.shape)
+        key = points * 1e8 + (gd + 10_000) * 1e4 + gf + noise
+
+        ranked = [
+            members[np.argsort(-key[:, members], axis=1)]
+            for members in self.pools
+        ]
+        seeds = []
+        for position in range(self.per_pool):
+            columns = [pool[:, position] for pool in ranked if position < pool.shape[1]]
+            if not columns:
+                continue
+            teams = np.stack(columns, axis=1)
+            keys = np.take_along_axis(key, teams, axis=1)
+            order = np.argsort(-keys, axis=1)
+            seeds.append(np.take_along_axis(teams, order, axis=1))
+
+        qualified = np.zeros(points.shape, dtype=bool)
+        if not seeds:
+            return None, qualified
+        seeds = np.concatenate(seeds, axis=1)
+        sizes = [size for size in STAGE_TEAMS.values() if size <= seeds.shape[1]]
+        if not sizes:
+            return None, qualified
+        size = max(sizes)
+        bracket = seeds[:, bracket_order(size)]
+        np.put_along_axis(qualified, bracket, True, axis=1)
+        return bracket, qualified
+
+    def play_knockout(self, bracket, reach, titles):
+        """Play every knockout round for all runs, counting who gets where."""
+        stage = next(s for s in KNOCKOUT_STAGES if STAGE_TEAMS[s] == bracket.shape[1])
+        while True:
+            reach[stage] += team_counts(bracket, len(reach[stage]))
+            home, away = bracket[:, 0::2], bracket[:, 1::2]
+            # Empty slots are simulated as team 0 and overridden below
+            lam_home, lam_away = self.rates(np.maximum(home, 0), np.maximum(away, 0))
+            home_goals = self.rng.poisson(lam_home)
+            away_goals = self.rng.poisson(lam_away)
+            level = home_goals == away_goals
+            home_goals = home_goals + level * self.rng.poisson(lam_home * EXTRA_TIME_FACTOR)
+            away_goals = away_goals + level * self.rng.poisson(lam_away * EXTRA_TIME_FACTOR)
+            level = home_goals == away_goals
+            home_wins = (home_goals > away_goals) | (level & (self.rng.random(home.shape) < 0.5))
+            winners = np.where(home_wins, home, away)
+            # Byes: a team facing an empty slot goes through
+            winners = np.where(away < 0, home, np.where(home < 0, away, winners))
+
+            for slot in range(winners.shape[1]):
+                if (stage, slot) in self.decided:
+                    winners[:, slot] = self.decided[(stage, slot)]
+
+            if stage == 'final':
+                titles += team_counts(winners, len(titles))
+                return
+            bracket = winners
+            stage = KNOCKOUT_STAGES[KNOCKOUT_STAGES.index(stage) + 1]
+
+    def run(self, runs):
+        team_count = len(self.teams)
+        qualify = np.zeros(team_count, dtype=np.int64)
+        titles = np.zeros(team_count, dtype=np.int64)
+        reach = {stage: np.zeros(team_count, dtype=np.int64) for stage in KNOCKOUT_STAGES}
+
+        for start in range(0, runs, BATCH_SIZE):
+            batch = min(BATCH_SIZE, runs - start)
+            if self.drawn_bracket is not None:
+                bracket = np.broadcast_to(self.drawn_bracket, (batch, len(self.drawn_bracket))).copy()
+                qualify[self.drawn_bracket[self.drawn_bracket >= 0]] += batch
+            else:
+                points, gd, gf = self.play_group(batch)
+                bracket, qualified = self.draw_bracket(points, gd, gf)
+                qualify += qualified.sum(axis=0)
+            if bracket is not None:
+                self.play_knockout(bracket, reach, titles)
+
+        results = []
+        for i, team in enumerate(self.teams):
+            results.append({
+                'team': {'id': team['id'], 'name': team['name']},
+                'qualify': round(float(qualify[i]) / runs, 4),
+                'reach': {stage: round(float(reach[stage][i]) / runs, 4) for stage in KNOCKOUT_STAGES},
+                'title': round(float(titles[i]) / runs, 4),
+            })
+        results.sort(key=lambda row: (-row['title'], -row['qualify'], row['team']['name']))
+        return results
+
+
+def simulate_tournament(tournament, runs=DEFAULT_RUNS, per_pool=2, seed=None):
+    """
+    Outcome probabilities for every team, cached per tournament state:
+    any result, status or standings change produces a new state hash.
+    """
+    state = load_state(tournament)
+    digest = state_hash(state, runs, per_pool)
+    key = SIMULATION_CACHE_KEY.format(tournament_id=tournament.pk, state=digest)
+    if seed is None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    simulator = TournamentSimulator(state, per_pool=per_pool, seed=seed)
+    document = {
+        'tournament': tournament.pk,
+        'runs': runs,
+        'state': digest,
+        'teams': simulator.run(runs),
+    }
+    if seed is None:
+        cache.set(key, document, SIMULATION_CACHE_TIMEOUT)
+    return document
@@ -0,0 +1,221 @@
+# backend/tournaments/standings.py
+"""
+Team standings (played / W / D / L / goals / points).
+
+A result counts towards the standings when its match is a completed
+group-stage match. Changes are applied incrementally: every result save,
+edit or delete (and every match entering or leaving 'completed') turns into
+a signed delta that is added to both teams with one UPDATE each, inside the
+caller's transaction. rebuild_standings() recomputes everything from scratch.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, Sum, When
+
+from .models import Match, Pool, Team
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+STAT_FIELDS = (
+    'matches_played', 'wins', 'draws', 'losses',
+    'goals_for', 'goals_against', 'points',
+)
+
+
+def team_line(goals_for, goals_against):
+    """Stats a single match adds to one team's line."""
+    won, drawn, lost = goals_for > goals_against, goals_for == goals_against, goals_for < goals_against
+    return {
+        'matches_played': 1,
+        'wins': int(won),
+        'draws': int(drawn),
+        'losses': int(lost),
+        'goals_for': goals_for,
+        'goals_against': goals_against,
+        'points': POINTS_WIN * won + POINTS_DRAW * drawn,
+    }
+
+
+def result_deltas(home_score, away_score, sign=1):
+    """Return (home team delta, away team delta) for a result, times `sign`."""
+    home = team_line(home_score, away_score)
+    away = team_line(away_score, home_score)
+    return (
+        {field: sign * value for field, value in home.items()},
+        {field: sign * value for field, value in away.items()},
+    )
+
+
+def combine(*deltas):
+    total = {}
+    for delta in deltas:
+        for field, value in delta.items():
+            total[field] = total.get(field, 0) + value
+    return total
+
+
+def apply_delta(team_id, delta):
+    """Add a (possibly negative) delta to a team with a single UPDATE."""
+    changes = {field: F(field) + value for field, value in delta.items() if value}
+    if changes:
+        Team.objects.filter(pk=team_id).update(**changes)
+
+
+def counts_towards_standings(stage, status):
+    return stage == 'group' and status == 'completed'
+
+
+def apply_result_change(match, old_scores=None, new_scores=None):
+    """
+    Move a counted match's contribution from old_scores to new_scores, where
+    either may be None (result added / removed). Only team ids are read
+    from `match`; callers decide whether the match counts.
+    """
+    home_deltas, away_deltas = [], []
+    for scores, sign in ((old_scores, -1), (new_scores, 1)):
+        if scores is not None:
+            home, away = result_deltas(*scores, sign=sign)
+            home_deltas.append(home)
+            away_deltas.append(away)
+    with transaction.atomic():
+        apply_delta(match.team_home_id, combine(*home_deltas))
+        apply_delta(match.team_away_id, combine(*away_deltas))
+
+
+def _side_lines(matches, side, other):
+    """Per-team stat sums over the matches a team played as `side` ('home' / 'away')."""
+    scored, conceded = f'result__{side}_score', f'result__{other}_score'
+
+    def count_if(**lookup):
+        return Sum(Case(When(then=1, **lookup), default=0))
+
+    return (
+        matches.order_by()
+        .values(team_id=F(f'team_{side}_id'))
+        .annotate(
+            played=Count('id'),
+            won=count_if(**{f'{scored}__gt': F(conceded)}),
+            drawn=count_if(**{scored: F(conceded)}),
+            lost=count_if(**{f'{scored}__lt': F(conceded)}),
+            scored=Sum(scored),
+            conceded=Sum(conceded),
+        )
+    )
+
+
+def rebuild_standings(tournament=None):
+    """
+    Recompute every team's standings from its completed group matches with
+    one grouped query (home and away sums, UNION ALL) and write them with
+    one bulk_update. Returns the number of teams written.
+    """
+    teams = Team.objects.all()
+    matches = Match.objects.filter(stage='group', status='completed', result__isnull=False)
+    if tournament is not None:
+        teams = teams.filter(tournament=tournament)
+        matches = matches.filter(tournament=tournament)
+
+    lines = {}
+    home, away = _side_lines(matches, 'home', 'away'), _side_lines(matches, 'away', 'home')
+    for row in home.union(away, all=True):
+        line = {
+            'matches_played': row['played'],
+            'wins': row['won'],
+            'draws': row['drawn'],
+            'losses': row['lost'],
+            'goals_for': row['scored'],
+            'goals_against': row['conceded'],
+            'points': POINTS_WIN * row['won'] + POINTS_DRAW * row['drawn'],
+        }
+        lines[row['team_id']] = combine(lines.get(row['team_id'], {}), line)
+
+    teams = list(teams.only('id', *STAT_FIELDS))
+    for team in teams:
+        line = lines.get(team.pk, {})
+        for field in STAT_FIELDS:
+            setattr(team, field, line.get(field, 0))
+    with transaction.atomic():
+        Team.objects.bulk_update(teams, STAT_FIELDS, batch_size=500)
+    return len(teams)
+
+
+# -----------------------------------------------------------------------------
+# Ranked pool tables
+# -----------------------------------------------------------------------------
+def _head_to_head(team_ids, results):
+    """Mini-table (points, goal difference, goals for) among `team_ids` only."""
+    table = {team_id: [0, 0, 0] for team_id in team_ids}
+    for home_id, away_id, home_score, away_score in results:
+        if home_id in table and away_id in table:
+            for team_id, scored, conceded in (
+                (home_id, home_score, away_score),
+                (away_id, away_score, home_score),
+            ):
+                line = team_line(scored, conceded)
+                table[team_id][0] += line['points']
+                table[team_id][1] += scored - conceded
+                table[team_id][2] += scored
+    return table
+
+
+def rank_teams(teams, results):
+    """
+    Order team rows by points, then head-to-head record among the teams
+    level on points (points, goal difference, goals scored), then overall
+    goal difference, goals scored and name.
+    """
+    by_points = {}
+    for team in teams:
+        by_points.setdefault(team['points'], []).append(team)
+
+    ranked = []
+    for points in sorted(by_points, reverse=True):
+        group = by_points[points]
+        h2h = _head_to_head({team['id'] for team in group}, results) if len(group) > 1 else {}
+        group.sort(key=lambda team: (
+            *[-value for value in h2h.get(team['id'], (0, 0, 0))],
+            -(team['goals_for'] - team['goals_against']),
+            -team['goals_for'],
+            team['name'],
+        ))
+        ranked.extend(group)
+    return ranked
+
+
+def pool_tables(tournament):
+    """
+    Ranked standings table for every pool of a tournament, built from
+    three queries (pool memberships, team lines, completed group results).
+    """
+    teams = {
+        team['id']: team
+        for team in Team.objects.filter(tournament=tournament).values('id', 'name', *STAT_FIELDS)
+    }
+    results = {}
+    for pool_id, *result in (
+        Match.objects
+        .filter(tournament=tournament, stage='group', status='completed', result__isnull=False)
+        .values_list('pool_id', 'team_home_id', 'team_away_id', 'result__home_score', 'result__away_score')
+    ):
+        results.setdefault(pool_id, []).append(tuple(result))
+    pools = {}
+    for pool_id, pool_name, team_id in (
+        Pool.teams.through.objects
+        .filter(pool__tournament=tournament)
+        .order_by('pool__name')
+        .values_list('pool_id', 'pool__name', 'team_id')
+    ):
+        pools.setdefault((pool_id, pool_name), []).append(teams[team_id])
+
+    tables = []
+    for (pool_id, pool_name), pool_teams in pools.items():
+        rows = []
+        for rank, team in enumerate(rank_teams(pool_teams, results.get(pool_id, [])), start=1):
+            rows.append({
+                'rank': rank,
+                'team': {'id': team['id'], 'name': team['name']},
+                **{field: team[field] for field in STAT_FIELDS},
+                'goal_difference': team['goals_for'] - team['goals_against'],
+            })
+        tables.append({'id': pool_id, 'name': pool_name, 'table': rows})
+    return tables
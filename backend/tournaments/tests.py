@@ -1,3 +1,363 @@
-from django.test import TestCase
+import asyncio
+import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from .bracket import advance_bracket
+from .live import LiveHub, _event_stream, hub
+from .models import Match, MatchResult, Pool, Team, Tournament
+from .scheduling import generate_group_fixtures
+from .serializers import BulkMatchResultSerializer
+from .simulation import ANONYMOUS_MAX_RUNS, simulate_tournament
+from .standings import rebuild_standings
+
+
+class TournamentData:
+    @classmethod
+    def create_tournament(cls):
+        cls.organizer = User.objects.create_user('organizer', 'organizer@example.com', 'pw')
+        cls.player = User.objects.create_user('player', 'player@example.com', 'pw')
+        cls.tournament = Tournament.objects.create(
+            name='Cup',
+            start_date=datetime.date(2026, 6, 1),
+            end_date=datetime.date(2026, 6, 30),
+            created_by=cls.organizer,
+        )
+        cls.pool = Pool.objects.create(tournament=cls.tournament, name='A')
+        cls.teams = [Team.objects.create(tournament=cls.tournament, name=name) for name in 'ABCD']
+        cls.pool.teams.set(cls.teams)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+
+class TournamentTestCase(TournamentData, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_tournament()
+
+
+class ScheduleTests(TournamentTestCase):
+    def schedule_url(self):
+        return f'/api/tournaments/{self.tournament.pk}/schedule/'
+
+    def test_only_the_organizer_schedules(self):
+        response = self.client_for(self.player).post(self.schedule_url(), {'replace': True}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Match.objects.exists())
+
+        response = self.client_for(self.organizer).post(self.schedule_url(), {}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 6)
+
+    def test_replace_is_refused_once_a_group_match_has_a_result(self):
+        generate_group_fixtures(self.tournament)
+        match = Match.objects.first()
+        MatchResult.objects.create(match=match, home_score=1, away_score=0)
+
+        response = self.client_for(self.organizer).post(self.schedule_url(), {'replace': True}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('replace', response.json())
+        self.assertTrue(Match.objects.filter(pk=match.pk).exists())
+        self.assertEqual(Match.objects.count(), 6)
+
+
+class OrganizerPermissionTests(TournamentTestCase):
+    def setUp(self):
+        self.match = generate_group_fixtures(self.tournament)[0]
+        self.result = MatchResult.objects.create(match=self.match, home_score=1, away_score=0)
+
+    def test_only_the_organizer_changes_the_tournament_and_its_objects(self):
+        player, organizer = self.client_for(self.player), self.client_for(self.organizer)
+        urls = [
+            f'/api/tournaments/{self.tournament.pk}/',
+            f'/api/teams/{self.teams[0].pk}/',
+            f'/api/pools/{self.pool.pk}/',
+            f'/api/matches/{self.match.pk}/',
+            f'/api/match-results/{self.result.pk}/',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(player.get(url).status_code, 200)
+                self.assertEqual(player.patch(url, {}, format='json').status_code, 403)
+                self.assertEqual(player.delete(url).status_code, 403)
+                self.assertEqual(organizer.patch(url, {}, format='json').status_code, 200)
+
+    def test_creating_in_someone_elses_tournament_is_refused(self):
+        player = self.client_for(self.player)
+        response = player.post('/api/teams/', {'tournament': self.tournament.pk, 'name': 'E'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        response = player.post('/api/pools/', {'tournament': self.tournament.pk, 'name': 'B'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Team.objects.filter(name='E').exists())
+
+        # Their own tournament is fine, moving its team into another one is not
+        response = player.post('/api/tournaments/', {
+            'name': 'Own', 'start_date': '2026-07-01', 'end_date': '2026-07-02',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = player.post('/api/teams/', {'tournament': response.json()['id'], 'name': 'E'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = f"/api/teams/{response.json()['id']}/"
+        response = player.patch(url, {'tournament': self.tournament.pk}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+        self.result.delete()
+        response = player.post('/api/match-results/', {
+            'match': self.match.pk, 'home_score': 1, 'away_score': 0,
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(MatchResult.objects.exists())
+
+
+class StandingsTests(TournamentTestCase):
+    def setUp(self):
+        self.matches = generate_group_fixtures(self.tournament)
+
+    def line(self, team):
+        team.refresh_from_db()
+        return (team.matches_played, team.wins, team.draws, team.losses,
+                team.goals_for, team.goals_against, team.points)
+
+    def complete(self, match, home_score, away_score):
+        match.status = 'completed'
+        match.save()
+        return MatchResult.objects.create(match=match, home_score=home_score, away_score=away_score)
+
+    def test_results_apply_as_deltas(self):
+        match = self.matches[0]
+        home, away = match.team_home, match.team_away
+        result = self.complete(match, 2, 1)
+        self.assertEqual(self.line(home), (1, 1, 0, 0, 2, 1, 3))
+        self.assertEqual(self.line(away), (1, 0, 0, 1, 1, 2, 0))
+
+        # A corrected score moves the points, not the match count
+        result.home_score = 1
+        result.save()
+        self.assertEqual(self.line(home), (1, 0, 1, 0, 1, 1, 1))
+        self.assertEqual(self.line(away), (1, 0, 1, 0, 1, 1, 1))
+
+        # Leaving 'completed' and deleting the result both take it back out
+        match.status = 'ongoing'
+        match.save()
+        self.assertEqual(self.line(home), (0, 0, 0, 0, 0, 0, 0))
+        match.status = 'completed'
+        match.save()
+        result.delete()
+        self.assertEqual(self.line(away), (0, 0, 0, 0, 0, 0, 0))
+
+    def test_rebuild_matches_incremental_standings(self):
+        for match, (home_score, away_score) in zip(self.matches, [(2, 1), (0, 0), (1, 3), (4, 4), (2, 0)]):
+            self.complete(match, home_score, away_score)
+        # Scheduled matches with a result do not count
+        MatchResult.objects.create(match=self.matches[5], home_score=9, away_score=0)
+        incremental = {team.pk: self.line(team) for team in self.teams}
+
+        Team.objects.update(matches_played=0, wins=0, draws=0, losses=0, goals_for=0, goals_against=0, points=0)
+        # Grouped sums, the teams, one UPDATE (and its savepoint pair)
+        with self.assertNumQueries(5):
+            self.assertEqual(rebuild_standings(self.tournament), 4)
+        self.assertEqual({team.pk: self.line(team) for team in self.teams}, incremental)
+
+
+class SemiFinals:
+    def create_semi_finals(self):
+        self.tournament.current_stage = 'semi'
+        self.tournament.save()
+        a, b, c, d = self.teams
+        kickoff = timezone.make_aware(datetime.datetime(2026, 6, 20, 12))
+        self.semis = [
+            Match.objects.create(tournament=self.tournament, team_home=home, team_away=away,
+                                 stage='semi', bracket_slot=slot, match_date=kickoff)
+            for slot, (home, away) in enumerate([(a, b), (c, d)])
+        ]
+
+    def play(self, match, home_score, away_score, **extra):
+        match.status = 'completed'
+        match.save()
+        return MatchResult.objects.create(match=match, home_score=home_score, away_score=away_score, **extra)
+
+    def pairing(self, stage):
+        return Match.objects.filter(stage=stage).values_list('team_home__name', 'team_away__name').get()
+
+    def correct(self, result, **scores):
+        return self.client_for(self.organizer).patch(f'/api/match-results/{result.pk}/', scores, format='json')
+
+
+class BracketTests(SemiFinals, TournamentTestCase):
+    def setUp(self):
+        self.create_semi_finals()
+
+    def test_semi_finals_create_final_and_third_place(self):
+        self.play(self.semis[0], 1, 1, home_score_et=1, away_score_et=1, home_score_pen=3, away_score_pen=4)
+        self.assertFalse(Match.objects.filter(stage='final').exists())
+        self.play(self.semis[1], 2, 0)
+
+        self.assertEqual(self.pairing('final'), ('B', 'C'))
+        self.assertEqual(self.pairing('third_place'), ('A', 'D'))
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.current_stage, 'final')
+
+    def test_corrected_semi_final_repairs_the_unplayed_final(self):
+        result = self.play(self.semis[0], 2, 1)
+        self.play(self.semis[1], 2, 0)
+        self.assertEqual(self.pairing('final'), ('A', 'C'))
+
+        response = self.correct(result, home_score=1, away_score=2)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['winner'], self.teams[1].pk)
+        self.assertEqual(self.pairing('final'), ('B', 'C'))
+        self.assertEqual(self.pairing('third_place'), ('A', 'D'))
+        self.assertEqual(Match.objects.filter(stage__in=['final', 'third_place']).count(), 2)
+
+    def test_correction_clears_the_winner_until_the_tie_is_resolved(self):
+        result = self.play(self.semis[0], 2, 1)
+        response = self.correct(result, away_score=2)
+        self.assertIsNone(response.json()['winner'])
+        response = self.correct(result, home_score_et=2, away_score_et=3)
+        self.assertEqual(response.json()['winner'], self.teams[1].pk)
+
+    def test_explicit_winner_is_kept(self):
+        result = self.play(self.semis[0], 0, 0)
+        response = self.correct(result, winner=self.teams[0].pk)
+        self.assertEqual(response.json()['winner'], self.teams[0].pk)
+
+    def test_only_the_organizer_advances(self):
+        url = f'/api/tournaments/{self.tournament.pk}/advance/'
+        response = self.client_for(self.player).post(url, {}, format='json')
+        self.assertEqual(response.status_code, 403)
+        response = self.client_for(self.organizer).post(url, {'per_pool': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class BracketRollbackTests(SemiFinals, TournamentData, TransactionTestCase):
+    """Rejected corrections roll back, which needs real transactions."""
+
+    def setUp(self):
+        self.create_tournament()
+        self.create_semi_finals()
+
+    def test_correction_that_would_rewrite_a_played_final_is_rejected(self):
+        result = self.play(self.semis[0], 2, 1)
+        self.play(self.semis[1], 2, 0)
+        self.play(Match.objects.get(stage='final'), 1, 0)
+
+        response = self.correct(result, home_score=1, away_score=2)
+        self.assertEqual(response.status_code, 400)
+        result.refresh_from_db()
+        self.assertEqual((result.home_score, result.away_score, result.winner_id), (2, 1, self.teams[0].pk))
+        self.assertEqual(self.pairing('final'), ('A', 'C'))
+
+
+class BulkResultTests(SemiFinals, TournamentTestCase):
+    def bulk_url(self):
+        return f'/api/tournaments/{self.tournament.pk}/results/bulk/'
+
+    def submit(self, results, user=None):
+        client = self.client_for(user or self.organizer)
+        return client.post(self.bulk_url(), {'results': results}, format='json')
+
+    def test_only_the_organizer_submits_results(self):
+        match = generate_group_fixtures(self.tournament)[0]
+        response = self.submit([{'match': match.pk, 'home_score': 1, 'away_score': 0}], user=self.player)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(MatchResult.objects.exists())
+
+    def test_duplicates_and_oversized_batches_are_rejected(self):
+        match = generate_group_fixtures(self.tournament)[0]
+        item = {'match': match.pk, 'home_score': 1, 'away_score': 0}
+        response = self.submit([item, dict(item, home_score=2)])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('results', response.json())
+
+        response = self.submit([dict(item, match=pk) for pk in range(BulkMatchResultSerializer.MAX_ITEMS + 1)])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('500', response.json()['results'][0])
+        self.assertFalse(MatchResult.objects.exists())
+
+    def test_group_standings_are_rebuilt_once_per_batch(self):
+        matches = generate_group_fixtures(self.tournament)
+        results = [{'match': match.pk, 'home_score': 2, 'away_score': 1} for match in matches[:3]]
+        with mock.patch('tournaments.results.rebuild_standings', wraps=rebuild_standings) as rebuild:
+            response = self.submit(results)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(sorted(response.json()['created']), sorted(match.pk for match in matches[:3]))
+        self.assertEqual(rebuild.call_count, 1)
+        self.assertEqual(sum(team.points for team in Team.objects.all()), 9)
+
+    def test_bracket_is_advanced_once_per_next_round_slot(self):
+        self.create_semi_finals()
+        results = [
+            {'match': self.semis[0].pk, 'home_score': 2, 'away_score': 1},
+            {'match': self.semis[1].pk, 'home_score': 0, 'away_score': 3},
+        ]
+        with mock.patch('tournaments.results.advance_bracket', wraps=advance_bracket) as advance:
+            response = self.submit(results)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(advance.call_count, 1)
+        self.assertEqual(self.pairing('final'), ('A', 'D'))
+        self.assertEqual(self.pairing('third_place'), ('B', 'C'))
+
+
+class SimulationTests(SemiFinals, TournamentTestCase):
+    def simulate_url(self, runs):
+        return f'/api/tournaments/{self.tournament.pk}/simulate/?runs={runs}'
+
+    def test_run_counts_are_rounded_and_capped_for_anonymous_callers(self):
+        response = APIClient().get(self.simulate_url(1_000_000))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['runs'], ANONYMOUS_MAX_RUNS)
+        response = self.client_for(self.player).get(self.simulate_url(12_345))
+        self.assertEqual(response.json()['runs'], 50_000)
+        self.assertEqual(APIClient().get(self.simulate_url(0)).status_code, 400)
+
+    def test_empty_bracket_slots_are_byes(self):
+        self.create_semi_finals()
+        self.semis[1].delete()
+
+        teams = {row['team']['name']: row for row in simulate_tournament(self.tournament, runs=2_000, seed=1)['teams']}
+        self.assertEqual(teams['A']['qualify'] + teams['B']['qualify'], 2)
+        self.assertEqual(teams['C']['reach']['semi'] + teams['D']['reach']['final'], 0)
+        # The winner of the only semi final goes through the final unplayed
+        self.assertEqual(teams['A']['reach']['final'], teams['A']['title'])
+        self.assertEqual(teams['A']['title'] + teams['B']['title'], 1)
+
+
+class LiveHubTests(SimpleTestCase):
+    def test_rate_limit_state_is_dropped(self):
+        async def scenario():
+            hub = LiveHub()
+            queue = hub.subscribe(1)
+            hub.publish(1, 'score', {'score': [1, 0]}, coalesce_key=7)
+            self.assertIn((1, 7), hub.last_sent)
+            # Completed: the final score is sent and the match forgotten
+            hub.last_sent[(1, 7)] = 0
+            hub.publish(1, 'score', {'score': [2, 0]}, coalesce_key=7, last=True)
+            self.assertEqual((hub.last_sent, hub.pending), ({}, {}))
+            self.assertEqual(queue.qsize(), 2)
+
+            # A burst still waiting when the last spectator leaves
+            hub.publish(1, 'score', {'score': [0, 0]}, coalesce_key=8)
+            hub.publish(1, 'score', {'score': [0, 1]}, coalesce_key=8)
+            self.assertIn((1, 8), hub.pending)
+            hub.unsubscribe(1, queue)
+            self.assertEqual((hub.subscribers, hub.last_sent, hub.pending), ({}, {}, {}))
+
+        asyncio.run(scenario())
+
+    def test_stream_subscribes_only_while_it_runs(self):
+        async def scenario():
+            stream = _event_stream(1)
+            self.assertFalse(hub.has_subscribers(1))
+            self.assertEqual(await anext(stream), b": connected\n\n")
+            self.assertTrue(hub.has_subscribers(1))
+            await stream.aclose()
+            self.assertFalse(hub.has_subscribers(1))
+
+        asyncio.run(scenario())
@@ -0,0 +1,231 @@
+# backend/tournaments/views.py
+from django.http import HttpResponse
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.db import LockRetryMixin
+from .bracket import bracket_json, seed_knockout
+from .models import Tournament, Team, Pool, Match, MatchResult
+from .results import ingest_results
+from .scheduling import generate_group_fixtures
+from .standings import pool_tables
+from .serializers import (
+    TournamentSerializer,
+    TeamSerializer,
+    PoolSerializer,
+    MatchSerializer,
+    MatchResultSerializer,
+    BulkMatchResultSerializer,
+)
+
+
+def tournament_of(obj):
+    """The tournament a tournament, team, pool, match or result belongs to."""
+    if isinstance(obj, Tournament):
+        return obj
+    if isinstance(obj, MatchResult):
+        return obj.match.tournament
+    return obj.tournament
+
+
+def is_organizer(user, tournament):
+    return user.is_staff or tournament.created_by_id == user.pk
+
+
+class IsTournamentOrganizer(permissions.BasePermission):
+    """
+    Only the tournament's creator (or staff) may change a tournament or
+    anything in it, or run organizer actions. Reads stay public.
+    """
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return is_organizer(request.user, tournament_of(obj))
+
+
+class OrganizerWritesMixin:
+    """
+    Creating a team, pool, match or result, or moving one to another
+    tournament (or match), needs the organizer of the tournament it lands
+    in; IsTournamentOrganizer only checks the one it is in now.
+    """
+
+    def perform_create(self, serializer):
+        self.check_target_tournament(serializer)
+        super().perform_create(serializer)
+
+    def perform_update(self, serializer):
+        self.check_target_tournament(serializer)
+        super().perform_update(serializer)
+
+    def check_target_tournament(self, serializer):
+        data = serializer.validated_data
+        target = data.get('match') or data.get('tournament')
+        if target is not None and not is_organizer(self.request.user, tournament_of(target)):
+            self.permission_denied(self.request, message="Only the tournament organizer may do this.")
+
+
+class TournamentViewSet(viewsets.ModelViewSet):
+    """
+    API endpoint for tournaments.
+
+    - GET  /api/tournaments/                 -> List tournaments (public)
+    - POST /api/tournaments/                 -> Create a tournament (auth required)
+    - PATCH/DELETE /api/tournaments/<id>/    -> Organizer only
+    - POST /api/tournaments/<id>/schedule/   -> Generate group-stage fixtures
+    - GET  /api/tournaments/<id>/standings/  -> Ranked pool tables
+    - POST /api/tournaments/<id>/advance/    -> Seed the knockout bracket from the groups
+    - GET  /api/tournaments/<id>/bracket/    -> Knockout tree (cached)
+    - GET  /api/tournaments/<id>/simulate/   -> Qualification / title probabilities
+    - POST /api/tournaments/<id>/results/bulk/ -> Submit many match results at once
+    """
+    queryset = Tournament.objects.all().select_related('created_by')
+    serializer_class = TournamentSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsTournamentOrganizer]
+    filterset_fields = ['status', 'current_stage']
+    search_fields = ['name', 'description']
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(
+        detail=True,
+        methods=['post'],
+        permission_classes=[permissions.IsAuthenticated, IsTournamentOrganizer],
+    )
+    def schedule(self, request, pk=None):
+        """
+        Generate round-robin fixtures for every pool that has none yet.
+        Pass {"replace": true} to throw away and regenerate all group matches
+        (refused once any of them has a result). Organizer only.
+        """
+        tournament = self.get_object()
+        replace = str(request.data.get('replace', '')).lower() in ('1', 'true')
+        matches = generate_group_fixtures(tournament, replace=replace)
+        return Response({'created': len(matches)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def standings(self, request, pk=None):
+        """
+        Ranked table per pool. Ties on points are broken by head-to-head
+        results, then goal difference and goals scored.
+        """
+        tournament = self.get_object()
+        return Response({'tournament': tournament.pk, 'pools': pool_tables(tournament)})
+
+    @action(
+        detail=True,
+        methods=['post'],
+        permission_classes=[permissions.IsAuthenticated, IsTournamentOrganizer],
+    )
+    def advance(self, request, pk=None):
+        """
+        Close the group stage and seed the first knockout round from the
+        pool tables. Later rounds are created automatically as results land.
+        Optional body: {"per_pool": 2} teams qualifying from each pool.
+        Organizer only.
+        """
+        tournament = self.get_object()
+        try:
+            per_pool = int(request.data.get('per_pool', 2))
+        except (TypeError, ValueError):
+            return Response({'per_pool': ['A valid integer is required.']}, status=status.HTTP_400_BAD_REQUEST)
+        matches = seed_knockout(tournament, per_pool=per_pool)
+        return Response(
+            {'stage': tournament.current_stage, 'created': len(matches)},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=True, methods=['get'])
+    def bracket(self, request, pk=None):
+        """
+        The whole knockout tree as one JSON document. It is rendered once and
+        cached until a match or result of this tournament changes.
+        """
+        tournament = self.get_object()
+        return HttpResponse(bracket_json(tournament), content_type='application/json')
+
+    @action(detail=True, methods=['get'])
+    def simulate(self, request, pk=None):
+        """
+        Monte Carlo probabilities of qualifying, reaching each knockout round
+        and winning, for every team. Cached per tournament state.
+        GET /api/tournaments/<id>/simulate/?runs=100000
+        `runs` is rounded up to one of a few fixed sizes, and capped for
+        anonymous callers.
+        """
+        from .simulation import ANONYMOUS_MAX_RUNS, DEFAULT_RUNS, MAX_RUNS, run_size, simulate_tournament
+
+        tournament = self.get_object()
+        try:
+            runs = int(request.query_params.get('runs', DEFAULT_RUNS))
+        except ValueError:
+            runs = 0
+        if not 1 <= runs <= MAX_RUNS:
+            return Response(
+                {'runs': [f"Must be an integer between 1 and {MAX_RUNS}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        runs = run_size(runs, MAX_RUNS if request.user.is_authenticated else ANONYMOUS_MAX_RUNS)
+        return Response(simulate_tournament(tournament, runs=runs))
+
+    @action(
+        detail=True,
+        methods=['post'],
+        url_path='results/bulk',
+        permission_classes=[permissions.IsAuthenticated, IsTournamentOrganizer],
+    )
+    def bulk_results(self, request, pk=None):
+        """
+        Create or update the results of many matches in one transaction;
+        standings and the bracket are recomputed once for the whole batch.
+        POST /api/tournaments/<id>/results/bulk/
+        {
+            "results": [
+                {"match": 1, "home_score": 2, "away_score": 1},
+                {"match": 2, "home_score": 0, "away_score": 0, "status": "ongoing"}
+            ]
+        }
+        Each result marks its match 'completed' unless another status is given.
+        Organizer only.
+        """
+        tournament = self.get_object()
+        serializer = BulkMatchResultSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(ingest_results(tournament, serializer.validated_data['results']))
+
+
+class TeamViewSet(OrganizerWritesMixin, viewsets.ModelViewSet):
+    queryset = Team.objects.all().select_related('tournament').prefetch_related('members')
+    serializer_class = TeamSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsTournamentOrganizer]
+    filterset_fields = ['tournament']
+    search_fields = ['name']
+
+
+class PoolViewSet(OrganizerWritesMixin, viewsets.ModelViewSet):
+    queryset = Pool.objects.all().select_related('tournament').prefetch_related('teams')
+    serializer_class = PoolSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsTournamentOrganizer]
+    filterset_fields = ['tournament']
+
+
+class MatchViewSet(LockRetryMixin, OrganizerWritesMixin, viewsets.ModelViewSet):
+    queryset = Match.objects.all().select_related('result', 'tournament')
+    serializer_class = MatchSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsTournamentOrganizer]
+    filterset_fields = ['tournament', 'pool', 'stage', 'status']
+    ordering_fields = ['match_date']
+
+
+class MatchResultViewSet(LockRetryMixin, OrganizerWritesMixin, viewsets.ModelViewSet):
+    """
+    Match results. A save runs in one transaction with the standings and
+    bracket updates it triggers, so a correction the bracket rejects (the
+    next round is already under way) leaves nothing behind.
+    """
+    queryset = MatchResult.objects.all().select_related('match__tournament')
+    serializer_class = MatchResultSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsTournamentOrganizer]
+    filterset_fields = ['match', 'match__tournament']
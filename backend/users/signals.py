@@ -0,0 +1,22 @@
+# backend/users/signals.py
+"""
+Keep this process's user typeahead index (users/suggest.py) up to date
+when users are saved or deleted through the ORM, once the change commits.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .suggest import user_index
+
+
+@receiver(post_save, sender=User)
+def index_saved_user(sender, instance, **kwargs):
+    transaction.on_commit(lambda: user_index.update(instance))
+
+
+@receiver(post_delete, sender=User)
+def unindex_deleted_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: user_index.remove(user_id))
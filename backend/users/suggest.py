@@ -0,0 +1,170 @@
+# backend/users/suggest.py
+"""
+In-memory prefix index for user typeahead (GET /api/users/suggest/?q=).
+
+Every active user is indexed under the lowercased username, first name,
+last name, "first last" and email. The index is a sorted list of
+(term, user id) pairs: the matches for a prefix are one contiguous slice,
+found with two binary searches, and walked in term order until `limit`
+distinct users are collected. Restricted to a set of users (a project's
+members), the index scans whichever is smaller: the matching slice, or the
+allowed users' own terms.
+
+The index lives in each process. It is built on the first lookup, patched
+in place when a user is saved or deleted through the ORM (users/signals.py,
+after commit) and rebuilt from scratch once it is older than
+USER_SUGGEST_REBUILD_SECONDS, which picks up changes made by other
+processes or bulk writes. That rebuild runs in a background thread while
+lookups keep using the current index; saves made meanwhile are replayed
+on the new one.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import User
+
+SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+
+USER_FIELDS = ('id', 'username', 'first_name', 'last_name', 'role')
+
+# Sorts after every character a term can continue with
+_PREFIX_END = '\U0010ffff'
+
+
+def _rebuild_seconds():
+    return getattr(settings, 'USER_SUGGEST_REBUILD_SECONDS', 300)
+
+
+def user_terms(username, first_name, last_name, email):
+    terms = {username, first_name, last_name, f'{first_name} {last_name}'.strip(), email}
+    return sorted({term.lower() for term in terms if term})
+
+
+class UserPrefixIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = None  # sorted [(term, user id)]
+        self.users = {}      # user id -> (row in USER_FIELDS order, terms)
+        self.built_at = 0.0
+        self.rebuilding = None  # users saved / deleted during a background rebuild
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+    def build(self):
+        entries, users = [], {}
+        rows = User.objects.filter(is_active=True).values_list(*USER_FIELDS, 'email')
+        for *row, email in rows.iterator(chunk_size=5000):
+            terms = user_terms(row[1], row[2], row[3], email)
+            users[row[0]] = (tuple(row), terms)
+            entries.extend((term, row[0]) for term in terms)
+        entries.sort()
+        with self.lock:
+            self.entries, self.users, self.built_at = entries, users, time.monotonic()
+            replay, self.rebuilding = self.rebuilding or [], None
+            for user_id, user in replay:
+                self._apply(user_id, user)
+
+    def _rebuild_in_background(self):
+        try:
+            self.build()
+        finally:
+            self.rebuilding = None
+            close_old_connections()
+
+    def _ensure_built(self):
+        if self.entries is None:
+            # Saves arriving while the first build reads the table are
+            # replayed on it, like those during a background rebuild
+            with self.lock:
+                self.rebuilding = []
+            self.build()
+        elif time.monotonic() - self.built_at > _rebuild_seconds():
+            with self.lock:
+                if self.rebuilding is not None:
+                    return
+                self.rebuilding = []
+            threading.Thread(target=self._rebuild_in_background, name='user-suggest-index', daemon=True).start()
+
+    def _remove(self, user_id):
+        _, terms = self.users.pop(user_id, (None, []))
+        for term in terms:
+            position = bisect_left(self.entries, (term, user_id))
+            if position < len(self.entries) and self.entries[position] == (term, user_id):
+                del self.entries[position]
+
+    def _apply(self, user_id, user):
+        self._remove(user_id)
+        if user is None or not user.is_active:
+            return
+        terms = user_terms(user.username, user.first_name, user.last_name, user.email)
+        self.users[user_id] = (tuple(getattr(user, name) for name in USER_FIELDS), terms)
+        for term in terms:
+            insort(self.entries, (term, user_id))
+
+    def update(self, user, user_id=None):
+        """
+        Re-index one user after a save, or drop it (user=None, by id). Only
+        recorded for replay while the index is being built, and a no-op
+        before that.
+        """
+        user_id = user.pk if user is not None else user_id
+        with self.lock:
+            if self.entries is not None:
+                self._apply(user_id, user)
+            if self.rebuilding is not None:
+                self.rebuilding.append((user_id, user))
+
+    def remove(self, user_id):
+        self.update(None, user_id)
+
+    def reset(self):
+        with self.lock:
+            self.entries, self.users, self.rebuilding = None, {}, None
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+    def suggest(self, query, limit=SUGGEST_LIMIT, allowed=None):
+        """
+        Up to `limit` users (dicts of USER_FIELDS) with a term starting with
+        `query`, in term order; only users in `allowed` if given.
+        """
+        query = query.strip().lower()
+        if not query or limit < 1:
+            return []
+        self._ensure_built()
+        with self.lock:
+            entries, users = self.entries, self.users
+            start = bisect_left(entries, (query,))
+            end = bisect_left(entries, (query + _PREFIX_END,), start)
+
+            if allowed is not None and len(allowed) < end - start:
+                # Fewer allowed users than matching terms: check their terms
+                matches = []
+                for user_id in allowed:
+                    terms = [term for term in users.get(user_id, ((), ()))[1] if term.startswith(query)]
+                    if terms:
+                        # terms are sorted: the first one is where the user sits in the index
+                        matches.append((terms[0], user_id))
+                matches.sort()
+                found = [user_id for _, user_id in matches[:limit]]
+            else:
+                found, seen = [], set()
+                for position in range(start, end):
+                    user_id = entries[position][1]
+                    if user_id in seen or (allowed is not None and user_id not in allowed):
+                        continue
+                    seen.add(user_id)
+                    found.append(user_id)
+                    if len(found) == limit:
+                        break
+            return [dict(zip(USER_FIELDS, users[user_id][0])) for user_id in found]
+
+
+user_index = UserPrefixIndex()
@@ -1,3 +1,124 @@
+from unittest import mock
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from .models import User
+from .suggest import UserPrefixIndex, user_index, user_terms
+
+
+def usernames(rows):
+    return [row['username'] for row in rows]
+
+
+class UserPrefixIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            username: User.objects.create_user(username, email, 'pw', first_name=first, last_name=last)
+            for username, email, first, last in [
+                ('jdoe', 'john@example.com', 'John', 'Doe'),
+                ('jane', 'jane@corp.example', 'Jane', 'Roe'),
+                ('bob', 'bob@example.com', 'Robert', 'Johnson'),
+                ('zed', 'zed@example.com', '', ''),
+            ]
+        }
+
+    def setUp(self):
+        self.index = UserPrefixIndex()
+
+    def test_matches_every_indexed_term_case_insensitively(self):
+        self.assertEqual(usernames(self.index.suggest('JO')), ['jdoe', 'bob'])  # john < johnson
+        self.assertEqual(usernames(self.index.suggest('j')), ['jane', 'jdoe', 'bob'])
+        self.assertEqual(usernames(self.index.suggest('jane r')), ['jane'])
+        self.assertEqual(usernames(self.index.suggest('zed@')), ['zed'])
+        self.assertEqual(self.index.suggest('   '), [])
+        self.assertEqual(self.index.suggest('q'), [])
+
+    def test_limit_and_allowed_users(self):
+        self.assertEqual(len(self.index.suggest('j', limit=2)), 2)
+        allowed = {self.users['bob'].pk, self.users['zed'].pk}
+        self.assertEqual(usernames(self.index.suggest('j', allowed=allowed)), ['bob'])
+        # Fewer allowed users than matching terms takes the per-user path
+        self.assertEqual(usernames(self.index.suggest('j', allowed={self.users['jdoe'].pk})), ['jdoe'])
+
+    def test_saves_and_deletes_patch_the_index(self):
+        self.index.suggest('a')  # build
+        user = self.users['zed']
+        user.first_name = 'Alice'
+        self.index.update(user)
+        self.assertEqual(usernames(self.index.suggest('ali')), ['zed'])
+
+        user.is_active = False
+        self.index.update(user)
+        self.assertEqual(self.index.suggest('ali'), [])
+        self.index.remove(self.users['jdoe'].pk)
+        self.assertEqual(usernames(self.index.suggest('j')), ['jane', 'bob'])
+
+    def test_stale_index_is_rebuilt_and_replays_concurrent_saves(self):
+        self.index.suggest('a')
+        User.objects.filter(pk=self.users['bob'].pk).update(first_name='Bart')
+        self.index.built_at -= 3600
+        self.index.rebuilding = []
+        # A save arriving while the rebuild reads the table
+        renamed = self.users['zed']
+        renamed.last_name = 'Zebra'
+        self.index.update(renamed)
+        self.index.build()
+        self.assertEqual(usernames(self.index.suggest('bart')), ['bob'])
+        self.assertEqual(usernames(self.index.suggest('zebra')), ['zed'])
+        self.assertIsNone(self.index.rebuilding)
+
+    def test_saves_during_the_first_build_are_replayed(self):
+        renamed = self.users['zed']
+        renamed.first_name = 'Zelda'
+
+        def save_while_reading(*fields):
+            if not saved:
+                saved.append(True)
+                self.index.update(renamed)
+            return user_terms(*fields)
+
+        saved = []
+        with mock.patch('users.suggest.user_terms', side_effect=save_while_reading):
+            self.index.suggest('a')
+        self.assertEqual(usernames(self.index.suggest('zelda')), ['zed'])
+        self.assertIsNone(self.index.rebuilding)
+
+        self.index.rebuilding = []
+        self.index.reset()
+        self.assertIsNone(self.index.rebuilding)
+
+
+class UserSuggestApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('ownie', 'ownie@example.com', 'pw')
+        cls.other = User.objects.create_user('owl', 'owl@example.com', 'pw')
+        cls.project = Project.objects.create(name='Project', owner=cls.owner)
+        cls.project.members.add(cls.member)
+
+    def setUp(self):
+        user_index.reset()
+        self.addCleanup(user_index.reset)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def suggest(self, query):
+        response = self.client.get(f'/api/users/suggest/?{query}')
+        return response.status_code, response.json()
+
+    def test_project_members_only(self):
+        self.assertEqual(usernames(self.suggest('q=ow')[1]['results']), ['owl', 'owner', 'ownie'])
+        status, body = self.suggest(f'q=ow&project={self.project.pk}')
+        self.assertEqual(usernames(body['results']), ['owner', 'ownie'])
+        self.assertEqual(self.suggest('q=ow&project=abc')[0], 400)
 
-# Create your tests here.
+    def test_new_users_are_found_after_commit(self):
+        self.suggest('q=ow')  # build
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user('owen', 'owen@example.com', 'pw')
+        with mock.patch.object(User.objects, 'filter', side_effect=AssertionError('index re-read')):
+            self.assertIn('owen', usernames(self.suggest('q=owe')[1]['results']))
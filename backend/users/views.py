@@ -1,19 +1,22 @@
 # backend/users/views.py
 # -----------------------------------------------------------------------------
 # User Views
-# - UserViewSet: read-only access to user data (list/retrieve + /me/)
+# - UserViewSet: read-only access to user data (list/retrieve + /me/ + /suggest/)
 # - RegisterView: public endpoint for new user registration
 # -----------------------------------------------------------------------------
-from rest_framework import viewsets, permissions, generics
+from rest_framework import viewsets, permissions, generics, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.params import parse_positive_int
+from projects.models import Project
 from .models import User
 from .serializers import (
     UserSimpleSerializer,
     UserDetailSerializer,
     UserRegisterSerializer,
 )
+from .suggest import MAX_SUGGEST_LIMIT, SUGGEST_LIMIT, user_index
 
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
@@ -45,6 +48,26 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Typeahead: users whose username, first name, last name or email
+        starts with `q`, from the in-memory prefix index (users/suggest.py).
+        GET /api/users/suggest/?q=jo[&project=<id>][&limit=10]
+        """
+        limit = min(parse_positive_int(request.query_params.get('limit')) or SUGGEST_LIMIT, MAX_SUGGEST_LIMIT)
+        allowed = None
+        if 'project' in request.query_params:
+            project_id = parse_positive_int(request.query_params['project'])
+            owner_id = Project.objects.active().filter(pk=project_id).values_list('owner_id', flat=True).first()
+            if owner_id is None:
+                return Response({'project': ['Project not found.']}, status=status.HTTP_400_BAD_REQUEST)
+            allowed = set(
+                Project.members.through.objects.filter(project_id=project_id).values_list('user_id', flat=True)
+            )
+            allowed.add(owner_id)
+        return Response({'results': user_index.suggest(request.query_params.get('q', ''), limit, allowed)})
+
 
 class RegisterView(generics.CreateAPIView):
     """
@@ -15,6 +15,7 @@ export default function Chats() {
   const [rooms, setRooms] = useState([]);
   const [selectedRoom, setSelectedRoom] = useState(null);
   const [messages, setMessages] = useState([]);
+  const [olderMessagesUrl, setOlderMessagesUrl] = useState(null);
   const [newMessage, setNewMessage] = useState('');
   const [loading, setLoading] = useState(true);
   const [sending, setSending] = useState(false);
@@ -37,17 +38,32 @@ export default function Chats() {
 
   // ---------------------------------------------------------------------------
   // Fetch messages for a room
+  // The history endpoint also serves archived messages; pages come newest
+  // first, so they are reversed for display.
   // ---------------------------------------------------------------------------
   const fetchMessages = useCallback(async (roomId) => {
     try {
-      const res = await axiosClient.get(`/chat-rooms/${roomId}/`);
-      setMessages(res.data.messages || []);
+      const res = await axiosClient.get(`/chat-rooms/${roomId}/history/`);
+      setMessages([...res.data.results].reverse());
+      setOlderMessagesUrl(res.data.next);
     } catch (err) {
       console.error(err);
       showToast('Failed to load messages', 'error');
     }
   }, [showToast]);
 
+  const fetchOlderMessages = async () => {
+    if (!olderMessagesUrl) return;
+    try {
+      const res = await axiosClient.get(olderMessagesUrl);
+      setMessages((current) => [...[...res.data.results].reverse(), ...current]);
+      setOlderMessagesUrl(res.data.next);
+    } catch (err) {
+      console.error(err);
+      showToast('Failed to load messages', 'error');
+    }
+  };
+
   // ---------------------------------------------------------------------------
   // Fetch chat rooms on mount
   // ---------------------------------------------------------------------------
@@ -138,6 +154,11 @@ export default function Chats() {
 
               {/* Messages */}
               <div className={styles.messageList}>
+                {olderMessagesUrl && (
+                  <button type="button" onClick={fetchOlderMessages} className={styles.olderButton}>
+                    Load older messages
+                  </button>
+                )}
                 {messages.length === 0 ? (
                   <p className={styles.empty}>No messages yet. Start the conversation!</p>
                 ) : (
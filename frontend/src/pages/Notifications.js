@@ -5,6 +5,9 @@
 // - Uses unwrapResults() to normalize paginated/flat responses.
 // - Displays them in a clean, readable list with read/unread styles.
 // - Supports mark_read, mark_unread, and delete actions.
+// - Project broadcasts (kind === 'broadcast') are shared by all members:
+//   marking one read marks every older broadcast read; they can't be
+//   marked unread or deleted.
 // - Styled with Notifications.module.css
 // -----------------------------------------------------------------------------
 
@@ -56,7 +59,21 @@ export default function Notifications() {
     try {
       await axiosClient.post(`/notifications/${id}/mark_read/`);
       setNotifications((prev) =>
-        prev.map((n) => (n.id === id ? { ...n, is_read: true } : n))
+        prev.map((n) => (n.kind !== 'broadcast' && n.id === id ? { ...n, is_read: true } : n))
+      );
+      showToast('Marked as read', 'success');
+    } catch {
+      showToast('Action failed', 'error');
+    }
+  };
+
+  const markBroadcastsRead = async (id) => {
+    try {
+      await axiosClient.post(`/notifications/mark_broadcasts_read/`, { until: id });
+      setNotifications((prev) =>
+        prev.map((n) =>
+          n.kind === 'broadcast' && n.id <= id ? { ...n, is_read: true } : n
+        )
       );
       showToast('Marked as read', 'success');
     } catch {
@@ -68,7 +85,7 @@ export default function Notifications() {
     try {
       await axiosClient.post(`/notifications/${id}/mark_unread/`);
       setNotifications((prev) =>
-        prev.map((n) => (n.id === id ? { ...n, is_read: false } : n))
+        prev.map((n) => (n.kind !== 'broadcast' && n.id === id ? { ...n, is_read: false } : n))
       );
       showToast('Marked as unread', 'success');
     } catch {
@@ -89,7 +106,9 @@ export default function Notifications() {
   const deleteNotification = async (id) => {
     try {
       await axiosClient.delete(`/notifications/${id}/`);
-      setNotifications((prev) => prev.filter((n) => n.id !== id));
+      setNotifications((prev) =>
+        prev.filter((n) => n.kind === 'broadcast' || n.id !== id)
+      );
       showToast('Notification deleted', 'success');
     } catch {
       showToast('Failed to delete notification', 'error');
@@ -122,7 +141,7 @@ export default function Notifications() {
       <ul className={styles.list}>
         {notifications.map((n) => (
           <li
-            key={n.id}
+            key={`${n.kind || 'personal'}-${n.id}`}
             className={`${styles.item} ${n.is_read ? styles.read : styles.unread}`}
           >
             <div className={styles.message}>{n.message}</div>
@@ -130,7 +149,16 @@ export default function Notifications() {
               <small>{new Date(n.created_at).toLocaleString()}</small>
             </div>
             <div className={styles.actions}>
-              {n.is_read ? (
+              {n.kind === 'broadcast' ? (
+                !n.is_read && (
+                  <button
+                    onClick={() => markBroadcastsRead(n.id)}
+                    className={styles.actionBtn}
+                  >
+                    Mark Read
+                  </button>
+                )
+              ) : n.is_read ? (
                 <button
                   onClick={() => markAsUnread(n.id)}
                   className={styles.actionBtn}
@@ -145,12 +173,14 @@ export default function Notifications() {
                   Mark Read
                 </button>
               )}
-              <button
-                onClick={() => deleteNotification(n.id)}
-                className={`${styles.actionBtn} ${styles.deleteBtn}`}
-              >
-                Delete
-              </button>
+              {n.kind !== 'broadcast' && (
+                <button
+                  onClick={() => deleteNotification(n.id)}
+                  className={`${styles.actionBtn} ${styles.deleteBtn}`}
+                >
+                  Delete
+                </button>
+              )}
             </div>
           </li>
         ))}